@@ -58,6 +58,7 @@ def main(context: click.Context, config_path: str, log_level: str) -> None:
         run,
         config_path=config_path,
         node_config="None",
+        runner_config="None",
         log_level=log_level,
         nodes_parent_dir=nodes_parent_dir,
     )
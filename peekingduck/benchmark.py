@@ -0,0 +1,595 @@
+# Copyright 2021 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmarks a pipeline on a fixed workload of frames held in memory.
+"""
+
+import json
+import logging
+import multiprocessing as mp
+import os
+import platform
+import queue
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from peekingduck import __version__
+from peekingduck.declarative_loader import DeclarativeLoader
+from peekingduck.pipeline.nodes.node import AbstractNode
+from peekingduck.pipeline.profiler import PERCENTILES, NodeProfiler, peak_rss_mb
+from peekingduck.runner import Runner
+from peekingduck.utils.thread_settings import available_cores
+from peekingduck.utils.warmup import WarmupMixin
+
+IMAGE_EXTENSIONS = [".jpg", ".jpeg", ".png"]
+# number of distinct synthetic frames, cycled through during the benchmark
+NUM_SYNTHETIC_FRAMES = 8
+# nodes replaced by a NullSink, as they would block on or slow down the display
+DISPLAY_NODES = ["output.screen"]
+# maximum time, in seconds, for the pipelines of a thread sweep to load
+SWEEP_START_TIMEOUT = 600
+SWEEP_POLL_INTERVAL = 0.5
+
+
+class FrameSource(AbstractNode):
+    """Replaces the input node of the benchmarked pipeline, serving copies of
+    the frames in ``frames`` in turn, so that decoding and camera latency are
+    not part of the measurements.
+
+    A timestamp of every measured frame is appended to ``emit_times``, to be
+    matched by :class:`LatencySink` at the end of the pipeline.
+
+    Args:
+        frames (:obj:`List[np.ndarray]`): Frames of the workload.
+        warmup_frames (:obj:`int`): Number of frames served before the
+            measurements start.
+        num_frames (:obj:`int`): Number of measured frames.
+        on_measure_start (:obj:`Callable[[], None]`): Called before the first
+            measured frame is served.
+    """
+
+    def __init__(
+        self,
+        frames: List[np.ndarray],
+        warmup_frames: int,
+        num_frames: int,
+        on_measure_start: Callable[[], None],
+    ) -> None:
+        super().__init__(
+            {
+                "input": ["none"],
+                "output": [
+                    "img",
+                    "pipeline_end",
+                    "filename",
+                    "saved_video_fps",
+                    "frame_age",
+                ],
+            },
+            node_path="input.benchmark_source",
+        )
+        self.frames = frames
+        self.warmup_frames = warmup_frames
+        self.num_frames = num_frames
+        self.on_measure_start = on_measure_start
+        self.emit_times: Deque[Optional[float]] = deque()
+        self.count = 0
+
+    def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Serves a copy of the next frame, as nodes may draw on it."""
+        if self.count >= self.warmup_frames + self.num_frames:
+            return {
+                "img": None,
+                "pipeline_end": True,
+                "filename": "benchmark.mp4",
+                "saved_video_fps": 30,
+                "frame_age": 0.0,
+            }
+        if self.count == self.warmup_frames:
+            self.on_measure_start()
+        img = self.frames[self.count % len(self.frames)].copy()
+        self.emit_times.append(
+            time.perf_counter() if self.count >= self.warmup_frames else None
+        )
+        self.count += 1
+        return {
+            "img": img,
+            "pipeline_end": False,
+            "filename": "benchmark.mp4",
+            "saved_video_fps": 30,
+            "frame_age": 0.0,
+        }
+
+
+class LatencySink(AbstractNode):
+    """Appended to the benchmarked pipeline to record the time taken by every
+    measured frame from :class:`FrameSource` to the end of the pipeline. Frames
+    reach the end of the pipeline in order in every execution mode.
+
+    Args:
+        emit_times (:obj:`Deque[Optional[float]]`): Timestamps appended by
+            :class:`FrameSource`, None for warmup frames.
+    """
+
+    def __init__(self, emit_times: Deque[Optional[float]]) -> None:
+        super().__init__(
+            {"input": ["all"], "output": ["none"]}, node_path="output.latency_sink"
+        )
+        self.emit_times = emit_times
+        self.latencies: List[float] = []
+        self.end_time = 0.0
+
+    def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Records the latency of the frame."""
+        emit_time = self.emit_times.popleft()
+        if emit_time is not None:
+            self.end_time = time.perf_counter()
+            self.latencies.append(self.end_time - emit_time)
+        return {}
+
+
+class NullSink(AbstractNode):
+    """Replaces display nodes, e.g., ``output.screen``, and discards the
+    frames.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(
+            {"input": ["img"], "output": ["none"]}, node_path="output.null_sink"
+        )
+
+    def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Discards the frame."""
+        return {}
+
+
+def synthetic_frames(width: int, height: int, seed: int = 0) -> List[np.ndarray]:
+    """Generates random noise frames of the given size."""
+    rng = np.random.RandomState(seed)
+    return [
+        rng.randint(0, 256, (height, width, 3), dtype=np.uint8)
+        for _ in range(NUM_SYNTHETIC_FRAMES)
+    ]
+
+
+def load_frames(input_path: Path, max_frames: int) -> List[np.ndarray]:
+    """Decodes up to ``max_frames`` frames of a video, or images of a
+    directory, in advance.
+
+    Raises:
+        ValueError: No frames could be decoded from ``input_path``.
+    """
+    frames: List[np.ndarray] = []
+    if input_path.is_dir():
+        for image_path in sorted(input_path.iterdir()):
+            if len(frames) >= max_frames:
+                break
+            if image_path.suffix.lower() in IMAGE_EXTENSIONS:
+                frame = cv2.imread(str(image_path))
+                if frame is not None:
+                    frames.append(frame)
+    else:
+        videocap = cv2.VideoCapture(str(input_path))
+        while len(frames) < max_frames:
+            success, frame = videocap.read()
+            if not success:
+                break
+            frames.append(frame)
+        videocap.release()
+    if not frames:
+        raise ValueError(f"No frames could be decoded from {input_path}.")
+    return frames
+
+
+def run_benchmark(  # pylint: disable=too-many-arguments, too-many-locals
+    run_config_path: Path,
+    config_updates_cli: str,
+    custom_nodes_parent_subdir: str,
+    frames: List[np.ndarray],
+    num_frames: int,
+    warmup_frames: int,
+    runner_config: Optional[Dict[str, Any]] = None,
+    ready: Optional[Callable[[], None]] = None,
+) -> Dict[str, Any]:
+    """Runs the pipeline of ``run_config_path`` on ``frames``, with the input
+    node replaced by :class:`FrameSource` and display nodes replaced by
+    :class:`NullSink`.
+
+    Args:
+        run_config_path (:obj:`pathlib.Path`): Path of the run config.
+        config_updates_cli (:obj:`str`): Stringified configuration changes, as
+            with ``peekingduck run --node_config``.
+        custom_nodes_parent_subdir (:obj:`str`): Parent folder of the custom
+            nodes.
+        frames (:obj:`List[np.ndarray]`): Frames of the workload, served in
+            turn.
+        num_frames (:obj:`int`): Number of measured frames.
+        warmup_frames (:obj:`int`): Number of frames run before the
+            measurements start, e.g., while models build their graphs.
+        runner_config (:obj:`Dict[str, Any]`): Changes to the runner config.
+        ready (:obj:`Callable[[], None]`): Called once the nodes are loaded,
+            before the pipeline runs, e.g., to start several benchmarks at
+            the same time.
+
+    Returns:
+        (:obj:`Dict[str, Any]`): Throughput, latency percentiles, peak RSS of
+        the process, time taken by the warmup of every model node when it was
+        created, and statistics of every node. See
+        :meth:`NodeStats.summary <peekingduck.pipeline.profiler.NodeStats.summary>`.
+
+    Raises:
+        ValueError: The run config has no input node to replace.
+    """
+    logger = logging.getLogger(__name__)
+    loader = DeclarativeLoader(
+        run_config_path, config_updates_cli, custom_nodes_parent_subdir
+    )
+    node_strs = [node_str for node_str, _ in loader.node_list]
+    input_indices = [
+        idx
+        for idx, node_str in enumerate(node_strs)
+        if node_str.split(".")[-2] == "input"
+    ]
+    if not input_indices:
+        raise ValueError(f"{run_config_path} has no input node to be replaced.")
+
+    measure: Dict[str, Any] = {}
+    source = FrameSource(
+        frames, warmup_frames, num_frames, lambda: _start_measuring(measure)
+    )
+    replaced_nodes: Dict[int, AbstractNode] = {input_indices[0]: source}
+    for idx, node_str in enumerate(node_strs):
+        if ".".join(node_str.split(".")[-2:]) in DISPLAY_NODES:
+            replaced_nodes[idx] = NullSink()
+    sink = LatencySink(source.emit_times)
+    nodes = loader.get_pipeline(replaced_nodes).nodes + [sink]
+
+    runner = Runner(nodes=nodes, runner_config=runner_config)
+    profiler = NodeProfiler(nodes[:-1], max(num_frames, 1), 0, False, track_rss=True)
+    measure["profiler"] = profiler
+    logger.info(
+        f"Benchmarking {len(nodes) - 1} nodes on {warmup_frames} warmup and "
+        f"{num_frames} measured frames"
+    )
+    if ready is not None:
+        ready()
+    profiler.start()
+    try:
+        runner.run()
+    finally:
+        profiler.stop()
+
+    duration = sink.end_time - measure.get("start_time", sink.end_time)
+    latencies_ms = 1000 * np.array(sink.latencies or [0.0])
+    return {
+        "config_path": str(run_config_path),
+        "runner_config": runner.config,
+        "warmup_frames": warmup_frames,
+        "num_frames": len(sink.latencies),
+        "duration_s": duration,
+        "throughput_fps": len(sink.latencies) / duration if duration > 0 else 0.0,
+        "latency_ms": _percentiles(latencies_ms),
+        "peak_rss_mb": peak_rss_mb(),
+        "peak_rss_after_warmup_mb": measure.get("peak_rss_mb", 0.0),
+        "model_warmup_s": {
+            node.node_name: node.warmup_duration
+            for node in nodes
+            if isinstance(node, WarmupMixin)
+        },
+        "nodes": profiler.summary(),
+    }
+
+
+def thread_candidates(num_cores: int, num_pipelines: int) -> List[Dict[str, Any]]:
+    """Settings tried by :func:`sweep_threads` for ``num_pipelines`` pipelines
+    sharing ``num_cores`` cores: powers of two intra-op threads up to the
+    cores of each pipeline, one or two inter-op threads, OpenCV threads
+    matching the intra-op threads and, with several pipelines, with and
+    without pinning every pipeline to its own cores.
+    """
+    share = max(num_cores // num_pipelines, 1)
+    intra_op_threads = sorted({2 ** i for i in range(share.bit_length())} | {share})
+    inter_op_threads = sorted({1, min(2, share)})
+    pinning = (
+        [False, True]
+        if num_pipelines > 1 and hasattr(os, "sched_setaffinity")
+        else [False]
+    )
+    return [
+        {
+            "intra_op_threads": intra,
+            "inter_op_threads": inter,
+            "opencv_threads": intra,
+            "pinned": pinned,
+        }
+        for intra in intra_op_threads
+        for inter in inter_op_threads
+        for pinned in pinning
+    ]
+
+
+def sweep_threads(  # pylint: disable=too-many-arguments
+    run_config_path: Path,
+    config_updates_cli: str,
+    custom_nodes_parent_subdir: str,
+    frames: List[np.ndarray],
+    num_frames: int,
+    warmup_frames: int,
+    num_pipelines: int = 1,
+    runner_config: Optional[Dict[str, Any]] = None,
+    candidates: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Benchmarks ``num_pipelines`` copies of the pipeline running at the same
+    time, as when packing several camera pipelines onto one host, with every
+    setting of thread counts and pinning in ``candidates``, and recommends the
+    one with the highest total throughput.
+
+    TensorFlow thread pools cannot be resized once created, so every copy of
+    the pipeline runs in a new process, started with the "spawn" method. The
+    copies start running frames once all of them have loaded their nodes.
+    Pinned copies get disjoint sets of the cores available to this process,
+    or share cores in turn when there are more copies than cores.
+
+    Args:
+        run_config_path (:obj:`pathlib.Path`): Path of the run config.
+        config_updates_cli (:obj:`str`): Stringified configuration changes, as
+            with ``peekingduck run --node_config``.
+        custom_nodes_parent_subdir (:obj:`str`): Parent folder of the custom
+            nodes.
+        frames (:obj:`List[np.ndarray]`): Frames of the workload, served in
+            turn.
+        num_frames (:obj:`int`): Number of measured frames of every copy.
+        warmup_frames (:obj:`int`): Number of frames run by every copy
+            before the measurements start.
+        num_pipelines (:obj:`int`): Number of copies of the pipeline sharing
+            the host. **Default: 1**.
+        runner_config (:obj:`Dict[str, Any]`): Changes to the runner config,
+            other than the thread settings.
+        candidates (:obj:`List[Dict[str, Any]]`): Settings to try, see
+            :func:`thread_candidates`, which is used by default.
+
+    Returns:
+        (:obj:`Dict[str, Any]`): The total throughput and worst p95 latency of
+        every setting, and the runner config of every copy of the pipeline
+        with the recommended setting.
+    """
+    logger = logging.getLogger(__name__)
+    cores = available_cores()
+    if candidates is None:
+        candidates = thread_candidates(len(cores), num_pipelines)
+    benchmark_kwargs = {
+        "run_config_path": run_config_path,
+        "config_updates_cli": config_updates_cli,
+        "custom_nodes_parent_subdir": custom_nodes_parent_subdir,
+        "frames": frames,
+        "num_frames": num_frames,
+        "warmup_frames": warmup_frames,
+    }
+    results: List[Dict[str, Any]] = []
+    for settings in candidates:
+        runner_configs = _sweep_runner_configs(
+            settings, runner_config or {}, cores, num_pipelines
+        )
+        results.append(_benchmark_setting(settings, runner_configs, benchmark_kwargs))
+        logger.info(
+            f"{settings}: {results[-1]['throughput_fps']:.2f} FPS in total, "
+            f"worst latency p95 {results[-1]['latency_p95_ms']:.1f} ms"
+        )
+    return {
+        "num_cores": len(cores),
+        "num_pipelines": num_pipelines,
+        "results": results,
+        "recommended": _recommend(results),
+    }
+
+
+def write_report(
+    results: Dict[str, Any], workload: Dict[str, Any], output_path: Path
+) -> None:
+    """Writes ``results`` of :func:`run_benchmark` as JSON to
+    ``output_path``, along with a description of the workload and the
+    environment.
+    """
+    report = {
+        "peekingduck_version": __version__,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "opencv": cv2.__version__,
+            "numpy": np.__version__,
+            "tensorflow": _module_version("tensorflow"),
+        },
+        "workload": workload,
+        **results,
+    }
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as outfile:
+        json.dump(report, outfile, indent=2)
+
+
+def describe_frames(frames: List[np.ndarray], source: str) -> Dict[str, Any]:
+    """Describes the workload, for the report."""
+    resolutions: List[Tuple[int, int]] = sorted(
+        {(frame.shape[1], frame.shape[0]) for frame in frames}
+    )
+    return {
+        "source": source,
+        "num_distinct_frames": len(frames),
+        "resolutions": [list(resolution) for resolution in resolutions],
+    }
+
+
+def _sweep_runner_configs(
+    settings: Dict[str, Any],
+    runner_config: Dict[str, Any],
+    cores: List[int],
+    num_pipelines: int,
+) -> List[Dict[str, Any]]:
+    """Runner configs of the copies of the pipeline with the thread settings
+    of ``settings``. Pinned copies get disjoint sets of ``cores``, or share
+    cores in turn when there are more copies than cores.
+    """
+    share = max(len(cores) // num_pipelines, 1)
+    runner_configs = []
+    for idx in range(num_pipelines):
+        config = dict(
+            runner_config,
+            intra_op_threads=settings["intra_op_threads"],
+            inter_op_threads=settings["inter_op_threads"],
+            opencv_threads=settings["opencv_threads"],
+        )
+        if settings.get("pinned"):
+            config["cpu_affinity"] = [
+                cores[(idx * share + offset) % len(cores)] for offset in range(share)
+            ]
+        runner_configs.append(config)
+    return runner_configs
+
+
+def _benchmark_setting(
+    settings: Dict[str, Any],
+    runner_configs: List[Dict[str, Any]],
+    benchmark_kwargs: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Benchmarks the copies of the pipeline with ``runner_configs`` at the
+    same time, and combines their results.
+    """
+    runs = _run_concurrently(
+        [dict(benchmark_kwargs, runner_config=config) for config in runner_configs]
+    )
+    return {
+        "settings": settings,
+        "throughput_fps": sum(run["throughput_fps"] for run in runs),
+        "latency_p95_ms": max(run["latency_ms"]["p95"] for run in runs),
+        "pipeline_throughput_fps": [run["throughput_fps"] for run in runs],
+        "runner_configs": runner_configs,
+    }
+
+
+def _recommend(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The setting of :func:`sweep_threads` with the highest total
+    throughput, and the runner configs of the pipelines with it.
+    """
+    if not results:
+        return {"settings": {}, "runner_configs": []}
+    best = max(results, key=lambda result: result["throughput_fps"])
+    return {"settings": best["settings"], "runner_configs": best["runner_configs"]}
+
+
+def _run_concurrently(benchmarks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Runs :func:`run_benchmark` with the keyword arguments of every item of
+    ``benchmarks`` at the same time, each in a new process.
+
+    Raises:
+        ValueError: A benchmark failed.
+    """
+    context = mp.get_context("spawn")
+    barrier = context.Barrier(len(benchmarks), timeout=SWEEP_START_TIMEOUT)
+    results_queue = context.Queue()
+    processes = [
+        context.Process(
+            target=_run_sweep_process,
+            args=(idx, kwargs, barrier, results_queue),
+            daemon=True,
+        )
+        for idx, kwargs in enumerate(benchmarks)
+    ]
+    _start_processes(processes)
+    outcomes: Dict[int, Any] = {}
+    try:
+        while len(outcomes) < len(benchmarks):
+            try:
+                idx, outcome = results_queue.get(timeout=SWEEP_POLL_INTERVAL)
+                outcomes[idx] = outcome
+            except queue.Empty:
+                if results_queue.empty() and not any(
+                    process.is_alive() for process in processes
+                ):
+                    raise ValueError(
+                        "A benchmark process exited without results."
+                    ) from None
+    finally:
+        for process in processes:
+            process.join(timeout=SWEEP_POLL_INTERVAL)
+            if process.is_alive():
+                process.terminate()
+    # the other processes stop with a BrokenBarrierError when one fails
+    errors = sorted(
+        (outcome for outcome in outcomes.values() if isinstance(outcome, str)),
+        key=lambda error: error.startswith("BrokenBarrierError"),
+    )
+    if errors:
+        raise ValueError(f"Benchmark failed: {errors[0]}")
+    return [outcomes[idx] for idx in range(len(benchmarks))]
+
+
+def _start_processes(processes: List[Any]) -> None:
+    """Starts spawned processes, which import modules from the ``sys.path`` of
+    this process. Items which are not strings, e.g., ``pathlib.Path`` of the
+    custom nodes added by the loader, break the imports of the processes, so
+    they are passed as strings.
+    """
+    sys_path = sys.path[:]
+    sys.path[:] = [str(path) for path in sys_path]
+    try:
+        for process in processes:
+            process.start()
+    finally:
+        sys.path[:] = sys_path
+
+
+def _run_sweep_process(
+    idx: int, kwargs: Dict[str, Any], barrier: Any, results_queue: Any
+) -> None:
+    """Runs a benchmark of :func:`sweep_threads` in a worker process, and
+    puts its results, or a description of its error, in ``results_queue``.
+    """
+    try:
+        results = run_benchmark(**kwargs, ready=barrier.wait)
+    except (Exception, SystemExit) as error:  # pylint: disable=broad-except
+        barrier.abort()
+        results_queue.put((idx, repr(error)))
+    else:
+        results_queue.put((idx, results))
+
+
+def _start_measuring(measure: Dict[str, Any]) -> None:
+    """Discards the measurements taken during warmup."""
+    measure["profiler"].reset()
+    measure["peak_rss_mb"] = peak_rss_mb()
+    measure["start_time"] = time.perf_counter()
+
+
+def _percentiles(values: np.ndarray) -> Dict[str, float]:
+    summary = {
+        f"p{percentile}": float(value)
+        for percentile, value in zip(PERCENTILES, np.percentile(values, PERCENTILES))
+    }
+    summary["mean"] = float(values.mean())
+    return summary
+
+
+def _module_version(name: str) -> Optional[str]:
+    """Version of an already imported module, without importing it."""
+    module = sys.modules.get(name)
+    return getattr(module, "__version__", None) if module is not None else None
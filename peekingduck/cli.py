@@ -16,16 +16,29 @@
 CLI functions for PeekingDuck.
 """
 
+import ast
 import logging
 import math
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import click
+import numpy as np
 import yaml
 
 from peekingduck import __version__
+from peekingduck.benchmark import (
+    describe_frames,
+    load_frames,
+    run_benchmark,
+    sweep_threads,
+    synthetic_frames,
+    write_report,
+)
 from peekingduck.declarative_loader import PEEKINGDUCK_NODE_TYPES, DeclarativeLoader
+from peekingduck.onnx_converter import convert_pipeline
+from peekingduck.quantizer import quantize_pipeline
+from peekingduck.quantizer import write_report as write_quantization_report
 from peekingduck.runner import Runner
 from peekingduck.utils.create_node_helper import (
     create_config_and_script_files,
@@ -36,6 +49,7 @@ from peekingduck.utils.create_node_helper import (
     verify_option,
 )
 from peekingduck.utils.logger import LoggerSetup
+from peekingduck.utils.onnx_backend import DEFAULT_OPSET
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
@@ -98,27 +112,403 @@ def init(custom_folder_name: str) -> None:
     help="""Modify node configs by wrapping desired configs in a JSON string.\n
         Example: --node_config '{"node_name": {"param_1": var_1}}'""",
 )
+@click.option(
+    "--runner_config",
+    default="None",
+    help="""Modify runner configs by wrapping desired configs in a JSON string.\n
+        Example: --runner_config '{"execution_mode": "pipelined"}'""",
+)
 @click.option(
     "--log_level",
     default="info",
     help="""Modify log level {"critical", "error", "warning", "info", "debug"}""",
 )
-def run(
-    config_path: str, node_config: str, log_level: str, nodes_parent_dir: str = "src"
+@click.option(
+    "--trace",
+    default=None,
+    type=click.Path(),
+    help="Path of a Chrome trace JSON file to record the pipeline's timeline to",
+)
+def run(  # pylint: disable=too-many-arguments
+    config_path: str,
+    node_config: str,
+    runner_config: str,
+    log_level: str,
+    trace: str,
+    nodes_parent_dir: str = "src",
 ) -> None:
     """Runs PeekingDuck"""
     LoggerSetup.set_log_level(log_level)
 
-    curr_dir = _get_cwd()
-    if config_path is None:
-        run_config_path = curr_dir / "run_config.yml"
-    else:
-        run_config_path = Path(config_path)
+    run_config_path = _get_run_config_path(config_path)
+
+    runner_config_updates = ast.literal_eval(runner_config) or {}
+    if trace is not None:
+        runner_config_updates["trace"] = trace
 
-    runner = Runner(run_config_path, node_config, nodes_parent_dir)
+    runner = Runner(
+        run_config_path,
+        node_config,
+        nodes_parent_dir,
+        runner_config=runner_config_updates,
+    )
     runner.run()
 
 
+@cli.command()
+@click.option(
+    "--config_path",
+    default=None,
+    type=click.Path(),
+    help=(
+        "List of nodes to run. None assumes run_config.yml at current working directory"
+    ),
+)
+@click.option(
+    "--node_config",
+    default="None",
+    help="""Modify node configs by wrapping desired configs in a JSON string.\n
+        Example: --node_config '{"node_name": {"param_1": var_1}}'""",
+)
+@click.option(
+    "--runner_config",
+    default="None",
+    help="""Modify runner configs by wrapping desired configs in a JSON string.\n
+        Example: --runner_config '{"execution_mode": "pipelined"}'""",
+)
+@click.option(
+    "--num_frames", default=300, type=click.IntRange(min=1), help="Frames measured"
+)
+@click.option(
+    "--warmup_frames",
+    default=30,
+    type=click.IntRange(min=0),
+    help="Frames run before measuring, e.g., while models build their graphs",
+)
+@click.option(
+    "--workload",
+    default="synthetic",
+    help=(
+        '"synthetic" for generated frames of --resolution, or the path of a video '
+        "or a directory of images, whose frames are decoded in advance"
+    ),
+)
+@click.option(
+    "--resolution",
+    default="1280x720",
+    help="WIDTHxHEIGHT of the synthetic frames",
+)
+@click.option(
+    "--max_preloaded_frames",
+    default=100,
+    type=click.IntRange(min=1),
+    help="Maximum number of frames of --workload decoded and held in memory",
+)
+@click.option(
+    "--output",
+    default="benchmark.json",
+    type=click.Path(),
+    help="Path of the JSON results",
+)
+@click.option(
+    "--log_level",
+    default="info",
+    help="""Modify log level {"critical", "error", "warning", "info", "debug"}""",
+)
+def benchmark(  # pylint: disable=too-many-arguments
+    config_path: str,
+    node_config: str,
+    runner_config: str,
+    num_frames: int,
+    warmup_frames: int,
+    workload: str,
+    resolution: str,
+    max_preloaded_frames: int,
+    output: str,
+    log_level: str,
+    nodes_parent_dir: str = "src",
+) -> None:
+    """Benchmarks the pipeline on a fixed workload held in memory. The input
+    node is replaced by the workload and output.screen is not shown.
+    """
+    LoggerSetup.set_log_level(log_level)
+
+    run_config_path = _get_run_config_path(config_path)
+
+    frames = _load_workload(workload, resolution, max_preloaded_frames)
+    results = run_benchmark(
+        run_config_path,
+        node_config,
+        nodes_parent_dir,
+        frames,
+        num_frames,
+        warmup_frames,
+        runner_config=ast.literal_eval(runner_config),
+    )
+    write_report(results, describe_frames(frames, workload), Path(output))
+    logger.info(
+        f"{results['throughput_fps']:.2f} FPS, latency p50/p95/p99: "
+        + "/".join(f"{results['latency_ms'][key]:.1f}" for key in ("p50", "p95", "p99"))
+        + f" ms, peak RSS {results['peak_rss_mb']:.0f} MB. Results written to {output}"
+    )
+
+
+@cli.command()
+@click.option(
+    "--config_path",
+    default=None,
+    type=click.Path(),
+    help=(
+        "List of nodes to run. None assumes run_config.yml at current working directory"
+    ),
+)
+@click.option(
+    "--node_config",
+    default="None",
+    help="""Modify node configs by wrapping desired configs in a JSON string.\n
+        Example: --node_config '{"node_name": {"param_1": var_1}}'""",
+)
+@click.option(
+    "--runner_config",
+    default="None",
+    help="""Runner configs, other than thread settings, of every pipeline.\n
+        Example: --runner_config '{"execution_mode": "pipelined"}'""",
+)
+@click.option(
+    "--pipelines",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Number of copies of the pipeline sharing the host, e.g., one per camera",
+)
+@click.option(
+    "--num_frames", default=100, type=click.IntRange(min=1), help="Frames measured"
+)
+@click.option(
+    "--warmup_frames",
+    default=10,
+    type=click.IntRange(min=0),
+    help="Frames run before measuring, e.g., while models build their graphs",
+)
+@click.option(
+    "--workload",
+    default="synthetic",
+    help=(
+        '"synthetic" for generated frames of --resolution, or the path of a video '
+        "or a directory of images, whose frames are decoded in advance"
+    ),
+)
+@click.option(
+    "--resolution",
+    default="1280x720",
+    help="WIDTHxHEIGHT of the synthetic frames",
+)
+@click.option(
+    "--max_preloaded_frames",
+    default=100,
+    type=click.IntRange(min=1),
+    help="Maximum number of frames of --workload decoded and held in memory",
+)
+@click.option(
+    "--output",
+    default="thread_sweep.json",
+    type=click.Path(),
+    help="Path of the JSON results",
+)
+@click.option(
+    "--log_level",
+    default="info",
+    help="""Modify log level {"critical", "error", "warning", "info", "debug"}""",
+)
+def tune_threads(  # pylint: disable=too-many-arguments
+    config_path: str,
+    node_config: str,
+    runner_config: str,
+    pipelines: int,
+    num_frames: int,
+    warmup_frames: int,
+    workload: str,
+    resolution: str,
+    max_preloaded_frames: int,
+    output: str,
+    log_level: str,
+    nodes_parent_dir: str = "src",
+) -> None:
+    """Benchmarks copies of the pipeline sharing the host with a range of
+    thread counts and CPU pinning, and recommends the runner config of every
+    copy with the highest total throughput.
+    """
+    LoggerSetup.set_log_level(log_level)
+
+    frames = _load_workload(workload, resolution, max_preloaded_frames)
+    try:
+        results = sweep_threads(
+            _get_run_config_path(config_path),
+            node_config,
+            nodes_parent_dir,
+            frames,
+            num_frames,
+            warmup_frames,
+            pipelines,
+            runner_config=ast.literal_eval(runner_config),
+        )
+    except ValueError as error:
+        raise click.ClickException(str(error)) from error
+    write_report(results, describe_frames(frames, workload), Path(output))
+    _log_recommendation(results, output)
+
+
+@cli.command()
+@click.option(
+    "--config_path",
+    default=None,
+    type=click.Path(),
+    help=(
+        "List of nodes to run. None assumes run_config.yml at current working directory"
+    ),
+)
+@click.option(
+    "--node_config",
+    default="None",
+    help="""Modify node configs by wrapping desired configs in a JSON string.\n
+        Example: --node_config '{"node_name": {"param_1": var_1}}'""",
+)
+@click.option(
+    "--opset", default=DEFAULT_OPSET, type=int, help="ONNX opset of the models"
+)
+@click.option(
+    "--check_parity",
+    is_flag=True,
+    help="Compare the outputs of the TensorFlow and ONNX Runtime backends",
+)
+@click.option(
+    "--tolerance",
+    default=1e-3,
+    type=float,
+    help="Largest error between the outputs of both backends with --check_parity",
+)
+@click.option(
+    "--log_level",
+    default="info",
+    help="""Modify log level {"critical", "error", "warning", "info", "debug"}""",
+)
+def convert_onnx(  # pylint: disable=too-many-arguments
+    config_path: str,
+    node_config: str,
+    opset: int,
+    check_parity: bool,
+    tolerance: float,
+    log_level: str,
+    nodes_parent_dir: str = "src",
+) -> None:
+    """Converts the frozen graphs of the model nodes in the run config to ONNX,
+    to be run with their "onnxruntime" backend.
+    """
+    LoggerSetup.set_log_level(log_level)
+
+    run_config_path = _get_run_config_path(config_path)
+
+    try:
+        results = convert_pipeline(
+            run_config_path,
+            node_config,
+            nodes_parent_dir,
+            opset,
+            check_parity,
+            tolerance,
+        )
+    except ValueError as error:
+        raise click.ClickException(str(error)) from error
+    failed = [result["node"] for result in results if not result.get("parity", True)]
+    if failed:
+        raise click.ClickException(
+            f"Outputs of {failed} differ between backends by more than {tolerance}"
+        )
+    for result in results:
+        logger.info(f"{result['node']}: written {result['onnx_path']}")
+
+
+@cli.command()
+@click.option(
+    "--frames",
+    required=True,
+    type=click.Path(exists=True),
+    help="Video or directory of images with representative frames of the deployment",
+)
+@click.option(
+    "--config_path",
+    default=None,
+    type=click.Path(),
+    help=(
+        "List of nodes to run. None assumes run_config.yml at current working directory"
+    ),
+)
+@click.option(
+    "--node_config",
+    default="None",
+    help="""Modify node configs by wrapping desired configs in a JSON string.\n
+        Example: --node_config '{"node_name": {"param_1": var_1}}'""",
+)
+@click.option(
+    "--calibration_frames",
+    default=100,
+    type=click.IntRange(min=1),
+    help="Frames used for calibration, the rest measure the accuracy drift",
+)
+@click.option(
+    "--max_frames",
+    default=200,
+    type=click.IntRange(min=1),
+    help="Maximum number of frames of --frames decoded and held in memory",
+)
+@click.option(
+    "--report",
+    default="quantization_report.json",
+    type=click.Path(),
+    help="Path of the JSON accuracy drift report",
+)
+@click.option(
+    "--log_level",
+    default="info",
+    help="""Modify log level {"critical", "error", "warning", "info", "debug"}""",
+)
+def quantize(  # pylint: disable=too-many-arguments
+    frames: str,
+    config_path: str,
+    node_config: str,
+    calibration_frames: int,
+    max_frames: int,
+    report: str,
+    log_level: str,
+    nodes_parent_dir: str = "src",
+) -> None:
+    """Quantizes the frozen graphs of the model nodes in the run config to
+    INT8, calibrated on representative frames, to be run with their "tflite"
+    backend.
+    """
+    LoggerSetup.set_log_level(log_level)
+
+    run_config_path = _get_run_config_path(config_path)
+
+    try:
+        loaded_frames = load_frames(Path(frames), max_frames)
+    except ValueError as error:
+        raise click.BadParameter(str(error), param_hint="--frames") from error
+    try:
+        results = quantize_pipeline(
+            run_config_path,
+            node_config,
+            nodes_parent_dir,
+            loaded_frames,
+            calibration_frames,
+        )
+    except ValueError as error:
+        raise click.ClickException(str(error)) from error
+    write_quantization_report(results, Path(report))
+    for result in results:
+        logger.info(f"{result['node']}: written {result['tflite_path']}")
+    logger.info(f"Accuracy drift report written to {report}")
+
+
 @cli.command()
 @click.option(
     "--node_subdir",
@@ -312,6 +702,46 @@ def _create_nodes_from_config_file(
         create_config_and_script_files(created_paths)
 
 
+def _load_workload(
+    workload: str, resolution: str, max_preloaded_frames: int
+) -> List[np.ndarray]:
+    """Generates synthetic frames of ``resolution``, or decodes the frames of
+    the video or directory of images at ``workload``.
+    """
+    if workload == "synthetic":
+        try:
+            width, height = (int(size) for size in resolution.lower().split("x"))
+        except ValueError as error:
+            raise click.BadParameter(
+                "Expected WIDTHxHEIGHT, e.g., 1280x720", param_hint="--resolution"
+            ) from error
+        return synthetic_frames(width, height)
+    try:
+        return load_frames(Path(workload), max_preloaded_frames)
+    except ValueError as error:
+        raise click.BadParameter(str(error), param_hint="--workload") from error
+
+
+def _get_run_config_path(config_path: Optional[str]) -> Path:
+    """Path of the run config, run_config.yml at the current working
+    directory by default.
+    """
+    if config_path is None:
+        return _get_cwd() / "run_config.yml"
+    return Path(config_path)
+
+
+def _log_recommendation(results: Dict[str, Any], output: str) -> None:
+    """Logs the recommended settings of :func:`sweep_threads`."""
+    recommended = results["recommended"]
+    logger.info(
+        f"Recommended settings for {results['num_pipelines']} pipeline(s) on "
+        f"{results['num_cores']} core(s): {recommended['settings']}. Runner "
+        f"configs of the pipelines: {recommended['runner_configs']}. Results "
+        f"written to {output}"
+    )
+
+
 def _get_cwd() -> Path:
     return Path.cwd()
 
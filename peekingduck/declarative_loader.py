@@ -29,6 +29,7 @@ import yaml
 from peekingduck.configloader import ConfigLoader
 from peekingduck.pipeline.nodes.node import AbstractNode
 from peekingduck.pipeline.pipeline import Pipeline
+from peekingduck.utils.model_registry import MODEL_REGISTRY, SharedModel
 
 PEEKINGDUCK_NODE_TYPES = ["input", "model", "draw", "dabble", "output"]
 
@@ -64,6 +65,8 @@ class DeclarativeLoader:  # pylint: disable=too-few-public-methods
 
         pkd_base_dir = Path(__file__).resolve().parent
         self.config_loader = ConfigLoader(pkd_base_dir)
+        # handles to the models loaded by the instantiated nodes
+        self.shared_models: List[SharedModel] = []
 
         self.node_list = self._load_node_list(run_config_path)
         self.config_updates_cli = ast.literal_eval(config_updates_cli)
@@ -74,7 +77,7 @@ class DeclarativeLoader:  # pylint: disable=too-few-public-methods
                 Path.cwd() / custom_nodes_parent_subdir / custom_nodes_name
             )
             self.custom_config_loader = ConfigLoader(custom_nodes_dir)
-            sys.path.append(custom_nodes_parent_subdir)
+            sys.path.append(str(custom_nodes_parent_subdir))
 
             self.custom_nodes_dir = custom_nodes_dir
 
@@ -107,46 +110,85 @@ class DeclarativeLoader:  # pylint: disable=too-few-public-methods
 
         return custom_name
 
-    def _instantiate_nodes(self) -> List[AbstractNode]:
-        """Given a list of imported nodes, instantiate nodes"""
+    def _instantiate_nodes(
+        self,
+        config_updates_stream: Optional[Dict[str, Any]] = None,
+        shared_nodes: Optional[Dict[int, AbstractNode]] = None,
+    ) -> List[AbstractNode]:
+        """Given a list of imported nodes, instantiate nodes. Nodes found in
+        shared_nodes, keyed by their position in the node list, are reused
+        instead of being instantiated again. Handles to the models loaded by
+        the nodes are kept in ``shared_models``.
+        """
         instantiated_nodes = []
+        with MODEL_REGISTRY.collect() as handles:
+            for idx, (node_str, config_updates_yml) in enumerate(self.node_list):
+                node_str_split = node_str.split(".")
+                if shared_nodes and idx in shared_nodes:
+                    node_name = ".".join(node_str_split[-2:])
+                    if config_updates_stream and node_name in config_updates_stream:
+                        self.logger.warning(
+                            f"Stream config for {node_name} is ignored as the node "
+                            "is shared by all streams"
+                        )
+                    instantiated_nodes.append(shared_nodes[idx])
+                    continue
+
+                self.logger.info(f"Initialising {node_str} node...")
+
+                if len(node_str_split) == 3:
+                    # convert windows/linux filepath to a module path
+                    path_to_node = f"{self.custom_nodes_dir.name}."
+                    node_name = ".".join(node_str_split[-2:])
+
+                    instantiated_node = self._init_node(
+                        path_to_node,
+                        node_name,
+                        self.custom_config_loader,
+                        config_updates_yml,
+                        config_updates_stream,
+                    )
+                else:
+                    path_to_node = "peekingduck.pipeline.nodes."
+
+                    instantiated_node = self._init_node(
+                        path_to_node,
+                        node_str,
+                        self.config_loader,
+                        config_updates_yml,
+                        config_updates_stream,
+                    )
 
-        for node_str, config_updates_yml in self.node_list:
-            node_str_split = node_str.split(".")
-
-            self.logger.info(f"Initialising {node_str} node...")
-
-            if len(node_str_split) == 3:
-                # convert windows/linux filepath to a module path
-                path_to_node = f"{self.custom_nodes_dir.name}."
-                node_name = ".".join(node_str_split[-2:])
-
-                instantiated_node = self._init_node(
-                    path_to_node,
-                    node_name,
-                    self.custom_config_loader,
-                    config_updates_yml,
-                )
-            else:
-                path_to_node = "peekingduck.pipeline.nodes."
-
-                instantiated_node = self._init_node(
-                    path_to_node, node_str, self.config_loader, config_updates_yml
-                )
-
-            instantiated_nodes.append(instantiated_node)
+                instantiated_nodes.append(instantiated_node)
 
+        self.shared_models.extend(handles)
         return instantiated_nodes
 
-    def _init_node(
+    def _init_node(  # pylint: disable=too-many-arguments
         self,
         path_to_node: str,
         node_name: str,
         config_loader: ConfigLoader,
         config_updates_yml: Optional[Dict[str, Any]],
+        config_updates_stream: Optional[Dict[str, Any]] = None,
     ) -> AbstractNode:
         """Imports node to filepath and initialise node with config."""
         node = importlib.import_module(path_to_node + node_name)
+        config = self._get_config(
+            node_name, config_loader, config_updates_yml, config_updates_stream
+        )
+        return node.Node(config)
+
+    def _get_config(
+        self,
+        node_name: str,
+        config_loader: ConfigLoader,
+        config_updates_yml: Optional[Dict[str, Any]],
+        config_updates_stream: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Loads the default config of the node, with the changes in the run
+        config, from the CLI and for the current stream applied in turn.
+        """
         config = config_loader.get(node_name)
 
         # First, override default configs with values from run_config.yml
@@ -160,7 +202,14 @@ class DeclarativeLoader:  # pylint: disable=too-few-public-methods
                     config, self.config_updates_cli[node_name], node_name
                 )
 
-        return node.Node(config)
+        # Lastly, override configs with values for the current stream
+        if config_updates_stream is not None:
+            if node_name in config_updates_stream.keys():
+                config = self._edit_config(
+                    config, config_updates_stream[node_name], node_name
+                )
+
+        return config
 
     def _edit_config(
         self, dict_orig: Dict[str, Any], dict_update: Dict[str, Any], node_name: str
@@ -185,12 +234,20 @@ class DeclarativeLoader:  # pylint: disable=too-few-public-methods
                     )
         return dict_orig
 
-    def get_pipeline(self) -> Pipeline:
+    def get_pipeline(
+        self, replaced_nodes: Optional[Dict[int, AbstractNode]] = None
+    ) -> Pipeline:
         """Returns a compiled
         :py:class:`Pipeline <peekingduck.pipeline.pipeline.Pipeline>` for
         PeekingDuck :py:class:`Runner <peekingduck.runner.Runner>` to execute.
+
+        Args:
+            replaced_nodes (:obj:`Dict[int, AbstractNode]` | :obj:`None`):
+                Nodes used in place of those at the given positions of the
+                node list, which are then not instantiated, e.g., to replace
+                ``input.live`` without opening the camera.
         """
-        instantiated_nodes = self._instantiate_nodes()
+        instantiated_nodes = self._instantiate_nodes(shared_nodes=replaced_nodes)
 
         try:
             return Pipeline(instantiated_nodes)
@@ -198,6 +255,58 @@ class DeclarativeLoader:  # pylint: disable=too-few-public-methods
             self.logger.error(str(error))
             sys.exit(1)
 
+    def get_stream_pipelines(
+        self, streams: List[Dict[str, Any]], shared_node_types: List[str]
+    ) -> List[Pipeline]:
+        """Returns a compiled
+        :py:class:`Pipeline <peekingduck.pipeline.pipeline.Pipeline>` for each
+        input stream. Nodes of the types in ``shared_node_types``, e.g.,
+        ``model``, are instantiated once and shared by all pipelines.
+
+        Args:
+            streams (:obj:`List[Dict[str, Any]]`): Configuration changes for
+                each stream, in the same format as ``config_updates_cli``,
+                e.g., ``[{"input.live": {"input_source": 0}}, ...]``.
+            shared_node_types (:obj:`List[str]`): Types of nodes to be shared.
+        """
+        pipelines: List[Pipeline] = []
+        shared_nodes: Dict[int, AbstractNode] = {}
+        for config_updates_stream in streams:
+            instantiated_nodes = self._instantiate_nodes(
+                config_updates_stream, shared_nodes
+            )
+            if not pipelines:
+                shared_nodes = {
+                    idx: node
+                    for idx, node in enumerate(instantiated_nodes)
+                    if node.node_name.split(".")[0] in shared_node_types
+                }
+            try:
+                pipelines.append(Pipeline(instantiated_nodes))
+            except ValueError as error:
+                self.logger.error(str(error))
+                sys.exit(1)
+        return pipelines
+
+    def get_node_configs(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Returns the name and config of every PeekingDuck node in the node
+        list, with the changes in the run config and from the CLI applied,
+        without instantiating the nodes. Custom nodes are left out.
+        """
+        return [
+            (node_str, self._get_config(node_str, self.config_loader, config_updates))
+            for node_str, config_updates in self.node_list
+            if len(node_str.split(".")) == 2
+        ]
+
+    def release_models(self) -> None:
+        """Releases the handles to the models loaded by the instantiated nodes,
+        so that the model registry drops the models no other pipeline uses.
+        """
+        for handle in self.shared_models:
+            handle.release()
+        self.shared_models = []
+
 
 class NodeList:
     """Iterator class to return node string and node configs (if any) from the
@@ -0,0 +1,241 @@
+# Copyright 2021 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Converts the frozen graphs of the model nodes of a pipeline to ONNX, for their
+"onnxruntime" backend, and checks that both backends give the same outputs.
+"""
+
+import collections
+import functools
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from peekingduck.declarative_loader import DeclarativeLoader
+from peekingduck.pipeline.nodes.model.hrnetv1.hrnet_files.detector import (
+    Detector as HRNetDetector,
+)
+from peekingduck.pipeline.nodes.model.posenetv1.posenet_files.predictor import (
+    OUTPUT_STRIDE,
+    Predictor as PoseNetPredictor,
+)
+from peekingduck.pipeline.nodes.model.yolov4.yolo_files.detector import (
+    Detector as YoloDetector,
+)
+from peekingduck.utils.graph_functions import compare_backends
+from peekingduck.utils.onnx_backend import DEFAULT_OPSET, convert_graph
+from peekingduck.weights_utils import checker, downloader, finder
+
+# size of the random frame on which the outputs of both backends are compared
+PARITY_FRAME_SIZE = (720, 1280, 3)
+
+GraphSpec = collections.namedtuple("GraphSpec", "graph_path inputs outputs preprocess")
+
+
+def graph_spec(node_name: str, config: Dict[str, Any]) -> Optional[GraphSpec]:
+    """Describes the frozen graph which the node of ``node_name`` loads with
+    ``config``, downloading the weights if needed.
+
+    Returns:
+        (:obj:`GraphSpec` | :obj:`None`): Path of the frozen graph, names of
+        its input and output nodes, and the preprocessing of the node which
+        turns a frame into the graph input of a batch of one, or None if the
+        node does not run a frozen graph.
+    """
+    if node_name not in GRAPH_SPECS:
+        return None
+    return GRAPH_SPECS[node_name](_model_dir(config), config)
+
+
+def convert_pipeline(  # pylint: disable=too-many-arguments
+    run_config_path: Path,
+    config_updates_cli: str,
+    custom_nodes_parent_subdir: str,
+    opset: int = DEFAULT_OPSET,
+    check_parity: bool = False,
+    tolerance: float = 1e-3,
+) -> List[Dict[str, Any]]:
+    """Converts the frozen graphs of the model nodes in ``run_config_path`` to
+    ONNX models next to them.
+
+    With ``check_parity``, both backends are run on the same random frame,
+    preprocessed as by the node, and the largest error of every output is
+    reported, as described in
+    :func:`compare_backends <peekingduck.utils.graph_functions.compare_backends>`.
+
+    Args:
+        run_config_path (:obj:`pathlib.Path`): Path of the run config.
+        config_updates_cli (:obj:`str`): Stringified configuration changes, as
+            with ``peekingduck run --node_config``.
+        custom_nodes_parent_subdir (:obj:`str`): Parent folder of the custom
+            nodes.
+        opset (:obj:`int`): ONNX opset of the converted models.
+        check_parity (:obj:`bool`): Whether to compare the outputs of both
+            backends.
+        tolerance (:obj:`float`): Largest error for the outputs of both
+            backends to be considered the same.
+
+    Returns:
+        (:obj:`List[Dict[str, Any]]`): The node, frozen graph and ONNX model
+        paths of every conversion, with ``max_errors`` of every output and
+        whether ``parity`` holds if ``check_parity`` is set.
+
+    Raises:
+        ValueError: The run config has no node with a frozen graph.
+    """
+    logger = logging.getLogger(__name__)
+    loader = DeclarativeLoader(
+        run_config_path, config_updates_cli, custom_nodes_parent_subdir
+    )
+    results = []
+    for node_name, config in loader.get_node_configs():
+        spec = graph_spec(node_name, config)
+        if spec is None:
+            continue
+        result: Dict[str, Any] = {
+            "node": node_name,
+            "graph_path": str(spec.graph_path),
+            "onnx_path": str(
+                convert_graph(str(spec.graph_path), spec.inputs, spec.outputs, opset)
+            ),
+        }
+        if check_parity:
+            result.update(_check_parity(spec, tolerance))
+            logger.info(
+                f"{node_name}: largest error between backends "
+                f"{max(result['max_errors'].values()):.2e}"
+            )
+        results.append(result)
+    if not results:
+        raise ValueError(
+            f"{run_config_path} has no model node with a frozen graph. Supported "
+            f"nodes: {list(GRAPH_SPECS)}"
+        )
+    return results
+
+
+def _check_parity(spec: GraphSpec, tolerance: float) -> Dict[str, Any]:
+    """Runs both backends on the same random frame, preprocessed as by the
+    node, and compares their outputs.
+    """
+    frame = np.random.RandomState(0).randint(0, 256, PARITY_FRAME_SIZE, dtype=np.uint8)
+    errors = compare_backends(
+        str(spec.graph_path), spec.inputs, spec.outputs, [spec.preprocess(frame)]
+    )
+    return {
+        "max_errors": dict(zip(spec.outputs, errors)),
+        "parity": max(errors) <= tolerance,
+    }
+
+
+def _model_dir(config: Dict[str, Any]) -> Path:
+    """Finds the weights of the model as the model nodes do, downloading them
+    if they are missing.
+    """
+    weights_dir, model_dir = finder.find_paths(
+        config["root"], config["weights"], config["weights_parent_dir"]
+    )
+    if not checker.has_weights(weights_dir, model_dir):
+        downloader.download_weights(weights_dir, config["weights"]["blob_file"])
+    return model_dir
+
+
+def _yolo_spec(model_dir: Path, config: Dict[str, Any]) -> GraphSpec:
+    model_type = config["model_type"]
+    model_nodes = config["MODEL_NODES"][f"yolo{model_type[:2]}"]
+    return GraphSpec(
+        model_dir / config["weights"]["model_file"][model_type],
+        model_nodes["inputs"],
+        model_nodes["outputs"],
+        functools.partial(_yolo_input, config["size"]),
+    )
+
+
+def _hrnet_spec(model_dir: Path, config: Dict[str, Any]) -> GraphSpec:
+    return GraphSpec(
+        model_dir / config["weights"]["model_file"],
+        config["MODEL_NODES"]["inputs"],
+        config["MODEL_NODES"]["outputs"],
+        functools.partial(_hrnet_input, config["resolution"]),
+    )
+
+
+def _posenet_spec(model_dir: Path, config: Dict[str, Any]) -> GraphSpec:
+    model_type = config["model_type"]
+    model_nodes = config["MODEL_NODES"][
+        "resnet" if model_type == "resnet" else "mobilenet"
+    ]
+    return GraphSpec(
+        model_dir / config["weights"]["model_file"][model_type],
+        model_nodes["inputs"],
+        model_nodes["outputs"],
+        functools.partial(_posenet_input, config["resolution"], model_type),
+    )
+
+
+def _efficientdet_spec(model_dir: Path, config: Dict[str, Any]) -> GraphSpec:
+    model_type = config["model_type"]
+    return GraphSpec(
+        model_dir / config["weights"]["model_file"][model_type],
+        config["MODEL_NODES"]["inputs"],
+        config["MODEL_NODES"]["outputs"],
+        functools.partial(_efficientdet_input, config["size"][model_type]),
+    )
+
+
+def _yolo_input(size: int, frame: np.ndarray) -> np.ndarray:
+    return YoloDetector.preprocess(frame, size).numpy()
+
+
+def _hrnet_input(resolution: Dict[str, int], frame: np.ndarray) -> np.ndarray:
+    """Crops a person bbox covering the whole frame."""
+    cropped_frames, _, _ = HRNetDetector.preprocess(
+        frame, np.array([[0.0, 0.0, 1.0, 1.0]]), resolution
+    )
+    return cropped_frames
+
+
+def _posenet_input(
+    resolution: Dict[str, int], model_type: Any, frame: np.ndarray
+) -> np.ndarray:
+    image, _, _ = PoseNetPredictor.create_image_from_frame(
+        OUTPUT_STRIDE,
+        frame,
+        PoseNetPredictor.get_resolution_as_tuple(resolution),
+        model_type,
+    )
+    return image.numpy()
+
+
+def _efficientdet_input(image_size: int, frame: np.ndarray) -> np.ndarray:
+    # imported here as the detector also imports the Keras implementation
+    # pylint: disable=import-outside-toplevel
+    from peekingduck.pipeline.nodes.model.efficientdet_d04.efficientdet_files.detector import (  # pylint: disable=line-too-long
+        Detector as EfficientDetDetector,
+    )
+
+    image, _ = EfficientDetDetector.preprocess(frame, image_size)
+    # stacked and cast as by the detector before the graph call
+    return image[np.newaxis].astype(np.float32)
+
+
+GRAPH_SPECS: Dict[str, Callable[[Path, Dict[str, Any]], GraphSpec]] = {
+    "model.yolo": _yolo_spec,
+    "model.hrnet": _hrnet_spec,
+    "model.posenet": _posenet_spec,
+    "model.efficientdet": _efficientdet_spec,
+}
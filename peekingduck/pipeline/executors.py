@@ -0,0 +1,665 @@
+# Copyright 2021 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Executors which drive the nodes of a pipeline over a stream of frames.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
+
+from peekingduck.pipeline.frame_transport import ProcessStage
+from peekingduck.pipeline.nodes.node import AbstractNode
+from peekingduck.pipeline.pipeline import Pipeline
+from peekingduck.pipeline.plan import MISSING, get_node_inputs, read_only_view
+from peekingduck.utils.thread_settings import available_cores, pin_thread
+
+QUEUE_POLL_INTERVAL = 0.1
+# Nodes of these types run on the calling thread in DAG mode as they may
+# interact with the GUI
+MAIN_THREAD_NODE_TYPES = ["output"]
+# Number of frames between two log messages of the LatencyBudgetExecutor
+LATENCY_LOG_INTERVAL = 100
+
+
+def run_nodes(nodes: List[AbstractNode], frames: List[Dict[str, Any]]) -> None:
+    """Runs ``nodes`` in order on one or more frames, updating the data pool
+    of each frame with the outputs. Several frames are passed to each node at
+    once through ``node.run_batch()``. Once ``pipeline_end`` is set for a
+    frame, only nodes which take ``pipeline_end`` as an input are run on it.
+
+    Args:
+        nodes (:obj:`List[AbstractNode]`): Nodes to be run.
+        frames (:obj:`List[Dict[str, Any]]`): Data pool of each frame, in
+            order.
+    """
+    for node in nodes:
+        active = [
+            data
+            for data in frames
+            if not data.get("pipeline_end", False) or "pipeline_end" in node.inputs
+        ]
+        if not active:
+            continue
+        outputs = node.run_batch(
+            [get_node_inputs(node, data) for data in active]  # type: ignore
+        )
+        for data, node_outputs in zip(active, outputs):
+            data.update(node_outputs)
+
+
+def supports_batching(nodes: List[AbstractNode]) -> bool:
+    """Checks if any of ``nodes`` overrides :meth:`AbstractNode.run_batch`,
+    i.e., benefits from receiving several frames at once.
+    """
+    return any(type(node).run_batch is not AbstractNode.run_batch for node in nodes)
+
+
+def split_into_stages(nodes: List[AbstractNode]) -> List[List[AbstractNode]]:
+    """Groups consecutive nodes of the same node type, e.g., ``model``, into
+    a stage.
+
+    Args:
+        nodes (:obj:`List[AbstractNode]`): Nodes of the pipeline.
+
+    Returns:
+        (:obj:`List[List[AbstractNode]]`): Nodes in each stage, in order.
+    """
+    stages: List[List[AbstractNode]] = []
+    prev_type = None
+    for node in nodes:
+        node_type = node.node_name.split(".")[0]
+        if node_type != prev_type:
+            stages.append([])
+            prev_type = node_type
+        stages[-1].append(node)
+    return stages
+
+
+class PipelinedExecutor:  # pylint: disable=too-many-instance-attributes, too-few-public-methods
+    """Runs each stage of the pipeline in its own thread. Stages are connected
+    by bounded FIFO queues so consecutive frames are processed concurrently
+    while the order of frames is preserved.
+
+    The last stage runs on the calling thread since output nodes such as
+    ``output.screen`` have to interact with the GUI from the main thread.
+
+    Stages with nodes which support batching, e.g., ``model.yolo``, collect
+    up to ``batch_size`` frames from their input queue, waiting at most
+    ``batch_timeout`` seconds for more frames after the first one, and pass
+    them to the nodes at once.
+
+    Stages whose node type is in ``process_stages``, e.g., ``draw``, run in
+    a worker process instead of a thread, so that they are not limited by the
+    GIL. Frames are passed to the worker through shared memory. The first
+    stage always runs in this process.
+
+    Stages whose node type is in ``stage_cpu_affinity`` are pinned to the
+    given CPU cores, e.g., ``{"model": [0, 1, 2], "draw": [3]}``, on Linux.
+    The last stage is pinned for the duration of the run only.
+
+    Args:
+        pipeline (:obj:`Pipeline`): Pipeline to be executed.
+        queue_size (:obj:`int`): Maximum number of frames waiting between two
+            stages.
+        batch_size (:obj:`int`): Maximum number of frames processed at once
+            by a stage. **Default: 1**.
+        batch_timeout (:obj:`float`): Maximum time, in seconds, to wait for a
+            batch to fill up. **Default: 0.0**.
+        process_stages (:obj:`List[str]` | :obj:`None`): Node types of the
+            stages to be run in worker processes. **Default: None**.
+        shm_slots (:obj:`int`): Number of shared memory slots, each holding
+            one frame, for every worker process. **Default: 4**.
+        stage_cpu_affinity (:obj:`Dict[str, List[int]]` | :obj:`None`): CPU
+            cores of the stages, by node type. **Default: None**.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        pipeline: Pipeline,
+        queue_size: int,
+        batch_size: int = 1,
+        batch_timeout: float = 0.0,
+        process_stages: Optional[List[str]] = None,
+        shm_slots: int = 4,
+        stage_cpu_affinity: Optional[Dict[str, List[int]]] = None,
+    ) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.pipeline = pipeline
+        self.stages = split_into_stages(pipeline.nodes)
+        # the first stage creates the frames so it cannot batch them
+        self.batch_sizes = [
+            batch_size if idx > 0 and supports_batching(stage) else 1
+            for idx, stage in enumerate(self.stages)
+        ]
+        self.batch_timeout = batch_timeout
+        stage_types = [stage[0].node_name.split(".")[0] for stage in self.stages]
+        process_stages = process_stages or []
+        self.process_stage_idxs = [
+            idx
+            for idx, node_type in enumerate(stage_types)
+            if idx > 0 and node_type in process_stages
+        ]
+        self.shm_slots = shm_slots
+        stage_cpu_affinity = stage_cpu_affinity or {}
+        self.stage_cores = {
+            idx: stage_cpu_affinity[node_type]
+            for idx, node_type in enumerate(stage_types)
+            if node_type in stage_cpu_affinity
+        }
+        self._process_stages: Dict[int, ProcessStage] = {}
+        # a queue has to hold a full batch of the stage reading from it
+        self.queues: List[queue.Queue] = [
+            queue.Queue(maxsize=max(queue_size, stage_batch_size))
+            for stage_batch_size in self.batch_sizes[1:]
+        ]
+        self._abort = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        # index of the furthest stage which has produced a pipeline_end frame
+        self._end_stage = -1
+        self._errors: List[Exception] = []
+        self._last_data: Dict[str, Any] = {}
+
+    def run(self) -> None:
+        """Runs the pipeline until a node sets ``pipeline_end``."""
+        last_idx = len(self.stages) - 1
+        threads = [
+            threading.Thread(
+                target=self._run_stage, args=(idx,), name=f"Stage-{idx}", daemon=True
+            )
+            for idx in range(last_idx)
+        ]
+        self.logger.info(
+            f"Running {len(self.stages)} pipelined stages: "
+            f"{[[node.node_name for node in stage] for stage in self.stages]}"
+        )
+        # worker processes take a while to start, so they are started first
+        for idx in self.process_stage_idxs:
+            self._process_stages[idx] = ProcessStage(self.stages[idx], self.shm_slots)
+            if idx in self.stage_cores:
+                pin_thread(self.stage_cores[idx], self._process_stages[idx].process.pid)
+        calling_thread_cores = available_cores()
+        try:
+            for thread in threads:
+                thread.start()
+            self._run_stage(last_idx)
+        except BaseException:
+            self._abort.set()
+            raise
+        finally:
+            if last_idx in self.stage_cores:
+                pin_thread(calling_thread_cores)
+            for thread in threads:
+                if thread.ident is not None:
+                    thread.join()
+            for process_stage in self._process_stages.values():
+                process_stage.close()
+        if self._errors:
+            raise self._errors[0]
+        self.pipeline.data = self._last_data
+        self.pipeline.terminate = True
+
+    def _run_stage(self, idx: int) -> None:
+        """Processes frames with the nodes in the stage at ``idx``. The first
+        stage creates a new data pool for every frame.
+        """
+        in_queue = self.queues[idx - 1] if idx > 0 else None
+        out_queue = self.queues[idx] if idx < len(self.queues) else None
+        if idx in self.stage_cores and idx not in self.process_stage_idxs:
+            pin_thread(self.stage_cores[idx])
+        try:
+            while True:
+                frames = self._next_frames(in_queue, idx)
+                if not frames:
+                    return
+                if idx in self._process_stages:
+                    self._process_stages[idx].run(frames)
+                else:
+                    run_nodes(self.stages[idx], frames)
+                if not self._pass_on(frames, out_queue, idx):
+                    return
+        except Exception as error:  # pylint: disable=broad-except
+            self.logger.error(f"Stage {idx} stopped due to {repr(error)}")
+            self._errors.append(error)
+            self._abort.set()
+
+    def _next_frames(
+        self, in_queue: Optional[queue.Queue], idx: int
+    ) -> List[Dict[str, Any]]:
+        """Returns the frames to be processed next by the stage at ``idx``,
+        i.e., a new data pool for the first stage or a batch from its input
+        queue otherwise, or no frames once the stage has to stop.
+        """
+        if in_queue is not None:
+            return self._get_batch(in_queue, idx)
+        if self._should_stop(idx):
+            return []
+        return [{}]
+
+    def _pass_on(
+        self, frames: List[Dict[str, Any]], out_queue: Optional[queue.Queue], idx: int
+    ) -> bool:
+        """Passes processed ``frames`` on to the next stage, or keeps the last
+        one as the result if the stage at ``idx`` is the last stage.
+
+        Returns:
+            (:obj:`bool`): False if the stage has to stop, i.e., once a frame
+            has ``pipeline_end`` set or the pipeline is aborted.
+        """
+        for data in frames:
+            pipeline_end = data.get("pipeline_end", False)
+            if pipeline_end:
+                self._end(idx)
+            if out_queue is None:
+                self._last_data = data
+            elif not self._put(out_queue, data, idx):
+                return False
+            if pipeline_end:
+                return False
+        return True
+
+    def _end(self, idx: int) -> None:
+        """Stops all stages before ``idx``. Later stages keep running until
+        they receive the ``pipeline_end`` frame.
+        """
+        with self._lock:
+            self._end_stage = max(self._end_stage, idx)
+        self._stop.set()
+
+    def _should_stop(self, idx: int) -> bool:
+        return self._abort.is_set() or (self._stop.is_set() and idx < self._end_stage)
+
+    def _get(self, in_queue: queue.Queue, idx: int) -> Optional[Dict[str, Any]]:
+        while not self._should_stop(idx):
+            try:
+                return in_queue.get(timeout=QUEUE_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return None
+
+    def _get_batch(self, in_queue: queue.Queue, idx: int) -> List[Dict[str, Any]]:
+        """Waits for the next frame, then collects frames which arrive within
+        ``batch_timeout`` until the batch is full or a frame has
+        ``pipeline_end`` set.
+        """
+        data = self._get(in_queue, idx)
+        if data is None:
+            return []
+        frames = [data]
+        deadline = time.monotonic() + self.batch_timeout
+        while len(frames) < self.batch_sizes[idx] and not data.get(
+            "pipeline_end", False
+        ):
+            try:
+                data = in_queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            frames.append(data)
+        return frames
+
+    def _put(self, out_queue: queue.Queue, data: Dict[str, Any], idx: int) -> bool:
+        while not self._should_stop(idx):
+            try:
+                out_queue.put(data, timeout=QUEUE_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+
+class DAGExecutor:  # pylint: disable=too-few-public-methods
+    """Runs nodes which do not depend on each other, according to
+    :py:attr:`Pipeline.dependencies <peekingduck.pipeline.pipeline.Pipeline>`,
+    concurrently on a thread pool. Frames are processed one at a time, so the
+    latency of a frame is that of the longest branch of the pipeline.
+
+    Every node sees the same data as it would when the nodes are run
+    sequentially, i.e., for each input the value written by the closest
+    preceding node.
+
+    Args:
+        pipeline (:obj:`Pipeline`): Pipeline to be executed.
+        max_workers (:obj:`int`): Maximum number of nodes running at the same
+            time.
+    """
+
+    def __init__(self, pipeline: Pipeline, max_workers: int) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.pipeline = pipeline
+        self.max_workers = max_workers
+        nodes = pipeline.nodes
+        self.dependents: List[List[int]] = [[] for _ in nodes]
+        for idx, dependencies in enumerate(pipeline.dependencies):
+            for dependency in dependencies:
+                self.dependents[dependency].append(idx)
+        # for every input of a node, the preceding nodes which output it,
+        # closest first
+        self.writers = [
+            {
+                key: [
+                    prev_idx
+                    for prev_idx in reversed(range(idx))
+                    if key in nodes[prev_idx].outputs
+                ]
+                for key in set(node.inputs) | {"pipeline_end"}
+            }
+            for idx, node in enumerate(nodes)
+        ]
+        self.main_thread_nodes = [
+            node.node_name.split(".")[0] in MAIN_THREAD_NODE_TYPES for node in nodes
+        ]
+
+    def run(self) -> None:
+        """Runs the pipeline until a node sets ``pipeline_end``."""
+        with ThreadPoolExecutor(self.max_workers, thread_name_prefix="DAG") as pool:
+            while not self.pipeline.terminate:
+                self._run_frame(pool)
+
+    def _run_frame(self, pool: ThreadPoolExecutor) -> None:
+        """Runs every node on one frame, starting each node as soon as the
+        nodes it depends on are done.
+        """
+        num_nodes = len(self.pipeline.nodes)
+        base = self.pipeline.data
+        outputs: List[Dict[str, Any]] = [{} for _ in range(num_nodes)]
+        num_pending = [len(deps) for deps in self.pipeline.dependencies]
+        ready = [idx for idx in range(num_nodes) if num_pending[idx] == 0]
+        running: Dict[Future, int] = {}
+        while ready or running:
+            done = []
+            for idx in ready:
+                if self.main_thread_nodes[idx]:
+                    done.append((idx, self._run_node(idx, base, outputs)))
+                else:
+                    running[pool.submit(self._run_node, idx, base, outputs)] = idx
+            ready = []
+            if running and not done:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                done = [(running.pop(future), future.result()) for future in finished]
+            for idx, (node_outputs, pipeline_end) in done:
+                outputs[idx] = node_outputs
+                if pipeline_end:
+                    self.pipeline.terminate = True
+                for dependent in self.dependents[idx]:
+                    num_pending[dependent] -= 1
+                    if num_pending[dependent] == 0:
+                        ready.append(dependent)
+
+        data = dict(base)
+        for node_outputs in outputs:
+            data.update(node_outputs)
+        self.pipeline.data = data
+
+    def _run_node(
+        self, idx: int, base: Dict[str, Any], outputs: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Runs the node at ``idx`` with inputs resolved from the outputs of
+        preceding nodes in this frame, or from the data pool of the previous
+        frame.
+
+        Returns:
+            (:obj:`Tuple[Dict[str, Any], bool]`): Outputs of the node and
+            whether ``pipeline_end`` was set when the node started.
+        """
+        node = self.pipeline.nodes[idx]
+        pipeline_end = self._resolve(idx, "pipeline_end", base, outputs)
+        pipeline_end = pipeline_end is not MISSING and bool(pipeline_end)
+        if pipeline_end and "pipeline_end" not in node.inputs:
+            return {}, True
+
+        if "all" in node.inputs:
+            data = dict(base)
+            for node_outputs in outputs[:idx]:
+                data.update(node_outputs)
+            return node.run(read_only_view(data)), pipeline_end  # type: ignore
+        inputs = {}
+        for key in node.inputs:
+            value = self._resolve(idx, key, base, outputs)
+            if value is not MISSING:
+                inputs[key] = value
+        return node.run(inputs), pipeline_end
+
+    def _resolve(
+        self, idx: int, key: str, base: Dict[str, Any], outputs: List[Dict[str, Any]]
+    ) -> Any:
+        for prev_idx in self.writers[idx][key]:
+            if key in outputs[prev_idx]:
+                return outputs[prev_idx][key]
+        return base.get(key, MISSING)
+
+
+class MultiStreamExecutor:  # pylint: disable=too-few-public-methods
+    """Runs one pipeline per input stream in lockstep, one frame of every
+    stream at a time. A node instance shared by several pipelines, e.g., a
+    model node, receives the frames of all streams in a single
+    ``node.run_batch()`` call, so the model is loaded once and runs batched
+    inference across streams.
+
+    Each stream ends on its own, in the same way as a single pipeline run
+    sequentially, and the executor returns when all streams have ended.
+
+    With ``max_workers`` above 1, the node instances of each step, e.g., the
+    input node of every stream, run at the same time on a pool of threads.
+
+    Args:
+        pipelines (:obj:`List[Pipeline]`): Pipelines of each stream, created
+            from the same list of nodes.
+        max_workers (:obj:`int`): Number of threads running the nodes.
+            **Default: 1**.
+    """
+
+    def __init__(self, pipelines: List[Pipeline], max_workers: int = 1) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.pipelines = pipelines
+        self.max_workers = max_workers
+        num_nodes = {len(pipeline.nodes) for pipeline in pipelines}
+        if len(num_nodes) != 1:
+            raise ValueError("All streams must have the same number of nodes")
+
+    def run(self) -> None:
+        """Runs every stream until a node sets ``pipeline_end``."""
+        self.logger.info(f"Running {len(self.pipelines)} streams")
+        pool = (
+            ThreadPoolExecutor(self.max_workers, thread_name_prefix="stream")
+            if self.max_workers > 1
+            else None
+        )
+        try:
+            active = [pipeline for pipeline in self.pipelines if not pipeline.terminate]
+            while active:
+                self._run_frame(active, pool)
+                for pipeline in active:
+                    if pipeline.terminate:
+                        self.logger.info(
+                            f"Stream {self.pipelines.index(pipeline)} has ended"
+                        )
+                active = [pipeline for pipeline in active if not pipeline.terminate]
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    @staticmethod
+    def _run_frame(
+        pipelines: List[Pipeline], pool: Optional[ThreadPoolExecutor] = None
+    ) -> None:
+        """Runs the nodes on the current frame of every stream, grouping the
+        frames of streams which share a node instance into one batch.
+        """
+        for step_nodes in zip(*(pipeline.nodes for pipeline in pipelines)):
+            groups: Dict[int, Tuple[AbstractNode, List[Dict[str, Any]]]] = {}
+            for pipeline, node in zip(pipelines, step_nodes):
+                if pipeline.data.get("pipeline_end", False):
+                    pipeline.terminate = True
+                groups.setdefault(id(node), (node, []))[1].append(pipeline.data)
+            if pool is None or len(groups) == 1:
+                for node, frames in groups.values():
+                    run_nodes([node], frames)
+            else:
+                futures = [
+                    pool.submit(run_nodes, [node], frames)
+                    for node, frames in groups.values()
+                ]
+                for future in futures:
+                    future.result()
+
+
+class LatencyBudgetExecutor:  # pylint: disable=too-many-instance-attributes, too-few-public-methods
+    """Runs every node on a frame before the next frame is read, like the
+    sequential runner, but skips nodes of ``skip_node_types``, e.g., slow
+    model nodes, on some frames so that a live input is processed at the
+    camera rate.
+
+    The latency of a frame is its ``frame_age``, i.e., how old the frame was
+    when it was output by the input node, plus the time taken to run the
+    rest of the pipeline on it. Every frame whose latency is above
+    ``latency_budget`` adds the excess to a backlog, and every frame below the
+    budget pays off the difference. The skippable nodes only run on frames
+    read while there is no backlog, so a model which is slower than the
+    budget refreshes its results as often as the budget allows.
+
+    With ``gate_key``, the skippable nodes are also skipped on frames where
+    that key of the data pool is False, e.g., ``motion`` from
+    ``dabble.motion`` on frames of a static scene. A latency budget of 0 then
+    only skips nodes on those frames.
+
+    On a skipped frame, the outputs of the skipped nodes on the last frame
+    they ran on, e.g., ``bboxes`` and ``keypoints``, are carried forward so
+    that draw and output nodes still produce output for every frame.
+
+    Args:
+        pipeline (:obj:`Pipeline`): Pipeline to be executed.
+        latency_budget (:obj:`float`): Target latency of a frame, in seconds,
+            or 0 for no budget.
+        skip_node_types (:obj:`List[str]`): Node types which may be skipped.
+        max_skipped_frames (:obj:`int`): Maximum number of consecutive frames
+            on which the nodes are skipped.
+        gate_key (:obj:`Optional[str]`): Key of the data pool which has to be
+            True for the nodes to run. **Default: None**.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        pipeline: Pipeline,
+        latency_budget: float,
+        skip_node_types: List[str],
+        max_skipped_frames: int,
+        gate_key: Optional[str] = None,
+    ) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.pipeline = pipeline
+        self.latency_budget = latency_budget
+        self.max_skipped_frames = max_skipped_frames
+        self.gate_key = gate_key
+        if gate_key and not any(gate_key in node.outputs for node in pipeline.nodes):
+            self.logger.warning(f"No node outputs {gate_key}, no frame is gated")
+        self.skippable = [
+            node.node_name.split(".")[0] in skip_node_types for node in pipeline.nodes
+        ]
+        # outputs of each skippable node on the last frame it ran on
+        self._carried: Dict[int, Dict[str, Any]] = {}
+        self.backlog = 0.0
+        self.num_skipped_in_row = 0
+        self._stats = LatencyStats()
+        self._window = LatencyStats()
+
+    def run(self) -> None:
+        """Runs the pipeline until a node sets ``pipeline_end``."""
+        while not self.pipeline.terminate:
+            self._run_frame()
+        if self._stats.num_frames:
+            self.logger.info(f"Latency budget summary: {self._stats}")
+
+    def _run_frame(self) -> None:
+        data = self.pipeline.data
+        start = time.monotonic()
+        run_skippable: Optional[bool] = None
+        for idx, node in enumerate(self.pipeline.nodes):
+            if data.get("pipeline_end", False):
+                self.pipeline.terminate = True
+                if "pipeline_end" not in node.inputs:
+                    continue
+            if self.skippable[idx]:
+                if run_skippable is None:
+                    run_skippable = self._should_run(data)
+                if not run_skippable:
+                    data.update(self._carried[idx])
+                    continue
+            outputs = node.run(get_node_inputs(node, data))  # type: ignore
+            data.update(outputs)
+            if self.skippable[idx]:
+                self._carried[idx] = outputs
+            if idx == 0:
+                # the frame age covers the time spent in the input node
+                start = time.monotonic()
+        if self.pipeline.terminate or run_skippable is None:
+            return
+
+        frame_age = data.get("frame_age", 0.0)
+        latency = frame_age + time.monotonic() - start
+        forced = run_skippable and self.num_skipped_in_row >= self.max_skipped_frames
+        # a forced run starts a new backlog as the old one cannot be paid off
+        backlog = 0.0 if forced else self.backlog
+        if self.latency_budget > 0:
+            self.backlog = max(0.0, backlog + latency - self.latency_budget)
+        self.num_skipped_in_row = 0 if run_skippable else self.num_skipped_in_row + 1
+        for stats in (self._stats, self._window):
+            stats.update(frame_age, latency, not run_skippable)
+        if self._window.num_frames == LATENCY_LOG_INTERVAL:
+            self.logger.info(f"Latency budget: {self._window}")
+            self._window = LatencyStats()
+
+    def _should_run(self, data: Dict[str, Any]) -> bool:
+        """Decides if the skippable nodes run on the current frame."""
+        if (
+            len(self._carried) < sum(self.skippable)
+            or self.num_skipped_in_row >= self.max_skipped_frames
+        ):
+            return True
+        if self.gate_key and not data.get(self.gate_key, True):
+            return False
+        return self.backlog <= 0.0
+
+
+class LatencyStats:
+    """Accumulates the frame ages and latencies seen by
+    :class:`LatencyBudgetExecutor`.
+    """
+
+    def __init__(self) -> None:
+        self.num_frames = 0
+        self.num_skipped = 0
+        self.total_age = 0.0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.num_skipped}/{self.num_frames} frames skipped, "
+            f"avg frame age={self.total_age / self.num_frames:.3f}s, "
+            f"avg latency={self.total_latency / self.num_frames:.3f}s, "
+            f"max latency={self.max_latency:.3f}s"
+        )
+
+    def update(self, frame_age: float, latency: float, skipped: bool) -> None:
+        """Adds a frame to the statistics."""
+        self.num_frames += 1
+        self.num_skipped += skipped
+        self.total_age += frame_age
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
@@ -0,0 +1,302 @@
+# Copyright 2021 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Moves frames between processes through shared memory so that stages of the
+pipeline can run in worker processes without pickling full images.
+"""
+
+import logging
+import multiprocessing as mp
+from multiprocessing.connection import Connection
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None  # type: ignore
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from peekingduck.pipeline.nodes.node import AbstractNode
+
+# Arrays smaller than this are pickled as they are cheap to copy
+MIN_SHARED_BYTES = 64 * 1024
+
+
+class ArrayRef(NamedTuple):
+    """Location of an array stored in a slot of a :class:`SharedFrameRing`."""
+
+    slot: int
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+class SharedFrameRing:
+    """A fixed number of equally sized slots in one shared memory block.
+    Arrays written into a slot can be read from any process attached to the
+    ring as numpy arrays backed by the shared memory, without copying.
+
+    Args:
+        num_slots (:obj:`int`): Number of slots.
+        slot_size (:obj:`int`): Size of each slot in bytes.
+        name (:obj:`str` | :obj:`None`): Name of an existing block to attach
+            to. A new block is created if None.
+    """
+
+    def __init__(
+        self, num_slots: int, slot_size: int, name: Optional[str] = None
+    ) -> None:
+        if shared_memory is None:
+            raise ValueError("Shared memory transport requires Python 3.8 or above")
+        self.num_slots = num_slots
+        self.slot_size = slot_size
+        self.is_owner = name is None
+        self.shm = shared_memory.SharedMemory(
+            name=name, create=self.is_owner, size=num_slots * slot_size
+        )
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block."""
+        return self.shm.name
+
+    def fits(self, array: np.ndarray) -> bool:
+        """Checks if ``array`` fits into a slot."""
+        return array.nbytes <= self.slot_size
+
+    def write(self, slot: int, array: np.ndarray) -> ArrayRef:
+        """Copies ``array`` into ``slot``."""
+        ref = ArrayRef(slot, array.shape, array.dtype.str)
+        np.copyto(self.view(ref), array)
+        return ref
+
+    def view(self, ref: ArrayRef) -> np.ndarray:
+        """Returns a writeable array backed by the slot in ``ref``."""
+        return np.ndarray(
+            ref.shape,
+            dtype=np.dtype(ref.dtype),
+            buffer=self.shm.buf,
+            offset=ref.slot * self.slot_size,
+        )
+
+    def close(self) -> None:
+        """Detaches from the shared memory block, which is also freed if it
+        was created by this ring.
+        """
+        self.shm.close()
+        if self.is_owner:
+            self.shm.unlink()
+
+
+def pack_frame(
+    data: Dict[str, Any], ring: Optional[SharedFrameRing], free_slots: List[int]
+) -> Dict[str, Any]:
+    """Replaces large numpy arrays in ``data`` with references to copies in
+    ``ring``, taking slots from ``free_slots``. Other values, and arrays
+    which do not fit, are left to be pickled.
+    """
+    packed = {}
+    for key, value in data.items():
+        if ring is not None and free_slots and _is_shareable(value, ring):
+            value = ring.write(free_slots.pop(0), value)
+        packed[key] = value
+    return packed
+
+
+def _is_shareable(value: Any, ring: SharedFrameRing) -> bool:
+    """Checks if ``value`` is a numpy array which is large enough to be worth
+    passing through shared memory and fits into a slot of ``ring``.
+    """
+    return (
+        isinstance(value, np.ndarray)
+        and not value.dtype.hasobject
+        and MIN_SHARED_BYTES <= value.nbytes
+        and ring.fits(value)
+    )
+
+
+def unpack_frame(
+    packed: Dict[str, Any], ring: Optional[SharedFrameRing]
+) -> Dict[str, Any]:
+    """Replaces array references in ``packed`` with views of the shared
+    memory.
+    """
+    return {
+        key: ring.view(value) if isinstance(value, ArrayRef) else value  # type: ignore
+        for key, value in packed.items()
+    }
+
+
+class ProcessStage:
+    """Runs ``nodes`` in a worker process. Large arrays, e.g., ``img``, are
+    passed through a :class:`SharedFrameRing` and only the remaining values,
+    e.g., bboxes and labels, are pickled. Changes made in place by the nodes,
+    e.g., drawing on ``img``, are copied back into the original arrays.
+
+    The arrays are still copied into the shared memory and, if changed, back
+    out of it, so the transport saves pickling and piping the arrays rather
+    than copying them. Only the worker reads them without a copy.
+
+    There is one worker per stage, which runs the frames of every call in
+    order while the calling thread waits for it. Process stages run in
+    parallel with the other stages of the pipeline, as thread stages do, but
+    frames are not spread across several workers of the same stage.
+
+    The worker is started with the "forkserver" method where available, or
+    "spawn" otherwise, and ``nodes`` are pickled to it. Forking this process
+    is not safe once models and the threads of the pipeline, e.g., of
+    TensorFlow or the input nodes, have been started, as the child would
+    inherit locks held by threads which do not exist in it.
+
+    Args:
+        nodes (:obj:`List[AbstractNode]`): Nodes to be run in the worker.
+            They have to be picklable.
+        num_slots (:obj:`int`): Number of arrays which can be passed through
+            shared memory in one call, including arrays output by the nodes.
+    """
+
+    def __init__(self, nodes: List[AbstractNode], num_slots: int) -> None:
+        if shared_memory is None:
+            raise ValueError("process_stages requires Python 3.8 or above")
+        self.logger = logging.getLogger(__name__)
+        self.num_slots = num_slots
+        self.ring: Optional[SharedFrameRing] = None
+        method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+        context = mp.get_context(method)
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_run_worker, args=(nodes, child_conn), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def run(self, frames: List[Dict[str, Any]]) -> None:
+        """Runs the nodes on ``frames`` in the worker process, updating the
+        data pool of each frame with the outputs.
+        """
+        if self.ring is None:
+            self._create_ring(frames)
+        free_slots = list(range(self.num_slots))
+        packed_frames = [pack_frame(data, self.ring, free_slots) for data in frames]
+        self.conn.send(("run", (packed_frames, free_slots)))
+        status, result = self.conn.recv()
+        if status == "error":
+            raise result
+
+        for data, packed, packed_outputs in zip(frames, packed_frames, result):
+            for key, value in packed.items():
+                if isinstance(value, ArrayRef) and data[key].flags.writeable:
+                    np.copyto(data[key], self.ring.view(value))  # type: ignore
+            # output arrays are copied out as their slots are reused
+            data.update(
+                {
+                    key: self.ring.view(value).copy()  # type: ignore
+                    if isinstance(value, ArrayRef)
+                    else value
+                    for key, value in packed_outputs.items()
+                }
+            )
+
+    def close(self) -> None:
+        """Stops the worker process and frees the shared memory."""
+        if self.process.is_alive():
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join(timeout=5)
+            if self.process.is_alive():
+                self.process.terminate()
+        self.conn.close()
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+    def _create_ring(self, frames: List[Dict[str, Any]]) -> None:
+        """Sizes the slots to hold the largest array in the first frames.
+        Larger arrays in later frames are pickled.
+        """
+        sizes = [
+            value.nbytes
+            for data in frames
+            for value in data.values()
+            if isinstance(value, np.ndarray) and not value.dtype.hasobject
+        ]
+        slot_size = max(sizes + [MIN_SHARED_BYTES])
+        self.ring = SharedFrameRing(self.num_slots, slot_size)
+        self.conn.send(("attach", (self.ring.name, self.num_slots, slot_size)))
+        self.logger.info(
+            f"Created {self.num_slots} shared memory slots of {slot_size} bytes"
+        )
+
+
+def _run_worker(nodes: List[AbstractNode], conn: Connection) -> None:
+    """Entry point of the worker process of a :class:`ProcessStage`."""
+    ring = None
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            command, payload = message
+            if command == "attach":
+                name, num_slots, slot_size = payload
+                ring = SharedFrameRing(num_slots, slot_size, name=name)
+                continue
+            packed_frames, free_slots = payload
+            try:
+                result = _run_packed_frames(nodes, packed_frames, ring, free_slots)
+            except Exception as error:  # pylint: disable=broad-except
+                try:
+                    conn.send(("error", error))
+                except Exception:  # pylint: disable=broad-except
+                    # the error cannot be pickled
+                    conn.send(("error", RuntimeError(repr(error))))
+                continue
+            conn.send(("ok", result))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        if ring is not None:
+            ring.close()
+
+
+def _run_packed_frames(
+    nodes: List[AbstractNode],
+    packed_frames: List[Dict[str, Any]],
+    ring: Optional[SharedFrameRing],
+    free_slots: List[int],
+) -> List[Dict[str, Any]]:
+    """Runs ``nodes`` on the frames sent to the worker, and packs the values
+    added or replaced by them.
+    """
+    # pylint: disable=import-outside-toplevel, cyclic-import
+    from peekingduck.pipeline.executors import run_nodes
+
+    frames = [unpack_frame(packed, ring) for packed in packed_frames]
+    originals = [dict(data) for data in frames]
+    run_nodes(nodes, frames)
+    return [
+        pack_frame(
+            {
+                key: value
+                for key, value in data.items()
+                if original.get(key) is not value
+            },
+            ring,
+            free_slots,
+        )
+        for data, original in zip(frames, originals)
+    ]
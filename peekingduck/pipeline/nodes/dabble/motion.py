@@ -0,0 +1,93 @@
+# Copyright 2021 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Detects motion in the frame, to skip inference on static frames.
+"""
+
+from typing import Any, Dict, Optional
+
+import cv2
+import numpy as np
+
+from peekingduck.pipeline.nodes.node import AbstractNode
+
+
+class Node(AbstractNode):
+    """Detects whether anything moved in the frame, by comparing a downscaled
+    grey copy of the frame with a running average of the previous ones.
+
+    With ``motion_gating`` set in the runner config, model nodes are skipped
+    on frames without motion and their last ``bboxes``, ``keypoints`` and
+    other outputs are reused, e.g., for CCTV footage of a mostly static scene.
+    ``max_skipped_frames`` in the runner config sets the maximum number of
+    frames between two runs of the models.
+
+    Inputs:
+        |img|
+
+    Outputs:
+        |motion|
+
+    Configs:
+        downscale_width (:obj:`int`): **default = 160**. |br|
+            Width the frame is downscaled to before it is compared, keeping
+            its aspect ratio.
+        pixel_threshold (:obj:`int`): **default = 25**. |br|
+            Minimum difference in grey level, from 0 to 255, for a pixel to
+            count as changed.
+        sensitivity (:obj:`float`): **default = 0.002**. |br|
+            Minimum fraction of changed pixels for the frame to have motion.
+            Lower values detect smaller or more distant movements.
+        background_rate (:obj:`float`): **default = 0.05**. |br|
+            Weight of each frame in the running average it is compared with.
+            Higher values adapt faster to changes in lighting, but miss slow
+            movements.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        super().__init__(config, node_path=__name__, **kwargs)
+        if self.downscale_width < 1:
+            raise ValueError("downscale_width must be at least 1")
+        if not 0 <= self.sensitivity <= 1:
+            raise ValueError("sensitivity must be between 0 and 1")
+        if not 0 < self.background_rate <= 1:
+            raise ValueError("background_rate must be above 0 and at most 1")
+        self._background: Optional[np.ndarray] = None
+
+    def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Compares the frame with the background and updates it."""
+        grey = self._downscale(inputs["img"])
+        if self._background is None or self._background.shape != grey.shape:
+            # first frame, or the resolution of the input changed
+            self._background = grey.astype(np.float32)
+            return {"motion": True}
+
+        diff = cv2.absdiff(grey, cv2.convertScaleAbs(self._background))
+        changed = np.count_nonzero(diff > self.pixel_threshold) / diff.size
+        cv2.accumulateWeighted(grey, self._background, self.background_rate)
+        return {"motion": changed >= self.sensitivity}
+
+    def _downscale(self, frame: np.ndarray) -> np.ndarray:
+        height, width = frame.shape[:2]
+        size = (
+            min(self.downscale_width, width),
+            max(1, round(height * min(self.downscale_width, width) / width)),
+        )
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        # smooths out sensor noise
+        return cv2.GaussianBlur(small, (5, 5), 0)
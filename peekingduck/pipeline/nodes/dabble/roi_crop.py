@@ -0,0 +1,121 @@
+# Copyright 2021 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Crops regions of interest of the frame before inference.
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from peekingduck.pipeline.nodes.node import AbstractNode
+
+
+class Node(AbstractNode):
+    """Crops one or more regions of interest out of the frame, so that the
+    models which follow only process those regions, e.g., a doorway or a
+    counter seen by a fixed camera.
+
+    The regions are packed into a grid in a single image which replaces
+    ``img``, so that each model still runs once per frame. The full frame is
+    kept in ``roi_frame``, and :mod:`dabble.roi_restore` maps the outputs of
+    the models back onto it, so that ``draw`` nodes and
+    :mod:`dabble.zone_count` work as without cropping.
+
+    Inputs:
+        |img|
+
+    Outputs:
+        |img|
+
+        |roi_frame|
+
+        |roi_tiles|
+
+    Configs:
+        rois (:obj:`List[List[float]]`):
+            **default = [[0.0, 0.0, 1.0, 1.0]]**. |br|
+            Regions of interest, each as normalised ``[x1, y1, x2, y2]``
+            coordinates of the frame.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        super().__init__(config, node_path=__name__, **kwargs)
+        if not self.rois:
+            raise ValueError("rois must contain at least one region")
+        for roi in self.rois:
+            if (
+                len(roi) != 4
+                or not 0 <= roi[0] < roi[2] <= 1
+                or not 0 <= roi[1] < roi[3] <= 1
+            ):
+                raise ValueError(
+                    f"Invalid roi {roi}: must be [x1, y1, x2, y2] with "
+                    "0 <= x1 < x2 <= 1 and 0 <= y1 < y2 <= 1"
+                )
+        self.num_cols = math.ceil(math.sqrt(len(self.rois)))
+        self.num_rows = math.ceil(len(self.rois) / self.num_cols)
+
+    def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Packs the regions of interest of ``img`` into a new image."""
+        frame = inputs["img"]
+        height, width = frame.shape[:2]
+        rects = np.array([_to_pixels(roi, width, height) for roi in self.rois])
+        boxes, mosaic_shape = _grid_layout(rects, self.num_cols, self.num_rows)
+        mosaic = np.zeros(mosaic_shape + frame.shape[2:], dtype=frame.dtype)
+        for box, rect in zip(boxes, rects):
+            _region(mosaic, box)[:] = _region(frame, rect)
+        tiles = np.hstack(
+            [boxes / (mosaic_shape[::-1] * 2), rects / ((width, height) * 2)]
+        )
+
+        return {"img": mosaic, "roi_frame": frame, "roi_tiles": tiles}
+
+
+def _grid_layout(
+    rects: np.ndarray, num_cols: int, num_rows: int
+) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """Places the regions in the cells of a grid, filled row by row, where
+    every cell fits the largest region.
+
+    Returns:
+        (:obj:`Tuple[np.ndarray, Tuple[int, int]]`): The ``[x1, y1, x2, y2]``
+        pixel coordinates of every region in the grid, and the height and
+        width of the grid.
+    """
+    sizes = rects[:, 2:] - rects[:, :2]
+    cell_width, cell_height = sizes.max(axis=0)
+    indices = np.arange(len(rects))
+    corners = np.stack(
+        [indices % num_cols * cell_width, indices // num_cols * cell_height], axis=1
+    )
+    return (
+        np.hstack([corners, corners + sizes]),
+        (int(num_rows * cell_height), int(num_cols * cell_width)),
+    )
+
+
+def _region(image: np.ndarray, rect: np.ndarray) -> np.ndarray:
+    """View of the ``[x1, y1, x2, y2]`` pixel region of the image."""
+    return image[rect[1] : rect[3], rect[0] : rect[2]]
+
+
+def _to_pixels(roi: List[float], width: int, height: int) -> Tuple[int, ...]:
+    """Pixel coordinates of a normalised region, at least 1 pixel wide."""
+    x_1, x_2 = (int(round(coord * width)) for coord in (roi[0], roi[2]))
+    y_1, y_2 = (int(round(coord * height)) for coord in (roi[1], roi[3]))
+    return x_1, y_1, max(x_2, x_1 + 1), max(y_2, y_1 + 1)
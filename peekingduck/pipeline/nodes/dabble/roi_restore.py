@@ -0,0 +1,127 @@
+# Copyright 2021 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Maps outputs of models run on regions of interest back onto the full frame.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from peekingduck.pipeline.nodes.node import AbstractNode
+
+
+class Node(AbstractNode):
+    """Maps the bounding boxes and keypoints detected on the regions of
+    interest packed by :mod:`dabble.roi_crop` back to normalised coordinates
+    of the full frame, and restores the full frame as ``img``.
+
+    Each bounding box is assigned to the region containing its center, and
+    each pose to the region containing the mean of its detected keypoints, or
+    to the nearest region if it lies in the padding between regions.
+    Bounding boxes are clipped to their region.
+
+    By default, only ``bboxes`` are mapped. To also map the outputs of pose
+    estimation models, add ``keypoints`` and ``keypoint_conns`` to both
+    ``input`` and ``output``.
+
+    Inputs:
+        |roi_frame|
+
+        |roi_tiles|
+
+        |bboxes|
+
+        |keypoints|
+
+        |keypoint_conns|
+
+    Outputs:
+        |img|
+
+        |bboxes|
+
+        |keypoints|
+
+        |keypoint_conns|
+
+    Configs:
+        None.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        super().__init__(config, node_path=__name__, **kwargs)
+
+    def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Maps the inputs which are given back onto the full frame."""
+        tiles = inputs["roi_tiles"]
+        outputs: Dict[str, Any] = {"img": inputs["roi_frame"]}
+        if "bboxes" in inputs:
+            outputs["bboxes"] = _map_bboxes(inputs["bboxes"], tiles)
+        if "keypoints" in inputs:
+            keypoints = np.array(inputs["keypoints"], dtype=float)
+            keypoint_conns = inputs.get("keypoint_conns")
+            mapped_conns = []
+            for idx, pose in enumerate(keypoints):
+                detected = (pose >= 0).all(axis=1)
+                if not detected.any():
+                    mapped_conns.append(
+                        keypoint_conns[idx] if keypoint_conns is not None else None
+                    )
+                    continue
+                tile = tiles[
+                    _nearest_tiles(pose[detected].mean(axis=0)[None], tiles)[0]
+                ]
+                pose[detected] = _to_frame(pose[detected], tile)
+                if keypoint_conns is not None:
+                    conns = np.array(keypoint_conns[idx], dtype=float)
+                    mapped_conns.append(
+                        _to_frame(conns.reshape(-1, 2), tile).reshape(conns.shape)
+                    )
+            outputs["keypoints"] = keypoints
+            if keypoint_conns is not None:
+                outputs["keypoint_conns"] = mapped_conns
+        return outputs
+
+
+def _map_bboxes(bboxes: Any, tiles: np.ndarray) -> np.ndarray:
+    bboxes = np.array(bboxes, dtype=float).reshape(-1, 4)
+    if not len(bboxes):  # pylint: disable=len-as-condition
+        return bboxes
+    centers = (bboxes[:, :2] + bboxes[:, 2:]) / 2
+    mapped = np.empty_like(bboxes)
+    for idx, tile_idx in enumerate(_nearest_tiles(centers, tiles)):
+        tile = tiles[tile_idx]
+        bbox = np.clip(bboxes[idx], np.tile(tile[:2], 2), np.tile(tile[2:4], 2))
+        mapped[idx] = _to_frame(bbox.reshape(2, 2), tile).reshape(4)
+    return mapped
+
+
+def _nearest_tiles(points: np.ndarray, tiles: np.ndarray) -> List[int]:
+    """Index of the tile containing each point, or of the nearest one."""
+    lower = tiles[None, :, :2]
+    upper = tiles[None, :, 2:4]
+    points = points[:, None]
+    distance = np.maximum(np.maximum(lower - points, points - upper), 0)
+    return list(np.argmin((distance ** 2).sum(axis=2), axis=1))
+
+
+def _to_frame(points: np.ndarray, tile: np.ndarray) -> np.ndarray:
+    """Maps (x, y) points from normalised coordinates of the packed image to
+    those of the full frame.
+    """
+    scale = (tile[6:8] - tile[4:6]) / (tile[2:4] - tile[:2])
+    return tile[4:6] + (points - tile[:2]) * scale
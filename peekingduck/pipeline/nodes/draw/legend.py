@@ -31,8 +31,8 @@ class Node(AbstractNode):
     draws fps, object counts and object count in zones.
 
     Inputs:
-        ``all`` (:obj:`Any`): Receives inputs from all preceding outputs to use as
-        dynamic input for legend creation.
+        ``all`` (:obj:`Any`): Receives a read-only view of all preceding
+        outputs to use as dynamic input for legend creation.
 
     Outputs:
         |none|
@@ -71,12 +71,12 @@ class Node(AbstractNode):
             if self.include[0] == "all_legend_items":
                 self.include = self.all_legend_items
             self._include(inputs)
-        if len(self.legend_items) != 0:
-            Legend().draw(inputs, self.legend_items, self.position)
-        else:
+        if len(self.legend_items) == 0:
             return {}
-        # cv2 weighted does not update the referenced image. Need to return and
-        # replace.
+        # inputs is a read-only view of the data pool, so draw on a copy of
+        # the image and replace it
+        inputs = {**inputs, "img": inputs["img"].copy()}
+        Legend().draw(inputs, self.legend_items, self.position)
         return {"img": inputs["img"]}
 
     def _include(self, inputs: Dict[str, Any]) -> None:
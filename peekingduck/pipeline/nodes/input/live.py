@@ -16,10 +16,11 @@
 Reads a videofeed from a stream, e.g., webcam.
 """
 
+import time
 from typing import Any, Dict, Union
 
 from peekingduck.pipeline.nodes.node import AbstractNode
-from peekingduck.pipeline.nodes.input.utils.preprocess import resize_image
+from peekingduck.pipeline.nodes.input.utils.preprocess import FramePreprocessor
 from peekingduck.pipeline.nodes.input.utils.read import VideoNoThread, VideoThread
 
 
@@ -38,6 +39,8 @@ class Node(AbstractNode):
 
         |saved_video_fps|
 
+        |frame_age|
+
     Configs:
         fps_saved_output_video (:obj:`int`): **default = 10**. |br|
             FPS of the MP4 file after livestream is processed and exported. FPS
@@ -66,18 +69,51 @@ class Node(AbstractNode):
             onscreen video display could appear laggy due to the buffering. |br|
             For more info, please refer to `input.live configuration
             <https://github.com/aimakerspace/PeekingDuck/blob/dev/peekingduck/configs/input/live.yml>`_.
+        buffer_size (:obj:`int`): **default = 32**. |br|
+            Maximum number of frames held in the buffer when buffer_frames is
+            True, or 0 for no limit.
+        overflow_policy (:obj:`str`):
+            **{"block", "drop_oldest", "drop_newest"}, default = "block"**. |br|
+            Defines what happens when the buffer is full. "block" pauses
+            reading until a frame is consumed, "drop_oldest" discards the
+            oldest buffered frame and "drop_newest" discards the frame which
+            was just read.
+        crop_roi (:obj:`List[float]`): **default = []**. |br|
+            Region of interest the frames are cropped to, as normalised
+            ``[x1, y1, x2, y2]`` coordinates, or an empty list to keep the
+            whole frame. Cropping is done before resizing.
+        bgr_to_rgb (:obj:`bool`): **default = False**. |br|
+            Flag to output frames in RGB instead of BGR, for custom nodes
+            which expect RGB frames. The models and draw nodes of PeekingDuck
+            expect BGR frames. |br|
+            Cropping, resizing and colour conversion are done in the reading
+            thread when ``threading`` is True.
     """
 
     def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
         super().__init__(config, node_path=__name__, **kwargs)
         self._allowed_extensions = ["mp4", "avi", "mov", "mkv"]
         self.videocap: Union[VideoNoThread, VideoThread]
+        preprocess = FramePreprocessor(
+            getattr(self, "crop_roi", None),
+            (self.resize["width"], self.resize["height"])
+            if self.resize["do_resizing"]
+            else None,
+            getattr(self, "bgr_to_rgb", False),
+        )
         if self.threading:
             self.videocap = VideoThread(
-                self.input_source, self.mirror_image, self.buffer_frames
+                self.input_source,
+                self.mirror_image,
+                self.buffer_frames,
+                self.buffer_size,
+                self.overflow_policy,
+                preprocess,
             )
         else:
-            self.videocap = VideoNoThread(self.input_source, self.mirror_image)
+            self.videocap = VideoNoThread(
+                self.input_source, self.mirror_image, preprocess
+            )
 
         width, height = self.videocap.resolution
         self.logger.info(f"Device resolution used: {width} by {height}")
@@ -97,14 +133,12 @@ class Node(AbstractNode):
         success, img = self.videocap.read_frame()
 
         if success:
-            if self.resize["do_resizing"]:
-                img = resize_image(img, self.resize["width"], self.resize["height"])
-
             outputs = {
                 "img": img,
                 "pipeline_end": False,
                 "filename": self.filename,
                 "saved_video_fps": self.fps_saved_output_video,
+                "frame_age": time.monotonic() - self.videocap.frame_timestamp,
             }
             self.frame_counter += 1
             if self.frame_counter % self.frames_log_freq == 0:
@@ -116,6 +150,7 @@ class Node(AbstractNode):
                 "pipeline_end": True,
                 "filename": self.filename,
                 "saved_video_fps": self.fps_saved_output_video,
+                "frame_age": 0.0,
             }
             self.logger.warning("No video frames available for processing.")
 
@@ -19,13 +19,17 @@ Reads video/images from a directory.
 from pathlib import Path
 from typing import Any, Dict
 
-from peekingduck.pipeline.nodes.input.utils.preprocess import resize_image
+from peekingduck.pipeline.nodes.input.utils.preprocess import FramePreprocessor
 from peekingduck.pipeline.nodes.input.utils.read import (
+    ImagePrefetcher,
+    PrefetchedImage,
+    VideoSegmentReader,
     VideoThread,
     VideoNoThread,
 )
 from peekingduck.pipeline.nodes.node import AbstractNode
 
+VIDEO_EXTENSIONS = ["mp4", "avi", "mov", "mkv"]
 
 # pylint: disable=R0902
 class Node(AbstractNode):
@@ -61,6 +65,56 @@ class Node(AbstractNode):
             very likely read ahead of the main thread. |br|
             For more info, please refer to `input.recorded configuration
             <https://github.com/aimakerspace/PeekingDuck/blob/dev/peekingduck/configs/input/recorded.yml>`_.
+        buffer_size (:obj:`int`): **default = 32**. |br|
+            Maximum number of frames held in the buffer when buffer_frames is
+            True, or 0 for no limit.
+        overflow_policy (:obj:`str`):
+            **{"block", "drop_oldest", "drop_newest"}, default = "block"**. |br|
+            Defines what happens when the buffer is full. "block" pauses
+            reading until a frame is consumed, "drop_oldest" discards the
+            oldest buffered frame and "drop_newest" discards the frame which
+            was just read.
+        decode_workers (:obj:`int`): **default = 0**. |br|
+            Number of worker processes decoding videos in parallel, or 0 to
+            decode on a single thread. Videos are split into segments of
+            ``segment_frames`` frames which are decoded by the workers and
+            reassembled in order. Takes precedence over ``threading`` for
+            videos, and requires Python 3.8 or above.
+        segment_frames (:obj:`int`): **default = 500**. |br|
+            Number of frames of each segment decoded by a worker. Every
+            segment starts with decoding from the preceding keyframe, so
+            segments should be much longer than the keyframe interval.
+        decode_buffer_frames (:obj:`int`): **default = 8**. |br|
+            Number of decoded frames each worker can hold ahead of the
+            pipeline. Frames decoded out of order wait in these slots, so the
+            reorder buffer holds at most ``decode_workers *
+            decode_buffer_frames`` frames.
+        prefetch_images (:obj:`int`): **default = 0**. |br|
+            Number of images of ``input_dir`` read and decoded ahead of the
+            pipeline, or 0 to read each image when it is needed. Speeds up
+            folders of many images, at the cost of holding up to that many
+            decoded images in memory.
+        image_decode_threads (:obj:`int`): **default = 4**. |br|
+            Number of threads decoding images when ``prefetch_images`` is
+            above 0.
+        num_shards (:obj:`int`): **default = 1**. |br|
+            Number of shards the media files of ``input_dir`` are split into,
+            to be processed by several copies of the pipeline, e.g., with
+            ``parallel_files`` in the runner config.
+        shard_index (:obj:`int`): **default = 0**. |br|
+            The shard processed by this node. Every ``num_shards``-th file,
+            starting from the ``shard_index``-th, is processed.
+        crop_roi (:obj:`List[float]`): **default = []**. |br|
+            Region of interest the frames are cropped to, as normalised
+            ``[x1, y1, x2, y2]`` coordinates, or an empty list to keep the
+            whole frame. Cropping is done before resizing.
+        bgr_to_rgb (:obj:`bool`): **default = False**. |br|
+            Flag to output frames in RGB instead of BGR, for custom nodes
+            which expect RGB frames. The models and draw nodes of PeekingDuck
+            expect BGR frames. |br|
+            Cropping, resizing and colour conversion are done in the threads or
+            processes decoding the frames when ``threading``,
+            ``decode_workers`` or ``prefetch_images`` is set.
     """
 
     def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
@@ -77,7 +131,22 @@ class Node(AbstractNode):
         self.file_end = False
         self.frame_counter = -1
         self.tens_counter = 10
+        self._prefetcher = None
+        self._preprocess = FramePreprocessor(
+            getattr(self, "crop_roi", None),
+            (self.resize["width"], self.resize["height"])
+            if self.resize["do_resizing"]
+            else None,
+            getattr(self, "bgr_to_rgb", False),
+        )
         self._get_files(Path(self.input_dir))
+        if not self._filepaths:
+            # more shards than files
+            self.logger.warning(
+                f"No files for shard {self.shard_index} of {self.num_shards}"
+            )
+            self.videocap = None
+            return
         self._get_next_input()
 
         width, height = self.videocap.resolution
@@ -95,6 +164,13 @@ class Node(AbstractNode):
         input: ["none"],
         output: ["img", "pipeline_end"]
         """
+        if self.videocap is None:
+            return {
+                "img": None,
+                "pipeline_end": True,
+                "filename": "",
+                "saved_video_fps": 0,
+            }
         outputs = self._run_single_file()
 
         approx_processed = round((self.frame_counter / self.videocap.frame_count) * 100)
@@ -108,6 +184,7 @@ class Node(AbstractNode):
             self.logger.info(f"Completed processing file: {self._file_name}")
             pct_complete = round(100 * self.frame_counter / self.videocap.frame_count)
             self.logger.debug(f"#frames={self.frame_counter}, done={pct_complete}%")
+            self.videocap.shutdown()
             self._get_next_input()
             outputs = self._run_single_file()
             self.frame_counter = 0
@@ -127,8 +204,6 @@ class Node(AbstractNode):
         }
         if success:
             self.file_end = False
-            if self.resize["do_resizing"]:
-                img = resize_image(img, self.resize["width"], self.resize["height"])
             outputs = {
                 "img": img,
                 "pipeline_end": False,
@@ -150,19 +225,65 @@ class Node(AbstractNode):
         if not self._filepaths:
             raise FileNotFoundError("No Media files available")
 
+        num_shards = getattr(self, "num_shards", 1)
+        if num_shards > 1:
+            if not 0 <= self.shard_index < num_shards:
+                raise ValueError("shard_index must be between 0 and num_shards - 1")
+            # only media files are shared out, so that other files in the
+            # directory do not unbalance the shards
+            self._filepaths = [
+                filepath
+                for filepath in self._filepaths
+                if self._is_valid_file_type(filepath)
+            ][self.shard_index :: num_shards]
+
+        if getattr(self, "prefetch_images", 0) > 0:
+            self._prefetcher = ImagePrefetcher(  # type: ignore
+                [
+                    filepath
+                    for filepath in self._filepaths
+                    if self._is_valid_file_type(filepath)
+                    and not self._is_video(filepath)
+                ],
+                self.mirror_image,
+                self.image_decode_threads,
+                self.prefetch_images,
+                self._preprocess,
+            )
+
     def _get_next_input(self) -> None:
         if self._filepaths:
             file_path = self._filepaths.pop(0)
             self._file_name = file_path.name
 
             if self._is_valid_file_type(file_path):
-                if getattr(self, "threading", False):
+                if self._prefetcher is not None and not self._is_video(file_path):
+                    self.videocap = PrefetchedImage(  # type: ignore
+                        self._prefetcher.next_image(file_path), file_path
+                    )
+                elif getattr(self, "decode_workers", 0) > 0 and self._is_video(
+                    file_path
+                ):
+                    self.videocap = VideoSegmentReader(  # type: ignore
+                        str(file_path),
+                        self.mirror_image,
+                        self.decode_workers,
+                        self.segment_frames,
+                        self.decode_buffer_frames,
+                        self._preprocess,
+                    )
+                elif getattr(self, "threading", False):
                     self.videocap = VideoThread(  # type: ignore
-                        str(file_path), self.mirror_image, self.buffer_frames
+                        str(file_path),
+                        self.mirror_image,
+                        self.buffer_frames,
+                        self.buffer_size,
+                        self.overflow_policy,
+                        self._preprocess,
                     )
                 else:
                     self.videocap = VideoNoThread(  # type: ignore
-                        str(file_path), self.mirror_image
+                        str(file_path), self.mirror_image, self._preprocess
                     )
                 self._fps = self.videocap.fps
             else:
@@ -172,6 +293,10 @@ class Node(AbstractNode):
                 )
                 self._get_next_input()
 
+    @staticmethod
+    def _is_video(filepath: Path) -> bool:
+        return filepath.suffix[1:].lower() in VIDEO_EXTENSIONS
+
     def _is_valid_file_type(self, filepath: Path) -> bool:
         if filepath.suffix[1:] in self._allowed_extensions:
             return True
@@ -179,4 +304,7 @@ class Node(AbstractNode):
 
     def release_resources(self) -> None:
         """Override base class method to free video resource"""
-        self.videocap.shutdown()
+        if self.videocap is not None:
+            self.videocap.shutdown()
+        if self._prefetcher is not None:
+            self._prefetcher.shutdown()
@@ -17,7 +17,7 @@ Preprocessing functions for input nodes
 """
 
 import logging
-from typing import Any, Tuple
+from typing import Any, List, Optional, Tuple
 
 import cv2
 import numpy as np
@@ -52,3 +52,87 @@ def resize_image(frame: np.ndarray, desired_width: int, desired_height: int) ->
         desired wight and height
     """
     return cv2.resize(frame, (desired_width, desired_height))
+
+
+class FramePreprocessor:
+    """Crops, resizes and converts the colour of frames, in that order, so
+    that input nodes can have this done by the thread or process reading the
+    frames instead of by the pipeline.
+
+    Args:
+        roi (:obj:`Optional[List[float]]`): Region of interest to crop to, as
+            normalised ``[x1, y1, x2, y2]`` coordinates, or None to keep the
+            whole frame.
+        size (:obj:`Optional[Tuple[int, int]]`): Width and height to resize
+            the frames to, or None to keep their size.
+        bgr_to_rgb (:obj:`bool`): Whether to convert the frames from BGR to
+            RGB.
+
+    Raises:
+        ValueError: ``roi`` is not a valid region of the frame.
+    """
+
+    def __init__(
+        self,
+        roi: Optional[List[float]] = None,
+        size: Optional[Tuple[int, int]] = None,
+        bgr_to_rgb: bool = False,
+    ) -> None:
+        if roi:
+            if (
+                len(roi) != 4
+                or not 0 <= roi[0] < roi[2] <= 1
+                or not 0 <= roi[1] < roi[3] <= 1
+            ):
+                raise ValueError(
+                    "roi must be [x1, y1, x2, y2] with 0 <= x1 < x2 <= 1 and "
+                    "0 <= y1 < y2 <= 1"
+                )
+        self.roi = list(roi) if roi else None
+        self.size = size
+        self.bgr_to_rgb = bgr_to_rgb
+
+    def __bool__(self) -> bool:
+        return self.roi is not None or self.size is not None or self.bgr_to_rgb
+
+    def __call__(self, frame: np.ndarray) -> np.ndarray:
+        if self.roi is not None:
+            frame = crop_frame(frame, self.roi)
+        if self.size is not None:
+            frame = resize_image(frame, *self.size)
+        if self.bgr_to_rgb:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        return frame
+
+    def output_resolution(self, width: int, height: int) -> Tuple[int, int]:
+        """Width and height of the preprocessed frames of a source of the
+        given resolution.
+        """
+        if self.size is not None:
+            return self.size
+        if self.roi is not None:
+            x_1, y_1, x_2, y_2 = _roi_pixels(self.roi, width, height)
+            return x_2 - x_1, y_2 - y_1
+        return width, height
+
+
+def crop_frame(frame: np.ndarray, roi: List[float]) -> np.ndarray:
+    """Crops a frame to a region of interest.
+
+    Args:
+        frame (np.array): image
+        roi (List[float]): normalised [x1, y1, x2, y2] coordinates of the
+            region
+
+    Returns:
+        image (np.array): a contiguous copy of the region
+    """
+    x_1, y_1, x_2, y_2 = _roi_pixels(roi, frame.shape[1], frame.shape[0])
+    return np.ascontiguousarray(frame[y_1:y_2, x_1:x_2])
+
+
+def _roi_pixels(roi: List[float], width: int, height: int) -> Tuple[int, ...]:
+    """Pixel coordinates of a normalised region, at least 1 pixel wide."""
+    x_1, x_2 = (int(round(coord * width)) for coord in (roi[0], roi[2]))
+    y_1, y_2 = (int(round(coord * height)) for coord in (roi[1], roi[3]))
+    return x_1, y_1, max(x_2, x_1 + 1), max(y_2, y_1 + 1)
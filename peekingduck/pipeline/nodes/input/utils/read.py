@@ -16,27 +16,69 @@
 Reader functions for input nodes
 """
 
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Tuple
-from threading import Thread, Event
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+from threading import Condition, Event, Thread
 import logging
+import math
+import multiprocessing as mp
 import platform
 import queue
+import time
 import cv2
+import numpy as np
 
-from peekingduck.pipeline.nodes.input.utils.preprocess import mirror
+from peekingduck.pipeline.frame_transport import ArrayRef, SharedFrameRing
+from peekingduck.pipeline.nodes.input.utils.preprocess import (
+    FramePreprocessor,
+    mirror,
+)
+from peekingduck.utils.tracer import span
+
+OVERFLOW_POLICIES = ["block", "drop_oldest", "drop_newest"]
+QUEUE_TIMEOUT = 0.1
+# seconds to wait for the workers of VideoSegmentReader to stop
+WORKER_JOIN_TIMEOUT = 5
+# FPS reported by cv2.VideoCapture for image files
+IMAGE_FPS = 25.0
 
 
 class VideoThread:
     """
     Videos will be threaded to improve FPS by reducing I/O blocking latency.
+
+    Every decoded frame is given a sequence number, and ``read_frame()`` waits
+    until a frame newer than the last one returned is available instead of
+    returning the same frame again. Without buffering, the reading thread
+    keeps grabbing frames from the stream so that the latest one is always
+    available, but only decodes a frame when it has been requested.
+
+    When frames are buffered, at most ``buffer_size`` frames are kept (0 for
+    no limit). ``overflow_policy`` decides what happens when the buffer is
+    full: "block" pauses the reading thread until a frame is consumed,
+    "drop_oldest" discards the oldest buffered frame and "drop_newest"
+    discards the frame which was just read.
+
+    ``frame_timestamp`` holds the time, from ``time.monotonic()``, at which
+    the last frame returned by ``read_frame()`` was grabbed from the stream.
+
+    Frames are cropped, resized and converted by ``preprocess`` in the reading
+    thread, if given.
     """
 
     # pylint: disable=too-many-instance-attributes
     # pylint: disable=logging-fstring-interpolation
 
-    def __init__(
-        self, input_source: str, mirror_image: bool, buffer_frames: bool
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        input_source: str,
+        mirror_image: bool,
+        buffer_frames: bool,
+        buffer_size: int = 0,
+        overflow_policy: str = "block",
+        preprocess: Optional[FramePreprocessor] = None,
     ) -> None:
         if platform.system().startswith("Windows"):
             if str(input_source).isdigit():
@@ -51,19 +93,39 @@ class VideoThread:
             )
         self.logger = logging.getLogger("VideoThread")
         self.mirror = mirror_image
+        self.preprocess = preprocess
         if not self.stream.isOpened():
             raise ValueError(f"Camera or video input not detected: {input_source}")
+        if buffer_size < 0:
+            raise ValueError("buffer_size must not be negative")
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow_policy must be one of {OVERFLOW_POLICIES}")
         # events to coordinate threading
         self.is_done = Event()
         self.is_thread_start = Event()
         # frame storage and buffering
         self.frame_counter = 0
         self.frame = None
-        self.prev_frame = None
+        self.frame_time = 0.0
+        self.frame_timestamp = 0.0
+        # sequence number of the latest decoded frame and of the last frame
+        # returned by read_frame(), guarded by frame_ready
+        self.frame_seq = 0
+        self.read_seq = 0
+        self.is_stale = False
+        self.frame_ready = Condition()
+        self._frame_requested = True
         self.buffer = buffer_frames
-        self.queue: queue.Queue = queue.Queue()
+        self.queue: queue.Queue = queue.Queue(maxsize=buffer_size)
+        self.overflow_policy = overflow_policy
+        # number of frames discarded, and number of times the reading thread
+        # had to wait, due to a full buffer
+        self.dropped_frames = 0
+        self.blocked_frames = 0
         # start threading
-        self.thread = Thread(target=self._reading_thread, args=(), daemon=True)
+        self.thread = Thread(
+            target=self._reading_thread, args=(), daemon=True, name="VideoThread"
+        )
         self.thread.start()
         self.is_thread_start.wait()
 
@@ -80,52 +142,133 @@ class VideoThread:
         Cannot be merged into __del__ as threading code needs to run here.
         """
         self.logger.debug("VideoThread.shutdown")
-        self.is_done.set()
+        self._set_done()
         self.thread.join()
+        if self.dropped_frames or self.blocked_frames:
+            self.logger.info(
+                f"Buffer full: #frames dropped={self.dropped_frames}, "
+                f"#frames blocked={self.blocked_frames}"
+            )
 
     def _reading_thread(self) -> None:
         """
-        A thread that continuously polls the camera for frames.
+        A thread that continuously grabs frames from the camera, decoding
+        them when they are buffered or requested by read_frame().
         """
-        while not self.is_done.is_set():
-            if self.stream.isOpened():
-                ret, frame = self.stream.read()
-                if not ret:
-                    self.logger.info(
-                        f"_reading_thread: ret={ret}, "
-                        f"#frames read={self.frame_counter}"
-                    )
-                    self.is_done.set()
-                else:
-                    if self.mirror:
-                        frame = mirror(frame)
-                    self.frame = frame
-                    self.is_thread_start.set()  # thread really started
-                    self.frame_counter += 1
-                    if self.buffer:
-                        self.queue.put(self.frame)
+        while not self.is_done.is_set() and self.stream.isOpened():
+            with span("grab", "input"):
+                ret = self.stream.grab()
+            grab_time = time.monotonic()
+            if ret and (self.buffer or self._frame_requested):
+                with span("retrieve", "input"):
+                    ret, frame = self.stream.retrieve()
+                if ret:
+                    self._publish_frame(frame, grab_time)
+            if not ret:
+                self.logger.info(
+                    f"_reading_thread: ret={ret}, #frames read={self.frame_counter}"
+                )
+                break
+        self._set_done()
+        # unblocks __init__ if the stream ends before the first frame
+        self.is_thread_start.set()
 
-    def read_frame(self) -> Tuple[bool, Any]:
+    def _publish_frame(self, frame: Any, grab_time: float) -> None:
         """
-        Reads the frame.
+        Makes a newly decoded frame available to read_frame().
         """
-        # pylint: disable=no-else-return
+        if self.mirror:
+            frame = mirror(frame)
+        if self.preprocess:
+            with span("preprocess", "input"):
+                frame = self.preprocess(frame)
+        self.frame_counter += 1
         if self.buffer:
-            if self.queue.empty():
-                if self.is_done.is_set():
-                    # end of input
-                    return False, None
-                else:
-                    # input slow, so duplicate frame
-                    return True, self.prev_frame
-            else:
-                self.prev_frame = self.queue.get()
-                return True, self.prev_frame
+            self._buffer_frame((frame, grab_time))
+        with self.frame_ready:
+            self.frame = frame
+            self.frame_time = grab_time
+            self.frame_seq += 1
+            self._frame_requested = False
+            self.frame_ready.notify_all()
+        self.is_thread_start.set()  # thread really started
+
+    def _set_done(self) -> None:
+        with self.frame_ready:
+            self.is_done.set()
+            self.frame_ready.notify_all()
+
+    def _buffer_frame(self, frame: Tuple[Any, float]) -> None:
+        """
+        Adds a frame and its grab time to the buffer, applying the overflow
+        policy if it is full.
+        """
+        if self.overflow_policy == "block":
+            if self.queue.full():
+                self.blocked_frames += 1
+            # wakes up periodically so that shutdown() is not blocked
+            while not self.is_done.is_set():
+                try:
+                    self.queue.put(frame, timeout=QUEUE_TIMEOUT)
+                    return
+                except queue.Full:
+                    continue
+        elif self.overflow_policy == "drop_newest":
+            try:
+                self.queue.put_nowait(frame)
+            except queue.Full:
+                self.dropped_frames += 1
         else:
-            if self.is_done.is_set():
+            while True:
+                try:
+                    self.queue.put_nowait(frame)
+                    return
+                except queue.Full:
+                    try:
+                        self.queue.get_nowait()
+                        self.dropped_frames += 1
+                    except queue.Empty:
+                        pass
+
+    def read_frame(self, wait: bool = True) -> Tuple[bool, Any]:
+        """
+        Reads the next frame, waiting for it to arrive if necessary.
+
+        Args:
+            wait (bool): If False, returns the most recent frame immediately
+                and sets ``is_stale`` if it has been returned before. Only
+                applies when frames are not buffered.
+        """
+        if self.buffer:
+            return self._read_buffered_frame()
+
+        with self.frame_ready:
+            if self.frame_seq == self.read_seq:
+                self._frame_requested = True
+                if wait:
+                    self.frame_ready.wait_for(
+                        lambda: self.frame_seq != self.read_seq or self.is_done.is_set()
+                    )
+            self.is_stale = self.frame_seq == self.read_seq
+            if self.is_done.is_set() and self.is_stale:
+                # end of input
                 return False, None
-            else:
-                return True, self.frame
+            self.read_seq = self.frame_seq
+            self.frame_timestamp = self.frame_time
+            return True, self.frame
+
+    def _read_buffered_frame(self) -> Tuple[bool, Any]:
+        while True:
+            try:
+                frame, self.frame_timestamp = self.queue.get(timeout=QUEUE_TIMEOUT)
+            except queue.Empty:
+                if self.is_done.is_set() and self.queue.empty():
+                    # end of input
+                    return False, None
+                continue
+            self.is_stale = False
+            self.read_seq += 1
+            return True, frame
 
     @property
     def fps(self) -> float:
@@ -165,7 +308,12 @@ class VideoNoThread:
     No threading to deal with recorded videos and images.
     """
 
-    def __init__(self, input_source: str, mirror_image: bool) -> None:
+    def __init__(
+        self,
+        input_source: str,
+        mirror_image: bool,
+        preprocess: Optional[FramePreprocessor] = None,
+    ) -> None:
         if platform.system().startswith("Windows"):
             if str(input_source).isdigit():
                 # to eliminate opencv's "[WARN] terminating async callback"
@@ -179,9 +327,11 @@ class VideoNoThread:
             )
         self.logger = logging.getLogger("VideoNoThread")
         self.mirror = mirror_image
+        self.preprocess = preprocess
         if not self.stream.isOpened():
             raise ValueError(f"Video or image path incorrect: {input_source}")
         self._frame_counter = 0
+        self.frame_timestamp = 0.0
 
     def __del__(self) -> None:
         # dotw: self.logger.debug below crashes on Nvidia Jetson Xavier Ubuntu 18.04 python 3.6
@@ -193,13 +343,17 @@ class VideoNoThread:
         """
         Reads the frame.
         """
-        ret, frame = self.stream.read()
+        with span("read_frame", "input"):
+            ret, frame = self.stream.read()
+        self.frame_timestamp = time.monotonic()
         if not ret:
             self.logger.info(
                 f"read_frame: ret={ret}, #frames read={self._frame_counter}"
             )
         else:
             self._frame_counter += 1
+            if self.preprocess:
+                frame = self.preprocess(frame)
         return ret, frame
 
     # pylint: disable=R0201
@@ -242,3 +396,481 @@ class VideoNoThread:
         width = self.stream.get(cv2.CAP_PROP_FRAME_WIDTH)
         height = self.stream.get(cv2.CAP_PROP_FRAME_HEIGHT)
         return int(width), int(height)
+
+
+class VideoSegmentReader:
+    """
+    Decodes a video file in parallel, for batch processing of recorded
+    footage where a single decoder cannot keep up with batched inference.
+
+    The file is split into segments of ``segment_frames`` frames which are
+    claimed in order by ``num_workers`` worker processes. Each worker seeks
+    to the start of its segment, checks with the timestamp of the first
+    decoded frame that the decoder landed on it, and decodes the segment into
+    its own ``buffer_frames`` slots of shared memory. Frames are returned in
+    order by ``read_frame()`` through a reorder buffer, which holds at most
+    ``num_workers * buffer_frames`` frames as a worker waits for its slots to
+    be freed. If the frame count of the file is inaccurate, the last segment
+    is decoded up to the actual end of the file.
+
+    ``frame_timestamp`` holds the time, from ``time.monotonic()``, at which
+    the last frame was returned by ``read_frame()``.
+
+    Frames are cropped, resized and converted by ``preprocess`` in the worker
+    processes, if given. The workers are started with the "forkserver" method
+    where available, or "spawn" otherwise, so ``preprocess`` has to be
+    picklable.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        input_source: str,
+        mirror_image: bool,
+        num_workers: int,
+        segment_frames: int,
+        buffer_frames: int,
+        preprocess: Optional[FramePreprocessor] = None,
+    ) -> None:
+        self.logger = logging.getLogger("VideoSegmentReader")
+        if num_workers < 1 or segment_frames < 1 or buffer_frames < 1:
+            raise ValueError(
+                "num_workers, segment_frames and buffer_frames must be positive"
+            )
+        self._fps, self._frame_count, self._resolution = _probe_video(input_source)
+        self.frame_timestamp = 0.0
+        self._frame_counter = 0
+
+        self.num_segments = max(1, math.ceil(self._frame_count / segment_frames))
+        num_workers = min(num_workers, self.num_segments)
+        width, height = self._resolution
+        if preprocess:
+            width, height = preprocess.output_resolution(width, height)
+        ring = SharedFrameRing(num_workers * buffer_frames, max(width * height * 3, 1))
+        self.ring: Optional[SharedFrameRing] = ring
+        # not forked, as the reader may be created while models and the threads
+        # of the pipeline are running, see ProcessStage
+        context = mp.get_context(
+            "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+        )
+        self.results = context.Queue()
+        self.stop = context.Event()
+        # kept for the workers, which attach to the queue once started
+        self.segments = self._queue_segments(context, segment_frames)
+        self.free_slots: List[Any] = []
+        self.workers: List[Any] = []
+        self._start_workers(
+            context,
+            (
+                str(input_source),
+                mirror_image,
+                preprocess,
+                (ring.name, ring.num_slots, ring.slot_size),
+                self.segments,
+            ),
+            num_workers,
+            buffer_frames,
+        )
+        # frames and the number of frames of segments which arrived out of
+        # order, keyed by (segment, position in segment) and segment
+        self.reorder_buffer: Dict[Tuple[int, int], Tuple[int, Any]] = {}
+        self.segment_lengths: Dict[int, int] = {}
+        self.segment = 0
+        self.position = 0
+        self.logger.info(
+            f"Decoding {self.num_segments} segments with {num_workers} workers"
+        )
+
+    def _queue_segments(self, context: Any, segment_frames: int) -> Any:
+        """Returns a queue of the start and length of every segment, in
+        order. The last segment is read up to the end of the file.
+        """
+        segments = context.Queue()
+        for idx in range(self.num_segments):
+            is_last = idx == self.num_segments - 1
+            segments.put(
+                (idx, idx * segment_frames, None if is_last else segment_frames)
+            )
+        return segments
+
+    def _start_workers(
+        self,
+        context: Any,
+        worker_args: Tuple[Any, ...],
+        num_workers: int,
+        buffer_frames: int,
+    ) -> None:
+        """Starts the decoding processes, each with its own ``buffer_frames``
+        slots of the shared memory ring. ``worker_args`` are the arguments of
+        :func:`_decode_segments` which all workers share.
+        """
+        for worker_id in range(num_workers):
+            free_slots = context.Queue()
+            for slot in range(buffer_frames):
+                free_slots.put(worker_id * buffer_frames + slot)
+            self.free_slots.append(free_slots)
+            worker = context.Process(
+                target=_decode_segments,
+                args=(
+                    *worker_args,
+                    free_slots,
+                    self.results,
+                    self.stop,
+                    worker_id,
+                ),
+                daemon=True,
+            )
+            worker.start()
+            self.workers.append(worker)
+
+    def __del__(self) -> None:
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        """
+        Stops the workers and frees the shared memory.
+        """
+        ring = getattr(self, "ring", None)
+        if ring is None:
+            return
+        self.stop.set()
+        for worker in self.workers:
+            worker.join(timeout=WORKER_JOIN_TIMEOUT)
+            if worker.is_alive():
+                worker.terminate()
+        ring.close()
+        self.ring = None
+
+    def read_frame(self) -> Tuple[bool, Any]:
+        """
+        Reads the next frame in order, waiting for it to be decoded if
+        necessary.
+        """
+        with span("read_frame", "input"):
+            frame = self._next_frame()
+        self.frame_timestamp = time.monotonic()
+        if frame is None:
+            self.logger.info(f"read_frame: #frames read={self._frame_counter}")
+            return False, None
+        self._frame_counter += 1
+        return True, frame
+
+    def _next_frame(self) -> Optional[np.ndarray]:
+        while self.segment < self.num_segments:
+            key = (self.segment, self.position)
+            if key in self.reorder_buffer:
+                worker_id, value = self.reorder_buffer.pop(key)
+                self.position += 1
+                if isinstance(value, ArrayRef):
+                    # copied out as the slot is reused by the worker
+                    frame = self.ring.view(value).copy()  # type: ignore
+                    self.free_slots[worker_id].put(value.slot)
+                    return frame
+                return value
+            if self.segment_lengths.get(self.segment) == self.position:
+                self.segment += 1
+                self.position = 0
+                continue
+            self._receive()
+        return None
+
+    def _receive(self) -> None:
+        """Moves the next message of the workers into the reorder buffer."""
+        while True:
+            try:
+                message = self.results.get(timeout=QUEUE_TIMEOUT)
+                break
+            except queue.Empty as error:
+                if not any(worker.is_alive() for worker in self.workers):
+                    raise RuntimeError(
+                        "Segment decoding workers stopped unexpectedly"
+                    ) from error
+        kind, segment, position, worker_id, value = message
+        if kind == "frame":
+            self.reorder_buffer[(segment, position)] = (worker_id, value)
+        elif kind == "end":
+            self.segment_lengths[segment] = position
+        else:
+            raise RuntimeError(f"Segment decoding failed: {value}")
+
+    @property
+    def fps(self) -> float:
+        """Get FPS of videofile
+
+        Returns:
+            int: number indicating FPS
+        """
+        return self._fps
+
+    @property
+    def frame_count(self) -> int:
+        """Get total number of frames of file
+
+        Returns:
+            int: number indicating frame count
+        """
+        return self._frame_count
+
+    @property
+    def resolution(self) -> Tuple[int, int]:
+        """Get resolution of the file.
+
+        Returns:
+            width(int): width of resolution
+            height(int): heigh of resolution
+        """
+        return self._resolution
+
+
+def _probe_video(input_source: str) -> Tuple[float, int, Tuple[int, int]]:
+    """Reads the FPS, frame count and resolution of a video file.
+
+    Raises:
+        ValueError: The file cannot be opened.
+    """
+    stream = cv2.VideoCapture(str(input_source))
+    if not stream.isOpened():
+        raise ValueError(f"Video or image path incorrect: {input_source}")
+    fps = stream.get(cv2.CAP_PROP_FPS)
+    frame_count = int(stream.get(cv2.CAP_PROP_FRAME_COUNT))
+    width = int(stream.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(stream.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    stream.release()
+    return fps, frame_count, (width, height)
+
+
+class ImagePrefetcher:
+    """
+    Decodes the images of ``file_paths`` ahead of time on a pool of
+    ``num_workers`` threads, for image folders which would otherwise be read
+    and decoded one file at a time.
+
+    Every file is read into memory in a single call and decoded with
+    ``cv2.imdecode``, both of which release the GIL. At most ``prefetch``
+    images are being decoded or waiting to be read at any time, and
+    ``next_image()`` returns them in the order of ``file_paths``. Images are
+    cropped, resized and converted by ``preprocess`` in the threads, if given.
+    """
+
+    def __init__(
+        self,
+        file_paths: List[Path],
+        mirror_image: bool,
+        num_workers: int,
+        prefetch: int,
+        preprocess: Optional[FramePreprocessor] = None,
+    ) -> None:
+        if num_workers < 1 or prefetch < 1:
+            raise ValueError("num_workers and prefetch must be positive")
+        self.logger = logging.getLogger("ImagePrefetcher")
+        self.mirror = mirror_image
+        self.preprocess = preprocess
+        self.pool = ThreadPoolExecutor(
+            max_workers=num_workers, thread_name_prefix="ImagePrefetcher"
+        )
+        self.pending: Deque[Tuple[Path, Future]] = deque()
+        self._file_paths = iter(file_paths)
+        for _ in range(prefetch):
+            self._submit_next()
+
+    def next_image(self, file_path: Path) -> Optional[np.ndarray]:
+        """
+        Returns the decoded image of ``file_path``, which has to be the next
+        file of ``file_paths``, or None if it could not be decoded.
+        """
+        if not self.pending or self.pending[0][0] != file_path:
+            raise ValueError(f"{file_path} is not the next prefetched image")
+        _, future = self.pending.popleft()
+        self._submit_next()
+        with span("read_frame", "input"):
+            return future.result()
+
+    def shutdown(self) -> None:
+        """
+        Discards the prefetched images and stops the threads.
+        """
+        for _, future in self.pending:
+            future.cancel()
+        self.pending.clear()
+        self.pool.shutdown(wait=True)
+
+    def _submit_next(self) -> None:
+        file_path = next(self._file_paths, None)
+        if file_path is not None:
+            self.pending.append(
+                (
+                    file_path,
+                    self.pool.submit(
+                        _decode_image, file_path, self.mirror, self.preprocess
+                    ),
+                )
+            )
+
+
+class PrefetchedImage:
+    """
+    An image decoded by :class:`ImagePrefetcher`, read like a video of a
+    single frame.
+    """
+
+    def __init__(self, image: Optional[np.ndarray], input_source: Path) -> None:
+        if image is None:
+            raise ValueError(f"Video or image path incorrect: {input_source}")
+        self.logger = logging.getLogger("PrefetchedImage")
+        self.image: Optional[np.ndarray] = image
+        self._resolution = image.shape[1], image.shape[0]
+        self.frame_timestamp = 0.0
+
+    def read_frame(self) -> Tuple[bool, Any]:
+        """
+        Returns the image on the first call, and no frame afterwards.
+        """
+        image, self.image = self.image, None
+        self.frame_timestamp = time.monotonic()
+        return image is not None, image
+
+    # pylint: disable=R0201
+    def shutdown(self) -> None:
+        """
+        Dummy method left here for consistency with VideoThread class.
+        """
+        self.logger.debug("PrefetchedImage.shutdown")
+
+    @property
+    def fps(self) -> float:
+        """FPS reported for images, as with VideoNoThread."""
+        return IMAGE_FPS
+
+    @property
+    def frame_count(self) -> int:
+        """An image has a single frame."""
+        return 1
+
+    @property
+    def resolution(self) -> Tuple[int, int]:
+        """Get resolution of the image.
+
+        Returns:
+            width(int): width of resolution
+            height(int): heigh of resolution
+        """
+        return self._resolution
+
+
+def _decode_segments(  # pylint: disable=too-many-arguments, too-many-locals
+    input_source: str,
+    mirror_image: bool,
+    preprocess: Optional[FramePreprocessor],
+    ring_info: Tuple[str, int, int],
+    segments: Any,
+    free_slots: Any,
+    results: Any,
+    stop: Any,
+    worker_id: int,
+) -> None:
+    """Entry point of the worker processes of :class:`VideoSegmentReader`."""
+    ring = SharedFrameRing(*ring_info[1:], name=ring_info[0])
+    stream = cv2.VideoCapture(input_source)
+    try:
+        while not stop.is_set():
+            try:
+                segment, start, num_frames = segments.get_nowait()
+            except queue.Empty:
+                break
+            position = 0
+            for frame in _read_segment(stream, start, num_frames):
+                if mirror_image:
+                    frame = mirror(frame)
+                if preprocess:
+                    frame = preprocess(frame)
+                slot = _get_slot(free_slots, stop)
+                if slot is None:
+                    return
+                value = ring.write(slot, frame) if ring.fits(frame) else frame
+                if not isinstance(value, ArrayRef):
+                    free_slots.put(slot)
+                results.put(("frame", segment, position, worker_id, value))
+                position += 1
+            results.put(("end", segment, position, worker_id, None))
+    except Exception as error:  # pylint: disable=broad-except
+        results.put(("error", -1, -1, worker_id, repr(error)))
+    finally:
+        stream.release()
+        ring.close()
+
+
+def _read_segment(
+    stream: cv2.VideoCapture, start: int, num_frames: Optional[int]
+) -> Iterator[np.ndarray]:
+    """Decodes ``num_frames`` frames from frame ``start``, or up to the end of
+    the file if ``num_frames`` is None.
+    """
+    ret, frame = _seek(stream, start)
+    position = 0
+    while ret:
+        yield frame
+        position += 1
+        if num_frames is not None and position >= num_frames:
+            return
+        ret, frame = stream.read()
+
+
+def _seek(stream: cv2.VideoCapture, start: int) -> Tuple[bool, Any]:
+    """Decodes frame ``start``.
+
+    Backends may report the requested position after seeking while the
+    decoder landed on the preceding keyframe, so the index of the decoded
+    frame is taken from its timestamp instead. Frames are skipped up to
+    ``start`` if the decoder landed before it, and the file is decoded from
+    the start if the timestamps do not match the frames.
+    """
+    if start == 0:
+        return stream.read()
+    fps = stream.get(cv2.CAP_PROP_FPS)
+    stream.set(cv2.CAP_PROP_POS_FRAMES, start)
+    index = _grab_index(stream, fps)
+    while index is not None and index < start:
+        index = _grab_index(stream, fps)
+    if index == start:
+        return stream.retrieve()
+    stream.set(cv2.CAP_PROP_POS_FRAMES, 0)
+    for _ in range(start):
+        if not stream.grab():
+            return False, None
+    return stream.read()
+
+
+def _grab_index(stream: cv2.VideoCapture, fps: float) -> Optional[int]:
+    """Grabs the next frame and returns its index from its timestamp, or None
+    if there is no frame or the FPS is unknown.
+    """
+    if fps <= 0 or not stream.grab():
+        return None
+    return int(round(stream.get(cv2.CAP_PROP_POS_MSEC) * fps / 1000))
+
+
+def _get_slot(free_slots: Any, stop: Any) -> Optional[int]:
+    """Waits for a free slot, or returns None if the reader is stopped."""
+    while not stop.is_set():
+        try:
+            return free_slots.get(timeout=QUEUE_TIMEOUT)
+        except queue.Empty:
+            continue
+    return None
+
+
+def _decode_image(
+    file_path: Path, mirror_image: bool, preprocess: Optional[FramePreprocessor]
+) -> Optional[np.ndarray]:
+    """Entry point of the threads of :class:`ImagePrefetcher`."""
+    with open(file_path, "rb") as infile:
+        data = np.frombuffer(infile.read(), dtype=np.uint8)
+    if data.size == 0:
+        return None
+    image = cv2.imdecode(data, cv2.IMREAD_COLOR)
+    if image is not None and mirror_image:
+        image = mirror(image)
+    if image is not None and preprocess:
+        image = preprocess(image)
+    return image
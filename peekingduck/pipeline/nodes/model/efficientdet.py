@@ -16,13 +16,14 @@
 Slower but more accurate object detection model.
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from peekingduck.pipeline.nodes.model.efficientdet_d04 import efficientdet_model
 from peekingduck.pipeline.nodes.node import AbstractNode
+from peekingduck.utils.warmup import WarmupMixin
 
 
-class Node(AbstractNode):
+class Node(WarmupMixin, AbstractNode):
     """Initialises an EfficientDet model to detect bounding boxes from an image.
 
     The EfficientDet node is capable of detecting objects from 80 categories.
@@ -66,6 +67,7 @@ class Node(AbstractNode):
     def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
         super().__init__(config, node_path=__name__, **kwargs)
         self.model = efficientdet_model.EfficientDetModel(self.config)
+        self._warm_up()
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Takes an image as input and returns bboxes of objects specified
@@ -76,3 +78,13 @@ class Node(AbstractNode):
         bboxes, labels, scores = self.model.predict(inputs["img"])
         outputs = {"bboxes": bboxes, "bbox_labels": labels, "bbox_scores": scores}
         return outputs
+
+    def run_batch(self, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Takes the images of several frames and runs them through the model
+        in a single batch.
+        """
+        results = self.model.predict_batch([frame["img"] for frame in inputs])
+        return [
+            {"bboxes": bboxes, "bbox_labels": labels, "bbox_scores": scores}
+            for bboxes, labels, scores in results
+        ]
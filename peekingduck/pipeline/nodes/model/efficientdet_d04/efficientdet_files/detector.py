@@ -32,6 +32,7 @@ from peekingduck.pipeline.nodes.model.efficientdet_d04.efficientdet_files.utils.
     preprocess_image,
 )
 from peekingduck.utils.graph_functions import load_graph
+from peekingduck.utils.tracer import span
 
 
 class Detector:
@@ -64,6 +65,9 @@ class Detector:
                 str(graph_path),
                 inputs=model_nodes["inputs"],
                 outputs=model_nodes["outputs"],
+                backend=self.config["backend"],
+                intra_op_threads=self.config["intra_op_threads"],
+                inter_op_threads=self.config["inter_op_threads"],
             )
             self.logger.info(
                 "Efficientdet graph model loaded with following configs: \n\t"
@@ -154,32 +158,67 @@ class Detector:
             scores (np.ndarray): array of scores
             labels (np.ndarray): array of labels
         """
-        img_shape = image.shape[:2]
+        return self.predict_bbox_from_images([image], detect_ids)[0]
 
+    def predict_bbox_from_images(
+        self, images: List[np.ndarray], detect_ids: List[int]
+    ) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Efficientdet bbox prediction function for a batch of images, which
+        are run through the network in a single call
+
+        Args:
+            images (list): list of images in numpy array, which can be of
+                different sizes
+            detect_ids (list): list of label ids to be detected
+
+        Returns:
+            results (list): boxes, labels and scores of each image, in the
+                same order as images
+        """
         image_size = self.config["size"][self.model_type]
-        image, scale = self.preprocess(image, image_size=image_size)
+        img_shapes = []
+        scales = []
+        batch = []
+        with span("preprocess", "model"):
+            for image in images:
+                img_shapes.append(image.shape[:2])
+                image, scale = self.preprocess(image, image_size=image_size)
+                scales.append(scale)
+                batch.append(image)
+
+        # run network, which includes nms
+        with span("graph_call", "model"):
+            boxes, scores, labels = self._run_network(np.stack(batch))
+
+        with span("postprocess", "model"):
+            return [
+                self.postprocess(
+                    (
+                        np.squeeze(image_boxes),
+                        np.squeeze(image_scores),
+                        np.squeeze(image_labels),
+                    ),
+                    scale,
+                    img_shape,
+                    detect_ids,
+                )
+                for image_boxes, image_scores, image_labels, scale, img_shape in zip(
+                    boxes, scores, labels, scales, img_shapes
+                )
+            ]
+
+    def _run_network(self, batch: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Runs the network on a batch of preprocessed images
+
+        Args:
+            batch (np.ndarray): stacked preprocessed images
 
-        # run network
+        Returns:
+            boxes, scores and labels (Tuple[np.ndarray, ...]): network outputs
+                of each image, along the first axis
+        """
         if self.GRAPH_MODE:
-            graph_input = tf.convert_to_tensor(
-                np.expand_dims(image, axis=0), dtype=tf.float32
-            )
+            graph_input = tf.convert_to_tensor(batch, dtype=tf.float32)
             boxes, scores, labels = self.effdet(x=graph_input)
-            network_output = (
-                np.squeeze(boxes.numpy()),
-                np.squeeze(scores.numpy()),
-                np.squeeze(labels.numpy()),
-            )
-        else:
-            (
-                boxes,
-                scores,
-                labels,
-            ) = self.effdet.predict_on_batch([np.expand_dims(image, axis=0)])
-            network_output = np.squeeze(boxes), np.squeeze(scores), np.squeeze(labels)
-
-        boxes, labels, scores = self.postprocess(
-            network_output, scale, img_shape, detect_ids
-        )
-
-        return boxes, labels, scores
+            return boxes.numpy(), scores.numpy(), labels.numpy()
+        return tuple(self.effdet.predict_on_batch([batch]))
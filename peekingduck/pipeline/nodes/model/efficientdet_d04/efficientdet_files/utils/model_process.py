@@ -19,7 +19,7 @@
 Processing helper functions for EfficientDet
 """
 
-from typing import List, Tuple
+from typing import Tuple
 import numpy as np
 import cv2
 
@@ -27,9 +27,7 @@ IMG_MEAN = [0.485, 0.456, 0.406]
 IMG_STD = [0.229, 0.224, 0.225]
 
 
-def preprocess_image(
-    image: np.ndarray, image_size: int
-) -> Tuple[List[List[float]], float]:
+def preprocess_image(image: np.ndarray, image_size: int) -> Tuple[np.ndarray, float]:
     """Preprocessing helper function for efficientdet
 
     Args:
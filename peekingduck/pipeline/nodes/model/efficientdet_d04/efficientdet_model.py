@@ -71,6 +71,21 @@ class EfficientDetModel:
         # return bboxes, object_bboxes, object_labels, object_scores
         return self.detector.predict_bbox_from_image(frame, self.detect_ids)
 
+    def predict_batch(
+        self, frames: List[np.ndarray]
+    ) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """predict the bboxes from a batch of frames with a single call to
+        the model
+
+        returns:
+        results(List[Tuple]): bboxes, labels and scores of each frame, in
+            the same order as frames
+        """
+        for frame in frames:
+            assert isinstance(frame, np.ndarray)
+
+        return self.detector.predict_bbox_from_images(frames, self.detect_ids)
+
     def get_detect_ids(self) -> List[int]:
         """getter function for ids to be detected"""
         return self.detect_ids
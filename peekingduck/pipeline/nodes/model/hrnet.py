@@ -17,13 +17,19 @@ Slower but more accurate Pose Estimation model. Requires an object detector.
 """
 
 
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
+
+import numpy as np
 
 from peekingduck.pipeline.nodes.model.hrnetv1 import hrnet_model
 from peekingduck.pipeline.nodes.node import AbstractNode
+from peekingduck.utils.warmup import WarmupMixin
+
+# a bbox in the middle of the dummy frames, so that warmup runs the model
+WARMUP_BBOXES = np.array([[0.25, 0.25, 0.75, 0.75]])
 
 
-class Node(AbstractNode):
+class Node(WarmupMixin, AbstractNode):
     """Initialises and use HRNet model to infer poses from detected bboxes.
     Note that HRNet must be used in conjunction with an object detector applied
     prior.
@@ -69,6 +75,7 @@ class Node(AbstractNode):
     def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
         super().__init__(config, node_path=__name__, **kwargs)
         self.model = hrnet_model.HRNetModel(self.config)
+        self._warm_up()
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Reads the bbox input and returns the poses and pose bbox of the
@@ -84,3 +91,8 @@ class Node(AbstractNode):
             "keypoint_conns": keypoint_conns,
         }
         return outputs
+
+    def _predict_warmup_frame(
+        self, frame: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self.model.predict(frame, WARMUP_BBOXES)
@@ -36,6 +36,7 @@ from peekingduck.pipeline.nodes.model.hrnetv1.hrnet_files.preprocessing import (
     project_bbox,
 )
 from peekingduck.utils.graph_functions import load_graph
+from peekingduck.utils.tracer import span
 
 
 class Detector:
@@ -73,6 +74,9 @@ class Detector:
             str(graph_path),
             inputs=model_nodes["inputs"],
             outputs=model_nodes["outputs"],
+            backend=self.config["backend"],
+            intra_op_threads=self.config["intra_op_threads"],
+            inter_op_threads=self.config["inter_op_threads"],
         )
         resolution_tuple = (self.resolution["height"], self.resolution["width"])
         self.logger.info(
@@ -82,14 +86,16 @@ class Detector:
         )
         return self._inference_function
 
+    @staticmethod
     def preprocess(
-        self, frame: np.ndarray, bboxes: np.ndarray
+        frame: np.ndarray, bboxes: np.ndarray, resolution: Dict[str, int]
     ) -> Tuple[np.ndarray, np.ndarray, Tuple[int, int]]:
         """Preprocessing function that crops bboxes while preserving aspect ratio
 
         Args:
             frame (np.ndarray): input image in numpy array
             bboxes (np.ndarray): array of detected bboxes
+            resolution (Dict[str, int]): height and width of the model input
 
         Returns:
             Tuple[np.ndarray, np.ndarray, Tuple[int, int]]: array of cropped bboxes, \
@@ -97,17 +103,16 @@ class Detector:
         """
         frame = frame / 255.0
         frame_size = (frame.shape[1], frame.shape[0])
-        cropped_size = (self.resolution["width"], self.resolution["height"])
+        cropped_size = (resolution["width"], resolution["height"])
 
         projected_bbox = project_bbox(bboxes, frame_size)
-        center_bbox = box2cs(
-            projected_bbox, self.resolution["width"] / self.resolution["height"]
-        )
+        center_bbox = box2cs(projected_bbox, resolution["width"] / resolution["height"])
         cropped_imgs, affine_matrices = crop_and_resize(
             frame, center_bbox, cropped_size
         )
 
-        return np.array(cropped_imgs), affine_matrices, frame_size
+        # the graph takes float32 inputs
+        return np.array(cropped_imgs, dtype=np.float32), affine_matrices, frame_size
 
     def postprocess(  # pylint: disable=too-many-locals
         self,
@@ -167,12 +172,17 @@ class Detector:
             tuple containing list of bboxes and pose related info i.e coordinates,
             scores, connections
         """
-        cropped_frames, affine_matrices, frame_size = self.preprocess(frame, bboxes)
-        heatmaps = self.hrnet(cropped_frames, training=False)
+        with span("preprocess", "model"):
+            cropped_frames, affine_matrices, frame_size = self.preprocess(
+                frame, bboxes, self.resolution
+            )
+        with span("graph_call", "model", num_bboxes=len(bboxes)):
+            heatmaps = self.hrnet(cropped_frames, training=False).numpy()
 
         cropped_frames_scale = [cropped_frames.shape[2], cropped_frames.shape[1]]
-        poses, kp_scores, kp_conns = self.postprocess(
-            heatmaps.numpy(), affine_matrices, cropped_frames_scale, frame_size
-        )
+        with span("postprocess", "model"):
+            poses, kp_scores, kp_conns = self.postprocess(
+                heatmaps, affine_matrices, cropped_frames_scale, frame_size
+            )
 
         return poses, kp_scores, kp_conns
@@ -20,9 +20,10 @@ from typing import Any, Dict
 
 from peekingduck.pipeline.nodes.model.mtcnnv1 import mtcnn_model
 from peekingduck.pipeline.nodes.node import AbstractNode
+from peekingduck.utils.warmup import WarmupMixin
 
 
-class Node(AbstractNode):
+class Node(WarmupMixin, AbstractNode):
     """Initialises and use the MTCNN model to infer bboxes from image frame.
 
     The MTCNN node is a single-class model capable of detecting human faces. To
@@ -71,6 +72,7 @@ class Node(AbstractNode):
     def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
         super().__init__(config, node_path=__name__, **kwargs)
         self.model = mtcnn_model.MtcnnModel(self.config)
+        self._warm_up()
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Reads the image input and returns the bboxes, scores and labels of
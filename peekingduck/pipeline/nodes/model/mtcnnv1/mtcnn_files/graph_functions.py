@@ -21,6 +21,8 @@ from typing import Tuple, Callable
 
 import tensorflow as tf
 
+from peekingduck.utils.model_registry import MODEL_REGISTRY, model_key
+
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
 
@@ -75,8 +77,15 @@ def load_graph(filename: str) -> tf.function:
 
     Return:
         wrapped_import (tensorflow.python.eager.wrap_function.WrappedFunction):
-        A wrapped_import function to perform your inference with
+        A wrapped_import function to perform your inference with, shared with
+        other nodes which load the same file through the model registry
     """
+    return MODEL_REGISTRY.acquire(
+        model_key("mtcnn_graph", filename), lambda: _load_graph(filename)
+    )
+
+
+def _load_graph(filename: str) -> tf.function:
     with tf.io.gfile.GFile(filename, "rb") as graph_file:
         graph_def = tf.compat.v1.GraphDef()
         graph_def.ParseFromString(graph_file.read())
@@ -16,13 +16,14 @@
 Fast Pose Estimation model.
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from peekingduck.pipeline.nodes.model.posenetv1 import posenet_model
 from peekingduck.pipeline.nodes.node import AbstractNode
+from peekingduck.utils.warmup import WarmupMixin
 
 
-class Node(AbstractNode):
+class Node(WarmupMixin, AbstractNode):
     """Initialises a PoseNet model to detect human poses from an image.
 
     The PoseNet node is capable of detecting multiple human figures
@@ -70,6 +71,7 @@ class Node(AbstractNode):
     def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
         super().__init__(config, node_path=__name__, **kwargs)
         self.model = posenet_model.PoseNetModel(self.config)
+        self._warm_up()
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """function that reads the image input and returns the bboxes
@@ -87,3 +89,19 @@ class Node(AbstractNode):
             "bbox_labels": bbox_labels,
         }
         return outputs
+
+    def run_batch(self, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """function that reads the images of several frames and runs them
+        through the model in a single batch
+        """
+        results = self.model.predict_batch([frame["img"] for frame in inputs])
+        return [
+            {
+                "bboxes": bboxes,
+                "keypoints": keypoints,
+                "keypoint_scores": keypoint_scores,
+                "keypoint_conns": keypoint_conns,
+                "bbox_labels": ["Person"] * len(bboxes),
+            }
+            for bboxes, keypoints, keypoint_scores, keypoint_conns in results
+        ]
@@ -49,9 +49,8 @@ def _sigmoid(array: np.ndarray) -> np.ndarray:
     return 1 / (1 + np.exp(-array))
 
 
-def detect_keypoints(
-    tf_model: tf.keras.Model,
-    image: tf.Tensor,
+def decode_keypoints(
+    model_output: List[tf.Tensor],
     output_stride: int,
     dst_scores: np.ndarray,
     dst_keypoints: np.ndarray,
@@ -59,10 +58,10 @@ def detect_keypoints(
     score_threshold: float,
 ) -> int:
     # pylint: disable=too-many-arguments
-    """Evaluate image by model function to get detected keypoints
+    """Decode the model output of a single image to get detected keypoints
     Args:
-        tf_model: tensorflow model
-        image (tf.Tensor): image for inference
+        model_output (List[tf.Tensor]): heatmap, offsets and displacements
+            tensors with a batch size of 1
         output_stride (int): output stride to convert output indices to image coordinates
         dst_scores (np.array): Nx17 buffer to store keypoint scores where N is
             the max persons to be detected
@@ -73,15 +72,15 @@ def detect_keypoints(
     Returns:
         pose_count (int): number of poses detected
     """
-    model_output = tf_model(image)
+    scores, offsets, displacements_fwd, displacements_bwd = model_output
 
     # For resnet's implementation, we need to apply a sigmoid function on
     # the heatmap, which is the first tensor in the output
     if model_type == "resnet":
-        model_output[0] = _sigmoid(model_output[0])
+        scores = _sigmoid(scores)
 
     pose_count = decode_multiple_poses(
-        model_output,
+        (scores, offsets, displacements_fwd, displacements_bwd),
         dst_scores,
         dst_keypoints,
         output_stride=output_stride,
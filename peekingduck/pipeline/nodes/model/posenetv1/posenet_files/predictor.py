@@ -30,13 +30,14 @@ from peekingduck.pipeline.nodes.model.posenetv1.posenet_files.constants import (
     SKELETON,
 )
 from peekingduck.pipeline.nodes.model.posenetv1.posenet_files.detector import (
-    detect_keypoints,
+    decode_keypoints,
     get_keypoints_relative_coords,
 )
 from peekingduck.pipeline.nodes.model.posenetv1.posenet_files.preprocessing import (
     rescale_image,
 )
 from peekingduck.utils.graph_functions import load_graph
+from peekingduck.utils.tracer import span
 
 OUTPUT_STRIDE = 16
 
@@ -83,6 +84,9 @@ class Predictor:  # pylint: disable=too-many-instance-attributes
                 str(model_path),
                 inputs=model_nodes["inputs"],
                 outputs=model_nodes["outputs"],
+                backend=self.config["backend"],
+                intra_op_threads=self.config["intra_op_threads"],
+                inter_op_threads=self.config["inter_op_threads"],
             )
         raise ValueError(
             "PoseNet graph file does not exist. Please check that "
@@ -106,7 +110,6 @@ class Predictor:  # pylint: disable=too-many-instance-attributes
     def predict(
         self, frame: np.ndarray
     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
-        # pylint: disable=too-many-locals
         """PoseNet prediction function
 
         Args:
@@ -118,12 +121,37 @@ class Predictor:  # pylint: disable=too-many-instance-attributes
             keypoints_scores (np.ndarray): array of keypoint scores
             keypoints_conns (np.ndarray): array of keypoint connections
         """
-        (
-            full_keypoint_rel_coords,
-            full_keypoint_scores,
-            full_masks,
-        ) = self._predict_all_poses(self.posenet_model, frame, self.model_type)
+        return self.predict_batch([frame])[0]
 
+    def predict_batch(
+        self, frames: List[np.ndarray]
+    ) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """PoseNet prediction function for a batch of frames, which are run
+        through the model in a single call
+
+        Args:
+            frames (List[np.array]): images in numpy array
+
+        Returns:
+            results (List[Tuple]): bboxes, keypoints, keypoint scores and
+                keypoint connections of each frame, in the same order as frames
+        """
+        return [
+            self._get_pose_outputs(*poses)
+            for poses in self._predict_all_poses_batch(
+                self.posenet_model, frames, self.model_type
+            )
+        ]
+
+    def _get_pose_outputs(
+        self,
+        full_keypoint_rel_coords: np.ndarray,
+        full_keypoint_scores: np.ndarray,
+        full_masks: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Convert the detected poses of a single frame into bboxes, keypoints,
+        keypoint scores and keypoint connections
+        """
         bboxes = []
         keypoints = []
         keypoint_scores = []
@@ -214,16 +242,73 @@ class Predictor:  # pylint: disable=too-many-instance-attributes
                 detected poses
             full_masks (np.array): keypoints validation masks of detected poses
         """
-        image, output_scale, image_size = self._create_image_from_frame(
-            OUTPUT_STRIDE, frame, self.resolution, model_type
-        )
+        return self._predict_all_poses_batch(posenet_model, [frame], model_type)[0]
 
+    def _predict_all_poses_batch(
+        self, posenet_model: tf.keras.Model, frames: List[np.ndarray], model_type: str
+    ) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Predict relative coordinates, confident scores and validation masks
+        for all detected poses in each frame. All frames are rescaled to the
+        same input resolution, so they are stacked and run through the model
+        in a single call.
+        """
+        images = []
+        output_scales = []
+        image_sizes = []
+        with span("preprocess", "model"):
+            for frame in frames:
+                image, output_scale, image_size = self.create_image_from_frame(
+                    OUTPUT_STRIDE, frame, self.resolution, model_type
+                )
+                images.append(image)
+                output_scales.append(output_scale)
+                image_sizes.append(image_size)
+
+        with span("graph_call", "model"):
+            model_output = [
+                output.numpy() for output in posenet_model(tf.concat(images, axis=0))
+            ]
+
+        with span("postprocess", "model"):
+            return self._decode_all_poses(
+                model_output, output_scales, image_sizes, model_type
+            )
+
+    def _decode_all_poses(
+        self,
+        model_output: List[np.ndarray],
+        output_scales: List[np.ndarray],
+        image_sizes: List[List[int]],
+        model_type: str,
+    ) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Decodes the poses of each frame from the batched model output."""
+        return [
+            self._decode_poses(
+                [output[idx : idx + 1] for output in model_output],
+                output_scale,
+                image_size,
+                model_type,
+            )
+            for idx, (output_scale, image_size) in enumerate(
+                zip(output_scales, image_sizes)
+            )
+        ]
+
+    def _decode_poses(
+        self,
+        frame_output: List[np.ndarray],
+        output_scale: np.ndarray,
+        image_size: List[int],
+        model_type: str,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Decodes the poses of a single frame from its slice of the model
+        output.
+        """
         dst_scores = np.zeros((self.max_pose_detection, KEYPOINTS_NUM))
         dst_keypoints = np.zeros((self.max_pose_detection, KEYPOINTS_NUM, 2))
 
-        pose_count = detect_keypoints(
-            posenet_model,
-            image,
+        pose_count = decode_keypoints(
+            frame_output,
             OUTPUT_STRIDE,
             dst_scores,
             dst_keypoints,
@@ -242,7 +327,7 @@ class Predictor:  # pylint: disable=too-many-instance-attributes
         return full_keypoint_rel_coords, full_keypoint_scores, full_masks
 
     @staticmethod
-    def _create_image_from_frame(
+    def create_image_from_frame(
         output_stride: int,
         frame: np.ndarray,
         input_res: Tuple[int, int],
@@ -15,7 +15,7 @@
 """PoseNet model with model types: mobilenet50, mobilenet75, mobilenet100 and resnet"""
 
 import logging
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Tuple
 import numpy as np
 
 from peekingduck.weights_utils import checker, downloader, finder
@@ -65,3 +65,22 @@ class PoseNetModel:  # pylint: disable=too-few-public-methods
         assert isinstance(frame, np.ndarray)
 
         return self.predictor.predict(frame)
+
+    def predict_batch(
+        self, frames: List[np.ndarray]
+    ) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """Predict poses from a batch of input frames with a single call to
+        the model
+
+        Args:
+            frames (List[np.array]): images in numpy array
+
+        Returns:
+            results (List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]):
+            bboxes, keypoints, keypoint_scores and keypoint_conns of each frame,
+            in the same order as frames
+        """
+        for frame in frames:
+            assert isinstance(frame, np.ndarray)
+
+        return self.predictor.predict_batch(frames)
@@ -16,14 +16,15 @@
 Fast Object Detection model
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from peekingduck.pipeline.nodes.node import AbstractNode
 
 from peekingduck.pipeline.nodes.model.yolov4 import yolo_model
+from peekingduck.utils.warmup import WarmupMixin
 
 
-class Node(AbstractNode):
+class Node(WarmupMixin, AbstractNode):
     """Initialises and use YOLO model to infer bboxes from image frame.
 
     The yolo node is capable of detecting objects from 80 categories. It uses
@@ -73,6 +74,7 @@ class Node(AbstractNode):
     def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
         super().__init__(config, node_path=__name__, **kwargs)
         self.model = yolo_model.YoloModel(self.config)
+        self._warm_up()
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Reads the image input and returns the bboxes sof the specified
@@ -90,3 +92,19 @@ class Node(AbstractNode):
         bboxes, labels, scores = self.model.predict(inputs["img"])
         outputs = {"bboxes": bboxes, "bbox_labels": labels, "bbox_scores": scores}
         return outputs
+
+    def run_batch(self, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Runs the YOLO model on the images of several frames at once.
+
+        Args:
+            inputs (list): List of dictionaries of inputs with key "img".
+
+        Returns:
+            outputs (list): bbox outputs of each frame, in the same format as
+            `run()`.
+        """
+        results = self.model.predict_batch([frame["img"] for frame in inputs])
+        return [
+            {"bboxes": bboxes, "bbox_labels": labels, "bbox_scores": scores}
+            for bboxes, labels, scores in results
+        ]
@@ -21,9 +21,10 @@ from typing import Any, Dict
 
 from peekingduck.pipeline.nodes.model.yolov4_face import yolo_face_model
 from peekingduck.pipeline.nodes.node import AbstractNode
+from peekingduck.utils.warmup import WarmupMixin
 
 
-class Node(AbstractNode):  # pylint: disable=too-few-public-methods
+class Node(WarmupMixin, AbstractNode):  # pylint: disable=too-few-public-methods
     """Initialises and use the YOLO face detection model to infer bboxes from
     image frame.
 
@@ -71,6 +72,7 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
     def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
         super().__init__(config, node_path=__name__, **kwargs)
         self.model = yolo_face_model.Yolov4(self.config)
+        self._warm_up()
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         bboxes, labels, scores = self.model.predict(inputs["img"])
@@ -20,9 +20,10 @@ from typing import Any, Dict
 
 from peekingduck.pipeline.nodes.model.yolov4_license_plate import lp_detector_model
 from peekingduck.pipeline.nodes.node import AbstractNode
+from peekingduck.utils.warmup import WarmupMixin
 
 
-class Node(AbstractNode):  # pylint: disable=too-few-public-methods
+class Node(WarmupMixin, AbstractNode):  # pylint: disable=too-few-public-methods
     """Initialises and uses YOLO model to infer bboxes from image frame.
 
     The YOLO node is capable of detecting objects from a single class (License
@@ -62,6 +63,7 @@ class Node(AbstractNode):  # pylint: disable=too-few-public-methods
     def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
         super().__init__(config, node_path=__name__, **kwargs)
         self.model = lp_detector_model.Yolov4(self.config)
+        self._warm_up()
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Reads the image input and returns the bboxes of the specified
@@ -26,6 +26,7 @@ import tensorflow as tf
 
 from peekingduck.pipeline.nodes.model.yolov4.yolo_files.dataset import transform_images
 from peekingduck.utils.graph_functions import load_graph
+from peekingduck.utils.tracer import span
 
 
 class Detector:
@@ -72,6 +73,9 @@ class Detector:
                 str(model_path),
                 inputs=model_nodes["inputs"],
                 outputs=model_nodes["outputs"],
+                backend=self.config["backend"],
+                intra_op_threads=self.config["intra_op_threads"],
+                inter_op_threads=self.config["inter_op_threads"],
             )
         raise ValueError(
             f"Graph file does not exist. Please check that {model_path} exists"
@@ -82,6 +86,19 @@ class Detector:
         self.logger.info(f"image file {image_file} loaded")
         return img
 
+    @classmethod
+    def preprocess(cls, image: np.ndarray, image_size: int) -> tf.Tensor:
+        """Turns a frame into the model input of a batch of one
+
+        Args:
+            image (np.array): frame from the input node
+            image_size (int): input size of the model
+
+        Returns:
+            image (tf.Tensor): image resized to ``image_size`` and normalised
+        """
+        return cls._reshape_image(cls._prepare_image_from_camera(image), image_size)
+
     @staticmethod
     def _reshape_image(image: tf.Tensor, image_size: int) -> tf.Tensor:
         image = tf.expand_dims(image, 0)
@@ -90,27 +107,25 @@ class Detector:
 
     @staticmethod
     def _shrink_dimension_and_length(
-        boxes: tf.Tensor,
-        scores: tf.Tensor,
-        classes: tf.Tensor,
-        nums: List[int],
+        boxes: np.ndarray,
+        scores: np.ndarray,
+        classes: np.ndarray,
+        num: int,
         object_ids: List[int],
-    ) -> Tuple[List[np.ndarray], List[float], List[str]]:
-        len0 = nums[0]
-
-        classes = classes.numpy()[0]
-        classes = classes[:len0]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Keeps the ``num`` valid detections of one image, out of the padded
+        outputs of the NMS, whose classes are in ``object_ids``.
+        """
+        classes = classes[:num]
         mask1 = np.isin(
             classes, tuple(object_ids)
         )  # only identify objects we are interested in
-        classes = tf.boolean_mask(classes, mask1)
+        classes = classes[mask1]
 
-        scores = scores.numpy()[0]
-        scores = scores[:len0]
+        scores = scores[:num]
         scores = scores[mask1]
 
-        boxes = boxes.numpy()[0]
-        boxes = boxes[:len0]
+        boxes = boxes[:num]
         boxes = boxes[mask1]
 
         return boxes, scores, classes
@@ -124,27 +139,29 @@ class Detector:
             - boxes: the bounding boxes for each object
             - scores: the scores for each object predicted
             - classes: the class predicted for each bounding box
-            - nums: number of valid bboxes. Only nums[0] should be used. The rest
-                    are paddings.
+            - nums: number of valid bboxes for each image in the batch. The
+                    rest are paddings.
         """
         # image = image[..., ::-1]  # swap from bgr to rgb
-        pred = self.yolo(image)[-1]
-        bboxes = pred[:, :, :4].numpy()
+        with span("graph_call", "model"):
+            pred = self.yolo(image)[-1]
+            bboxes = pred[:, :, :4].numpy()
         bboxes[:, :, [0, 1]] = bboxes[:, :, [1, 0]]  # swapping x and y axes
         bboxes[:, :, [2, 3]] = bboxes[:, :, [3, 2]]
         pred_conf = pred[:, :, 4:]
 
         # performs nms using model's predictions
-        boxes, scores, classes, nums = tf.image.combined_non_max_suppression(
-            boxes=tf.reshape(bboxes, (tf.shape(bboxes)[0], -1, 1, 4)),
-            scores=tf.reshape(
-                pred_conf, (tf.shape(pred_conf)[0], -1, tf.shape(pred_conf)[-1])
-            ),
-            max_output_size_per_class=self.config["max_output_size_per_class"],
-            max_total_size=self.config["max_total_size"],
-            iou_threshold=self.config["yolo_iou_threshold"],
-            score_threshold=self.config["yolo_score_threshold"],
-        )
+        with span("nms", "model"):
+            boxes, scores, classes, nums = tf.image.combined_non_max_suppression(
+                boxes=tf.reshape(bboxes, (tf.shape(bboxes)[0], -1, 1, 4)),
+                scores=tf.reshape(
+                    pred_conf, (tf.shape(pred_conf)[0], -1, tf.shape(pred_conf)[-1])
+                ),
+                max_output_size_per_class=self.config["max_output_size_per_class"],
+                max_total_size=self.config["max_total_size"],
+                iou_threshold=self.config["yolo_iou_threshold"],
+                score_threshold=self.config["yolo_score_threshold"],
+            )
         return boxes, scores, classes, nums
 
     @staticmethod
@@ -173,22 +190,54 @@ class Detector:
                 (x1, y1, x2, y2), in a coordinate system with original point in
                 the left top corner
         """
-        # 1. prepare image
-        image = self._prepare_image_from_camera(image)
-        image = self._reshape_image(image, self.config["size"])
+        return self.predict_object_bbox_from_images(class_names, [image], detect_ids)[0]
 
-        # 2. evaluate image
-        boxes, scores, classes, nums = self._evaluate_image_by_yolo(image)
+    def predict_object_bbox_from_images(
+        self, class_names: List[str], images: List[np.ndarray], detect_ids: List[int]
+    ) -> List[Tuple[List[np.ndarray], List[str], List[float]]]:
+        """Detect all objects' bounding box from a batch of images with a
+        single call to the model
 
-        # 3. clean up return
-        boxes, scores, classes = self._shrink_dimension_and_length(  # type: ignore
-            boxes, scores, classes, nums, detect_ids
-        )
+        Args:
+            images (List[np.array]): input images, which can be of different
+                sizes as they are resized to the model's input size
 
-        # convert classes into class names
-        classes = np.array([class_names[int(i)] for i in classes])  # type: ignore
+        Return:
+            results (List[Tuple]): boxes, classes and scores of each image,
+                in the same order as `images`
+        """
+        # 1. prepare images
+        with span("preprocess", "model"):
+            batch = tf.concat(
+                [self.preprocess(image, self.config["size"]) for image in images],
+                axis=0,
+            )
 
-        return boxes, classes, scores  # type: ignore
+        # 2. evaluate images
+        boxes, scores, classes, nums = self._evaluate_image_by_yolo(batch)
+
+        results = []
+        with span("postprocess", "model"):
+            # the outputs of the whole batch are converted at once
+            for image_boxes, image_scores, image_classes, num in zip(
+                boxes.numpy(), scores.numpy(), classes.numpy(), nums.numpy()
+            ):
+                # 3. clean up return
+                (
+                    image_boxes,
+                    image_scores,
+                    image_classes,
+                ) = self._shrink_dimension_and_length(
+                    image_boxes, image_scores, image_classes, num, detect_ids
+                )
+
+                # convert classes into class names
+                image_class_names = np.array(
+                    [class_names[int(i)] for i in image_classes]
+                )
+
+                results.append((image_boxes, image_class_names, image_scores))
+        return results  # type: ignore
 
     def setup_gpu(self) -> None:
         """Method to give info on whether the current device code is running on
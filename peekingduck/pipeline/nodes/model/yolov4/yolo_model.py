@@ -73,6 +73,23 @@ class YoloModel:
             self.class_names, frame, self.detect_ids
         )
 
+    def predict_batch(
+        self, frames: List[np.ndarray]
+    ) -> List[Tuple[List[np.ndarray], List[str], List[float]]]:
+        """predict the bboxes from a batch of frames with a single call to
+        the model
+
+        Returns:
+            results (List[Tuple]): bboxes, labels and scores of each frame,
+                in the same order as `frames`
+        """
+        for frame in frames:
+            assert isinstance(frame, np.ndarray)
+
+        return self.detector.predict_object_bbox_from_images(
+            self.class_names, frames, self.detect_ids
+        )
+
     def get_detect_ids(self) -> List[int]:
         """getter for selected ids for detection
 
@@ -25,6 +25,8 @@ import numpy as np
 import tensorflow as tf
 from tensorflow.python.saved_model import tag_constants
 
+from peekingduck.utils.graph_functions import load_saved_model
+
 
 class Detector:  # pylint: disable=too-few-public-methods
     """Object detection class using yolo model to find human faces"""
@@ -49,7 +51,7 @@ class Detector:  # pylint: disable=too-few-public-methods
         model_path = (
             self.model_dir / self.config["weights"]["saved_model_subdir"][model_type]
         )
-        model = tf.saved_model.load(str(model_path), tags=[tag_constants.SERVING])
+        model = load_saved_model(str(model_path), [tag_constants.SERVING])
 
         self.logger.info(
             "Yolo model loaded with following configs: \n\t"
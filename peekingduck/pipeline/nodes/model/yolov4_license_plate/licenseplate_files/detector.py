@@ -26,6 +26,8 @@ import numpy as np
 import tensorflow as tf
 from tensorflow.python.saved_model import tag_constants
 
+from peekingduck.utils.graph_functions import load_saved_model
+
 
 class Detector:
     """Object detection class using yolo model to find object bboxes"""
@@ -54,7 +56,7 @@ class Detector:
             self.model_dir
             / self.config["weights"]["saved_model_subdir"][self.model_type]
         )
-        model = tf.saved_model.load(str(model_path), tags=[tag_constants.SERVING])
+        model = load_saved_model(str(model_path), [tag_constants.SERVING])
 
         self.logger.info(
             "Yolo model loaded with following configs: \n\t"
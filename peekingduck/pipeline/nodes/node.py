@@ -40,7 +40,7 @@ class AbstractNode(metaclass=ABCMeta):
 
     def __init__(
         self,
-        config: Dict[str, Any] = None,
+        config: Optional[Dict[str, Any]] = None,
         node_path: str = "",
         pkd_base_dir: Optional[Path] = None,
         **kwargs: Any,
@@ -59,6 +59,15 @@ class AbstractNode(metaclass=ABCMeta):
         self.config_loader = ConfigLoader(pkd_base_dir)
         self.load_node_config(config, kwargs)  # type: ignore
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # run() and run_batch() wrapped on the instance, e.g., by the profiler
+        # or tracer, are local functions which cannot be pickled, so nodes
+        # sent to worker processes run unwrapped
+        state = self.__dict__.copy()
+        state.pop("run", None)
+        state.pop("run_batch", None)
+        return state
+
     @classmethod
     def __subclasshook__(cls: Any, subclass: Any) -> bool:
         return hasattr(subclass, "run") and callable(subclass.run)
@@ -68,6 +77,22 @@ class AbstractNode(metaclass=ABCMeta):
         """abstract method needed for running node"""
         raise NotImplementedError("This method needs to be implemented")
 
+    def run_batch(self, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Runs the node on the inputs of several frames at once.
+        NOTE: To be overridden by subclass, e.g. model nodes which can stack
+        the frames into a single inference call. Runs each frame separately
+        by default.
+
+        Args:
+            inputs (:obj:`List[Dict[str, Any]]`): Inputs of each frame, in
+                order.
+
+        Returns:
+            (:obj:`List[Dict[str, Any]]`): Outputs of each frame, in the same
+            order as ``inputs``.
+        """
+        return [self.run(frame_inputs) for frame_inputs in inputs]
+
     # pylint: disable=R0201, W0107
     def release_resources(self) -> None:
         """To gracefully release any acquired system resources, e.g. webcam
@@ -20,12 +20,21 @@ import logging
 import textwrap
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, NamedTuple, Optional
 
 from peekingduck.pipeline.nodes.node import AbstractNode
 from peekingduck.pipeline.nodes.output.utils.csvlogger import CSVLogger
 
 
+class OutputFile(NamedTuple):
+    """CSV file being written to and, with ``split_by_filename``, the input
+    file which it belongs to.
+    """
+
+    path: Path
+    input_filename: Optional[str] = None
+
+
 class Node(AbstractNode):
     """Tracks user-specified parameters and outputs the results in a CSV file.
 
@@ -47,6 +56,11 @@ class Node(AbstractNode):
             Directory where CSV file is saved.
         logging_interval (:obj:`int`): **default = 1**. |br|
             Interval between each log, in terms of seconds.
+        split_by_filename (:obj:`bool`): **default = False**. |br|
+            Starts a new CSV file for every input file, named after
+            ``file_path`` and the input ``filename``, e.g.,
+            ``stats_video1_<timestamp>.csv``, so that the stats of input files
+            processed in parallel are kept apart.
     """
 
     def __init__(self, config: Dict[str, Any] = None, **kwargs: Any) -> None:
@@ -59,12 +73,13 @@ class Node(AbstractNode):
         if self.file_path.suffix != ".csv":
             raise ValueError("Filepath must have a '.csv' extension.")
 
-        self._file_path_datetime = self._append_datetime_file_path(self.file_path)
+        self._output_file = OutputFile(self._append_datetime_file_path(self.file_path))
         self._stats_checked = False
         self.stats_to_track: List[str]
-        self.csv_logger = CSVLogger(
-            self._file_path_datetime, self.stats_to_track, self.logging_interval
-        )
+        if not getattr(self, "split_by_filename", False):
+            self.csv_logger = CSVLogger(
+                self._output_file.path, self.stats_to_track, self.logging_interval
+            )
 
     def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Writes the current state of the tracked statistics into
@@ -84,14 +99,29 @@ class Node(AbstractNode):
         if not self._stats_checked:
             self._check_tracked_stats(inputs)
             # self._stats_to_track might change after the check
-            self.csv_logger = CSVLogger(
-                self._file_path_datetime, self.stats_to_track, self.logging_interval
-            )
+            if not getattr(self, "split_by_filename", False):
+                self.csv_logger = CSVLogger(
+                    self._output_file.path,
+                    self.stats_to_track,
+                    self.logging_interval,
+                )
+
+        if (
+            getattr(self, "split_by_filename", False)
+            and inputs["filename"] != self._output_file.input_filename
+        ):
+            self._start_file(inputs["filename"])
 
         self.csv_logger.write(inputs, self.stats_to_track)
 
         return {}
 
+    def release_resources(self) -> None:
+        """Closes the CSV file, as the node is not run at the end of the
+        pipeline.
+        """
+        self._reset()
+
     def _check_tracked_stats(self, inputs: Dict[str, Any]) -> None:
         """Checks whether user input statistics is present in the data pool
         of the pipeline. Statistics not present in data pool will be
@@ -120,11 +150,25 @@ class Node(AbstractNode):
         self.stats_to_track = valid
         self._stats_checked = True
 
+    def _start_file(self, filename: str) -> None:
+        """Starts a new CSV file for the input file ``filename``."""
+        file_path = self.file_path.with_name(
+            f"{self.file_path.stem}_{Path(filename).stem}{self.file_path.suffix}"
+        )
+        self._output_file = OutputFile(
+            self._append_datetime_file_path(file_path), filename
+        )
+        self.csv_logger = CSVLogger(
+            self._output_file.path, self.stats_to_track, self.logging_interval
+        )
+
     def _reset(self) -> None:
-        del self.csv_logger
+        if hasattr(self, "csv_logger"):
+            del self.csv_logger
 
         # initialize for use in run
         self._stats_checked = False
+        self._output_file = self._output_file._replace(input_filename=None)
 
     @staticmethod
     def _append_datetime_file_path(file_path: Path) -> Path:
@@ -18,9 +18,13 @@ inference.
 """
 
 import textwrap
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Set, Tuple
 
 from peekingduck.pipeline.nodes.node import AbstractNode
+from peekingduck.pipeline.plan import ExecutionPlan
+
+# Nodes of these types draw on their input images in place
+IN_PLACE_NODE_TYPES = ["draw"]
 
 
 class Pipeline:  # pylint: disable=too-few-public-methods
@@ -35,6 +39,8 @@ class Pipeline:  # pylint: disable=too-few-public-methods
     def __init__(self, nodes: List[AbstractNode]) -> None:
         self.nodes = nodes
         self._check_pipe(nodes)
+        self.dependencies = self._build_graph(nodes)
+        self.plan = ExecutionPlan(nodes)
         self.data = {}  # type: ignore
         self.terminate = False
 
@@ -47,6 +53,45 @@ class Pipeline:  # pylint: disable=too-few-public-methods
         """
         return self.data
 
+    @staticmethod
+    def _build_graph(nodes: List[AbstractNode]) -> List[List[int]]:
+        """Builds a dependency graph of the nodes from their inputs and outputs.
+        A node depends on an earlier node if
+        1. it reads a key written by the earlier node, where ``pipeline_end``
+           is treated as an input of every node as it decides if a node runs,
+        2. it takes ``all`` as input,
+        3. it modifies its inputs in place and the earlier node reads or writes
+           any of them.
+
+        Returns:
+            (:obj:`List[List[int]]`): The indices of the nodes which each node
+            depends on.
+        """
+        accesses: List[Tuple[Set[str], Set[str], bool]] = []
+        dependencies = []
+        for node in nodes:
+            reads_all = "all" in node.inputs
+            reads = set(node.inputs) - {"none", "all"} | {"pipeline_end"}
+            writes = set(node.outputs) - {"none"}
+            if node.node_name.split(".")[0] in IN_PLACE_NODE_TYPES:
+                modifies = reads - {"pipeline_end"}
+            else:
+                modifies = set()
+            writes |= modifies
+
+            node_dependencies = []
+            for idx, (prev_reads, prev_writes, prev_reads_all) in enumerate(accesses):
+                if (
+                    reads_all
+                    or reads & prev_writes
+                    or modifies & (prev_reads | prev_writes)
+                    or (modifies and prev_reads_all)
+                ):
+                    node_dependencies.append(idx)
+            dependencies.append(node_dependencies)
+            accesses.append((reads, writes, reads_all))
+        return dependencies
+
     @staticmethod
     def _check_pipe(nodes: List[AbstractNode]) -> None:
         # 1. Check the initial node is a source node
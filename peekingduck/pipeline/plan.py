@@ -0,0 +1,182 @@
+# Copyright 2021 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Execution plan compiled once from the nodes of a pipeline, so that running a
+frame does not have to inspect the configuration of every node again.
+"""
+
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from peekingduck.pipeline.nodes.node import AbstractNode
+
+# Placeholder for keys which have not been output yet
+MISSING = object()
+# Node names whose resources have to be released at the end of a run
+RESOURCE_NODE_SUFFIXES = (".live", ".recorded", ".csv_writer")
+# Slot of pipeline_end, which is checked before every node
+END_SLOT = 0
+
+
+def get_node_inputs(node: AbstractNode, data: Dict[str, Any]) -> Mapping[str, Any]:
+    """Selects the inputs required by ``node`` from the data pool. Nodes which
+    take ``all`` as input receive a read-only view of the entire data pool.
+
+    Args:
+        node (:obj:`AbstractNode`): Node to be run.
+        data (:obj:`Dict[str, Any]`): Data pool of the current frame.
+
+    Returns:
+        (:obj:`Mapping[str, Any]`): Inputs to be passed to ``node.run()``.
+    """
+    if "all" in node.inputs:
+        return read_only_view(data)
+    return {key: data[key] for key in node.inputs if key in data}
+
+
+def read_only_view(data: Dict[str, Any]) -> Mapping[str, Any]:
+    """Creates a read-only view of the data pool without copying its contents.
+    Numpy arrays are replaced by non-writeable views of the same memory, so
+    nodes which need to modify an array, e.g., to draw on ``img``, have to
+    copy it first.
+
+    Args:
+        data (:obj:`Dict[str, Any]`): Data pool of the current frame.
+
+    Returns:
+        (:obj:`Mapping[str, Any]`): Read-only mapping of the data pool.
+    """
+    view = {}
+    for key, value in data.items():
+        if isinstance(value, np.ndarray):
+            value = value.view()
+            value.flags.writeable = False
+        view[key] = value
+    return MappingProxyType(view)
+
+
+class NodeStep(NamedTuple):
+    """A node of an :class:`ExecutionPlan` with everything needed to run it
+    resolved in advance.
+    """
+
+    node: AbstractNode
+    # bound AbstractNode.run, or a wrapper of it
+    run: Callable[[Dict[str, Any]], Dict[str, Any]]
+    # (key, slot) of every input, excluding "none" and "all"
+    inputs: Tuple[Tuple[str, int], ...]
+    reads_all: bool
+    runs_at_end: bool
+
+
+class ExecutionPlan:
+    """Compiles the nodes of a pipeline into steps with bound ``run``
+    methods and precomputed inputs, and runs them on a slot-based data pool.
+
+    Every key in the inputs and outputs of the nodes is given a fixed slot,
+    and the data pool of a frame is a list holding the value of each slot,
+    so nodes read their inputs by index instead of searching the data pool.
+    Keys output by a node without being declared in its config are given a
+    slot when they first appear.
+
+    Args:
+        nodes (:obj:`List[AbstractNode]`): Nodes of the pipeline, in order.
+    """
+
+    def __init__(self, nodes: List[AbstractNode]) -> None:
+        self.slots: Dict[str, int] = {"pipeline_end": END_SLOT}
+        for node in nodes:
+            for key in list(node.inputs) + list(node.outputs):
+                if key not in ("none", "all"):
+                    self.slots.setdefault(key, len(self.slots))
+        self.steps = [
+            NodeStep(
+                node,
+                node.run,
+                tuple(
+                    (key, self.slots[key])
+                    for key in node.inputs
+                    if key not in ("none", "all")
+                ),
+                "all" in node.inputs,
+                "pipeline_end" in node.inputs,
+            )
+            for node in nodes
+        ]
+        self.resource_nodes = [
+            node for node in nodes if node.name.endswith(RESOURCE_NODE_SUFFIXES)
+        ]
+
+    def rebind(self) -> None:
+        """Binds the steps to the current ``run`` methods of the nodes, e.g.,
+        after they have been wrapped for profiling.
+        """
+        self.steps = [step._replace(run=step.node.run) for step in self.steps]
+
+    def new_pool(self, data: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """Creates a slot-based data pool, filled with the values in ``data``
+        if given.
+        """
+        pool = [MISSING] * len(self.slots)
+        if data:
+            self._store(pool, data)
+        return pool
+
+    def to_dict(self, pool: List[Any]) -> Dict[str, Any]:
+        """Converts a slot-based data pool into a dictionary."""
+        return {
+            key: pool[slot]
+            for key, slot in self.slots.items()
+            if slot < len(pool) and pool[slot] is not MISSING
+        }
+
+    def run_frame(self, pool: List[Any]) -> bool:
+        """Runs every node on the frame held in ``pool``. Once a node sets
+        ``pipeline_end``, only nodes which take ``pipeline_end`` as an input
+        are run.
+
+        Returns:
+            (:obj:`bool`): True if ``pipeline_end`` was set before one of the
+            nodes was run, i.e., the pipeline has ended.
+        """
+        ended = False
+        for step in self.steps:
+            end = pool[END_SLOT]
+            if end is not MISSING and end:
+                ended = True
+                if not step.runs_at_end:
+                    continue
+            if step.reads_all:
+                inputs: Mapping[str, Any] = read_only_view(self.to_dict(pool))
+            else:
+                inputs = {
+                    key: pool[slot]
+                    for key, slot in step.inputs
+                    if pool[slot] is not MISSING
+                }
+            self._store(pool, step.run(inputs))  # type: ignore
+        return ended
+
+    def _store(self, pool: List[Any], outputs: Dict[str, Any]) -> None:
+        slots = self.slots
+        for key, value in outputs.items():
+            slot = slots.get(key)
+            if slot is None:
+                slot = slots[key] = len(slots)
+            if slot >= len(pool):
+                pool.extend([MISSING] * (slot + 1 - len(pool)))
+            pool[slot] = value
@@ -0,0 +1,291 @@
+# Copyright 2021 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Records the time and memory taken by every node of a pipeline.
+"""
+
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import numpy as np
+
+from peekingduck.pipeline.nodes.node import AbstractNode
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore
+
+METRICS = ["wall_ms", "cpu_ms", "alloc_kb"]
+PERCENTILES = [50, 95, 99]
+
+
+class NodeStats:
+    """Measurements of a single node over the last ``window`` frames, and
+    totals over the whole run.
+
+    Args:
+        window (:obj:`int`): Number of frames kept for the percentiles.
+        node_name (:obj:`str`): Name of the node, for display.
+    """
+
+    def __init__(self, window: int, node_name: str = "") -> None:
+        self.node_name = node_name
+        self.samples: Dict[str, Deque[float]] = {
+            metric: deque(maxlen=window) for metric in METRICS
+        }
+        self.num_frames = 0
+        self.total_wall_ms = 0.0
+        # growth of the peak RSS of the process during calls of the node
+        self.peak_rss_growth_mb: Optional[float] = None
+
+    def add(self, wall_ms: float, cpu_ms: float, alloc_kb: float) -> None:
+        """Adds the measurements of one frame."""
+        self.samples["wall_ms"].append(wall_ms)
+        self.samples["cpu_ms"].append(cpu_ms)
+        self.samples["alloc_kb"].append(alloc_kb)
+        self.num_frames += 1
+        self.total_wall_ms += wall_ms
+
+    def summary(self) -> Dict[str, Any]:
+        """Computes the percentiles of every metric in the window.
+
+        Returns:
+            (:obj:`Dict[str, Any]`): ``node_name``, ``num_frames``,
+            ``total_wall_ms``, and the p50, p95 and p99 of every metric, e.g.,
+            ``{"wall_ms": {"p50": ...}}``.
+        """
+        summary: Dict[str, Any] = {
+            "node_name": self.node_name,
+            "num_frames": self.num_frames,
+            "total_wall_ms": self.total_wall_ms,
+        }
+        if self.peak_rss_growth_mb is not None:
+            summary["peak_rss_growth_mb"] = self.peak_rss_growth_mb
+        for metric, samples in self.samples.items():
+            values = np.percentile(samples, PERCENTILES) if samples else [0.0] * 3
+            summary[metric] = {
+                f"p{percentile}": float(value)
+                for percentile, value in zip(PERCENTILES, values)
+            }
+        return summary
+
+
+class ProfileWindow:  # pylint: disable=too-few-public-methods
+    """Measurements of every node since the profiler was last reset, keyed by
+    the labels of :func:`node_label`.
+
+    Args:
+        node_names (:obj:`List[str]`): Names of the measured nodes, in order.
+        window (:obj:`int`): Number of frames kept for the percentiles.
+        track_rss (:obj:`bool`): Whether growth of the peak RSS is recorded.
+    """
+
+    def __init__(self, node_names: List[str], window: int, track_rss: bool) -> None:
+        self.window = window
+        self.stats = {
+            node_label(idx, name): NodeStats(window, name)
+            for idx, name in enumerate(node_names)
+        }
+        if track_rss:
+            for stats in self.stats.values():
+                stats.peak_rss_growth_mb = 0.0
+        self.num_frames = 0
+
+
+class NodeProfiler:
+    """Measures the wall time, CPU time and net memory allocated by every
+    call of the nodes, by wrapping their ``run`` and ``run_batch`` methods.
+
+    CPU time is that of the whole process, so it includes threads started by
+    the node, e.g., by TensorFlow. Allocations are tracked with
+    :mod:`tracemalloc`, which covers Python objects and numpy arrays but not
+    memory allocated by TensorFlow, and slows the pipeline down noticeably,
+    so they are only recorded if ``track_memory`` is True. When nodes run
+    concurrently, e.g., in "dag" execution mode, CPU time and allocations of
+    one node include those of the nodes running alongside it. Nodes run in
+    worker processes through ``process_stages`` are not measured.
+
+    With ``track_rss``, the amount by which each node raised the peak resident
+    set size (RSS) of the process is also recorded, i.e., the node whose
+    calls pushed the peak memory usage up. This is not available on Windows.
+
+    Args:
+        nodes (:obj:`List[AbstractNode]`): Nodes to be measured. The number
+            of frames is counted from the calls of the first node.
+        window (:obj:`int`): Number of frames kept for the percentiles.
+        log_interval (:obj:`int`): Number of frames between two log
+            summaries, or 0 to only log the final report.
+        track_memory (:obj:`bool`): Whether to record allocations.
+        track_rss (:obj:`bool`): Whether to record growth of the peak RSS.
+            **Default: False**.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        nodes: List[AbstractNode],
+        window: int,
+        log_interval: int,
+        track_memory: bool,
+        track_rss: bool = False,
+    ) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.nodes = list({id(node): node for node in nodes}.values())
+        self.log_interval = log_interval
+        self.track_memory = track_memory
+        self.track_rss = track_rss and resource is not None
+        self.current = self._new_window(window)
+        self._started_tracemalloc = False
+
+    @property
+    def num_frames(self) -> int:
+        """Number of frames measured since the last reset."""
+        return self.current.num_frames
+
+    def reset(self) -> None:
+        """Discards the measurements so far, e.g., those taken during warmup."""
+        self.current = self._new_window(self.current.window)
+
+    def start(self) -> None:
+        """Starts measuring the nodes."""
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        for idx, node in enumerate(self.nodes):
+            label = node_label(idx, node.node_name)
+            node.run = self._wrap(node.run, label, idx == 0)  # type: ignore
+            if type(node).run_batch is not AbstractNode.run_batch:
+                # the default run_batch() calls the wrapped run()
+                node.run_batch = self._wrap(  # type: ignore
+                    node.run_batch, label, False, batched=True
+                )
+
+    def stop(self) -> None:
+        """Stops measuring the nodes and restores their methods."""
+        for node in self.nodes:
+            node.__dict__.pop("run", None)
+            node.__dict__.pop("run_batch", None)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Computes the statistics of every node.
+
+        Returns:
+            (:obj:`Dict[str, Dict[str, Any]]`): The statistics described in
+            :meth:`NodeStats.summary` for every node, keyed by
+            :func:`node_label`, as the same node may be used more than once.
+        """
+        return {label: stats.summary() for label, stats in self.current.stats.items()}
+
+    def log_summary(self, title: str = "Node timings") -> None:
+        """Logs the percentiles of every node."""
+        summary = self.summary()
+        total_ms = sum(node["total_wall_ms"] for node in summary.values()) or 1.0
+        lines = [f"{title} over the last {self.current.window} frames (p50/p95/p99):"]
+        for label, node in summary.items():
+            line = (
+                f"  {label:<28} wall {_format(node['wall_ms'])} ms, "
+                f"cpu {_format(node['cpu_ms'])} ms"
+            )
+            if self.track_memory:
+                line += f", alloc {_format(node['alloc_kb'])} KB"
+            share = 100 * node["total_wall_ms"] / total_ms
+            lines.append(f"{line}, {share:.1f}% of total")
+        self.logger.info("\n".join(lines))
+
+    def report(self, report_path: str = "") -> None:
+        """Logs the final statistics, and writes them as JSON to
+        ``report_path`` if given.
+        """
+        self.log_summary(f"Final report of {self.num_frames} frames, node timings")
+        if report_path:
+            path = Path(report_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as outfile:
+                json.dump(
+                    {"num_frames": self.num_frames, "nodes": self.summary()},
+                    outfile,
+                    indent=2,
+                )
+            self.logger.info(f"Node timings written to {path}")
+
+    def _wrap(
+        self,
+        method: Callable,
+        label: str,
+        counts_frames: bool,
+        batched: bool = False,
+    ) -> Callable:
+        def profiled(inputs: Any) -> Any:
+            rss_start = peak_rss_mb() if self.track_rss else 0.0
+            alloc_start = tracemalloc.get_traced_memory()[0]
+            cpu_start = time.process_time()
+            wall_start = time.perf_counter()
+            outputs = method(inputs)
+            wall_ms = 1000 * (time.perf_counter() - wall_start)
+            cpu_ms = 1000 * (time.process_time() - cpu_start)
+            alloc_kb = (tracemalloc.get_traced_memory()[0] - alloc_start) / 1024
+            # looked up after every call as reset() may replace the window
+            current = self.current
+            stats = current.stats[label]
+            if self.track_rss:
+                stats.peak_rss_growth_mb += peak_rss_mb() - rss_start  # type: ignore
+            num_frames = max(len(inputs), 1) if batched else 1
+            for _ in range(num_frames):
+                stats.add(
+                    wall_ms / num_frames, cpu_ms / num_frames, alloc_kb / num_frames
+                )
+            if counts_frames:
+                current.num_frames += 1
+                if self.log_interval and current.num_frames % self.log_interval == 0:
+                    self.log_summary()
+            return outputs
+
+        return profiled
+
+    def _new_window(self, window: int) -> ProfileWindow:
+        return ProfileWindow(
+            [node.node_name for node in self.nodes], window, self.track_rss
+        )
+
+
+def node_label(idx: int, node_name: str) -> str:
+    """Label of the measurements of the ``idx``-th measured node, e.g.,
+    ``"2:draw.bbox"``.
+    """
+    return f"{idx}:{node_name}"
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the process, in MB, or 0 if it is not
+    available on the platform.
+    """
+    if resource is None:
+        return 0.0
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # in bytes on macOS and in kilobytes elsewhere
+    return peak_rss / 1024 ** 2 if sys.platform == "darwin" else peak_rss / 1024
+
+
+def _format(percentiles: Dict[str, float]) -> str:
+    return "/".join(f"{value:.1f}" for value in percentiles.values())
@@ -0,0 +1,123 @@
+# Copyright 2021 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Quantizes the frozen graphs of the model nodes of a pipeline to INT8 TFLite
+models, for their "tflite" backend, and reports how far their outputs drift
+from those of the float models.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+from peekingduck.declarative_loader import DeclarativeLoader
+from peekingduck.onnx_converter import GRAPH_SPECS, graph_spec
+from peekingduck.utils.graph_functions import quantization_drift
+from peekingduck.utils.tflite_backend import quantize_graph
+
+
+def quantize_pipeline(  # pylint: disable=too-many-locals
+    run_config_path: Path,
+    config_updates_cli: str,
+    custom_nodes_parent_subdir: str,
+    frames: List[np.ndarray],
+    num_calibration_frames: int,
+) -> List[Dict[str, Any]]:
+    """Quantizes the frozen graphs of the model nodes in ``run_config_path``
+    to INT8 TFLite models next to them.
+
+    Every frame is preprocessed as by the node. The first
+    ``num_calibration_frames`` frames calibrate the ranges of the activations,
+    and the accuracy drift of the INT8 model from the float model is measured
+    on the remaining frames, or on the calibration frames if none remain. See
+    :func:`quantization_drift <peekingduck.utils.graph_functions.quantization_drift>`.
+
+    Args:
+        run_config_path (:obj:`pathlib.Path`): Path of the run config.
+        config_updates_cli (:obj:`str`): Stringified configuration changes, as
+            with ``peekingduck run --node_config``.
+        custom_nodes_parent_subdir (:obj:`str`): Parent folder of the custom
+            nodes.
+        frames (:obj:`List[np.ndarray]`): Representative frames of the
+            deployment.
+        num_calibration_frames (:obj:`int`): Number of frames used for
+            calibration.
+
+    Returns:
+        (:obj:`List[Dict[str, Any]]`): The node, frozen graph and TFLite model
+        paths and sizes of every quantization, the number of calibration and
+        evaluation frames, and the ``drift`` of every output.
+
+    Raises:
+        ValueError: The run config has no node with a frozen graph.
+    """
+    logger = logging.getLogger(__name__)
+    loader = DeclarativeLoader(
+        run_config_path, config_updates_cli, custom_nodes_parent_subdir
+    )
+    calibration_frames = frames[:num_calibration_frames]
+    evaluation_frames = frames[num_calibration_frames:] or calibration_frames
+    results = []
+    for node_name, config in loader.get_node_configs():
+        spec = graph_spec(node_name, config)
+        if spec is None:
+            continue
+        graph_path = str(spec.graph_path)
+        model_path = quantize_graph(
+            graph_path,
+            spec.inputs,
+            spec.outputs,
+            ([spec.preprocess(frame)] for frame in calibration_frames),
+        )
+        drift = quantization_drift(
+            graph_path,
+            spec.inputs,
+            spec.outputs,
+            [[spec.preprocess(frame)] for frame in evaluation_frames],
+        )
+        results.append(
+            {
+                "node": node_name,
+                "graph_path": graph_path,
+                "tflite_path": str(model_path),
+                "size_mb": {
+                    "float": spec.graph_path.stat().st_size / 1024 ** 2,
+                    "int8": model_path.stat().st_size / 1024 ** 2,
+                },
+                "num_calibration_frames": len(calibration_frames),
+                "num_evaluation_frames": len(evaluation_frames),
+                "drift": dict(zip(spec.outputs, drift)),
+            }
+        )
+        largest = max(output["relative_error"] for output in drift)
+        logger.info(f"{node_name}: largest relative error of INT8 {largest:.2%}")
+    if not results:
+        raise ValueError(
+            f"{run_config_path} has no model node with a frozen graph. Supported "
+            f"nodes: {list(GRAPH_SPECS)}"
+        )
+    return results
+
+
+def write_report(results: List[Dict[str, Any]], output_path: Path) -> None:
+    """Writes ``results`` of :func:`quantize_pipeline` as JSON to
+    ``output_path``.
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as outfile:
+        json.dump({"models": results}, outfile, indent=2)
@@ -16,16 +16,46 @@
 Main engine for PeekingDuck processes.
 """
 
-import copy
 import logging
 import sys
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional
+
+import yaml
 
 from peekingduck.declarative_loader import DeclarativeLoader, NodeList
+from peekingduck.pipeline.executors import (
+    DAGExecutor,
+    LatencyBudgetExecutor,
+    MultiStreamExecutor,
+    PipelinedExecutor,
+)
 from peekingduck.pipeline.nodes.node import AbstractNode
 from peekingduck.pipeline.pipeline import Pipeline
+from peekingduck.pipeline.profiler import NodeProfiler
 from peekingduck.utils.requirement_checker import RequirementChecker
+from peekingduck.utils.thread_settings import THREAD_SETTINGS, check_cores, pin_process
+from peekingduck.utils.tracer import TRACER
+
+RUNNER_CONFIG_PATH = Path(__file__).resolve().parent / "configs" / "runner.yml"
+EXECUTION_MODES = ["sequential", "pipelined", "dag"]
+# Smallest valid value of the numeric settings of the runner config
+MIN_CONFIG_VALUES = {
+    "stage_queue_size": 1,
+    "dag_max_workers": 1,
+    "batch_size": 1,
+    "batch_timeout": 0,
+    "shm_slots": 1,
+    "parallel_files": 0,
+    "stream_workers": 1,
+    "latency_budget": 0,
+    "max_skipped_frames": 1,
+    "intra_op_threads": 0,
+    "inter_op_threads": 0,
+    "opencv_threads": -1,
+    "profile_window": 1,
+    "profile_log_interval": 0,
+}
 
 
 class Runner:
@@ -51,18 +81,32 @@ class Runner:
             `Getting Started <getting_started/03_custom_nodes.html>`_.
         nodes (:obj:`List[AbstractNode]` | :obj:`None`): If a list of nodes is
             provided, initialize by the node stack directly.
+        runner_config (:obj:`Dict[str, Any]` | :obj:`None`): Changes to the
+            default execution settings found in *configs/runner.yml*, e.g.,
+            ``{"execution_mode": "pipelined"}``.
     """
 
     def __init__(
         self,
-        run_config_path: Path = None,
-        config_updates_cli: str = None,
-        custom_nodes_parent_subdir: str = None,
-        nodes: List[AbstractNode] = None,
+        run_config_path: Optional[Path] = None,
+        config_updates_cli: Optional[str] = None,
+        custom_nodes_parent_subdir: Optional[str] = None,
+        nodes: Optional[List[AbstractNode]] = None,
+        runner_config: Optional[Dict[str, Any]] = None,
     ):
         self.logger = logging.getLogger(__name__)
+        self.node_loader: Optional[DeclarativeLoader] = None
+        self.pipelines: List[Pipeline] = []
+        self.profiler: Optional[NodeProfiler] = None
         try:
+            self.config = self._load_config(runner_config)
+            self._apply_thread_config()
             if nodes:
+                if self.config["streams"] or self.config["parallel_files"]:
+                    raise ValueError(
+                        "streams and parallel_files require the nodes to be "
+                        "loaded from run_config_path via DeclarativeLoader."
+                    )
                 # instantiated_nodes is created differently when given nodes
                 self.pipeline = Pipeline(nodes)
             elif run_config_path and config_updates_cli and custom_nodes_parent_subdir:
@@ -70,7 +114,16 @@ class Runner:
                 self.node_loader = DeclarativeLoader(
                     run_config_path, config_updates_cli, custom_nodes_parent_subdir
                 )
-                self.pipeline = self.node_loader.get_pipeline()
+                streams = self.config["streams"]
+                if self.config["parallel_files"]:
+                    streams = self._get_file_streams(self.config["parallel_files"])
+                if streams:
+                    self.pipelines = self.node_loader.get_stream_pipelines(
+                        streams, self.config["shared_node_types"]
+                    )
+                    self.pipeline = self.pipelines[0]
+                else:
+                    self.pipeline = self.node_loader.get_pipeline()
             else:
                 raise ValueError(
                     "Arguments error! Pass in either nodes to load directly via "
@@ -85,31 +138,116 @@ class Runner:
 
     def run(self) -> None:
         """execute single or continuous inference"""
-        while not self.pipeline.terminate:
-            for node in self.pipeline.nodes:
-                if (
-                    "pipeline_end" in self.pipeline.data
-                    and self.pipeline.data["pipeline_end"]
-                ):
-                    self.pipeline.terminate = True
-                    if "pipeline_end" not in node.inputs:
-                        continue
-
-                if "all" in node.inputs:
-                    inputs = copy.deepcopy(self.pipeline.data)
-                else:
-                    inputs = {
-                        key: self.pipeline.data[key]
-                        for key in node.inputs
-                        if key in self.pipeline.data
-                    }
-
-                outputs = node.run(inputs)
-                self.pipeline.data.update(outputs)
+        pipelines = self.pipelines or [self.pipeline]
+        nodes = [node for pipeline in pipelines for node in pipeline.nodes]
+        if self.config["profile"]:
+            self.profiler = NodeProfiler(
+                nodes,
+                self.config["profile_window"],
+                self.config["profile_log_interval"],
+                self.config["profile_memory"],
+            )
+            self.profiler.start()
+        if self.config["trace"]:
+            TRACER.start()
+            TRACER.instrument(nodes)
+        for pipeline in pipelines:
+            pipeline.plan.rebind()
+        try:
+            self._execute()
+        finally:
+            if self.config["trace"]:
+                TRACER.stop()
+                TRACER.uninstrument(nodes)
+                TRACER.write(self.config["trace"])
+            if self.profiler is not None:
+                self.profiler.stop()
+                self.profiler.report(self.config["profile_report"])
+            for pipeline in pipelines:
+                pipeline.plan.rebind()
         # clean up nodes with threads
-        for node in self.pipeline.nodes:
-            if node.name.endswith(".live") or node.name.endswith(".recorded"):
+        for pipeline in pipelines:
+            for node in pipeline.plan.resource_nodes:
                 node.release_resources()
+        if self.node_loader is not None:
+            self.node_loader.release_models()
+
+    def get_node_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Retrieves the rolling statistics of every node, recorded when
+        ``profile`` is enabled in the runner config.
+
+        Returns:
+            (:obj:`Dict[str, Dict[str, Any]]`): The node name, number of
+            frames, total wall time, and p50, p95 and p99 of the wall time, CPU
+            time and memory allocated, of every node, keyed by its position and
+            name, e.g., ``"2:draw.bbox"``. Empty if the pipeline has not been
+            profiled.
+        """
+        if self.profiler is None:
+            return {}
+        return self.profiler.summary()
+
+    def _execute(self) -> None:
+        """Runs the pipelines with the executor chosen by the runner config."""
+        if self.pipelines:
+            MultiStreamExecutor(self.pipelines, self.config["stream_workers"]).run()
+        elif self.config["execution_mode"] == "pipelined":
+            PipelinedExecutor(
+                self.pipeline,
+                self.config["stage_queue_size"],
+                self.config["batch_size"],
+                self.config["batch_timeout"],
+                self.config["process_stages"],
+                self.config["shm_slots"],
+                self.config["stage_cpu_affinity"],
+            ).run()
+        elif self.config["execution_mode"] == "dag":
+            DAGExecutor(self.pipeline, self.config["dag_max_workers"]).run()
+        elif self.config["latency_budget"] > 0 or self.config["motion_gating"]:
+            LatencyBudgetExecutor(
+                self.pipeline,
+                self.config["latency_budget"],
+                self.config["skip_node_types"],
+                self.config["max_skipped_frames"],
+                "motion" if self.config["motion_gating"] else None,
+            ).run()
+        else:
+            self._run_sequential()
+
+    def _run_sequential(self) -> None:
+        """Runs every node on a frame before starting on the next frame,
+        following the execution plan compiled by the pipeline.
+        """
+        plan = self.pipeline.plan
+        pool = plan.new_pool(self.pipeline.data)
+        try:
+            while not self.pipeline.terminate:
+                if plan.run_frame(pool):
+                    self.pipeline.terminate = True
+        finally:
+            self.pipeline.data = plan.to_dict(pool)
+
+    def _get_file_streams(self, num_streams: int) -> List[Dict[str, Any]]:
+        """Creates the config changes of ``num_streams`` streams, each
+        processing a shard of the files read by ``input.recorded``. CSV files
+        written by ``output.csv_writer`` are split by input file so that the
+        streams do not write to the same file.
+        """
+        node_names = [
+            ".".join(node_str.split(".")[-2:])
+            for node_str, _ in self.node_loader.node_list  # type: ignore
+        ]
+        if "input.recorded" not in node_names:
+            raise ValueError("parallel_files requires the input.recorded node")
+        streams = []
+        for idx in range(num_streams):
+            stream: Dict[str, Any] = {
+                "input.recorded": {"num_shards": num_streams, "shard_index": idx}
+            }
+            if "output.csv_writer" in node_names:
+                stream["output.csv_writer"] = {"split_by_filename": True}
+            streams.append(stream)
+        return streams
 
     def get_run_config(self) -> NodeList:
         """Retrieves run configuration.
@@ -117,4 +255,110 @@ class Runner:
         Returns:
             (:obj:`Dict`): Run configurations being used by runner.
         """
-        return self.node_loader.node_list
+        return self.node_loader.node_list  # type: ignore
+
+    def _load_config(
+        self, config_updates: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Loads the default runner configuration and applies
+        ``config_updates`` to it.
+
+        Raises:
+            ValueError: A value of the runner configuration is invalid.
+        """
+        with open(RUNNER_CONFIG_PATH, encoding="utf-8") as infile:
+            config = yaml.safe_load(infile)
+        if config_updates:
+            for key, value in config_updates.items():
+                if key not in config:
+                    self.logger.warning(f"Runner config does not have the key: {key}")
+                else:
+                    config[key] = value
+                    self.logger.info(f"Runner config is updated to: '{key}': {value}")
+        for check in (
+            _check_config_values,
+            _check_pipelined_config,
+            _check_stream_config,
+            _check_latency_budget_config,
+            _check_thread_config,
+        ):
+            check(config)
+        return config
+
+    def _apply_thread_config(self) -> None:
+        """Sizes the thread pools and pins the process to its CPU cores, before
+        the nodes load their models.
+        """
+        THREAD_SETTINGS.apply(
+            self.config["intra_op_threads"],
+            self.config["inter_op_threads"],
+            self.config["opencv_threads"],
+        )
+        if self.config["cpu_affinity"]:
+            if pin_process(self.config["cpu_affinity"]):
+                self.logger.info(
+                    f"Pinned the process to CPU cores {self.config['cpu_affinity']}"
+                )
+
+
+def _check_config_values(config: Dict[str, Any]) -> None:
+    """Checks the execution mode and the numeric settings against
+    ``MIN_CONFIG_VALUES``.
+    """
+    if config["execution_mode"] not in EXECUTION_MODES:
+        raise ValueError(f"execution_mode must be one of {EXECUTION_MODES}")
+    for key, min_value in MIN_CONFIG_VALUES.items():
+        if config[key] < min_value:
+            if min_value == 0:
+                raise ValueError(f"{key} must not be negative")
+            raise ValueError(f"{key} must be at least {min_value}")
+
+
+def _check_pipelined_config(config: Dict[str, Any]) -> None:
+    """Checks the settings which only apply to the pipelined execution mode."""
+    if config["execution_mode"] == "pipelined":
+        return
+    for key in ("process_stages", "stage_cpu_affinity"):
+        if config[key]:
+            raise ValueError(f"{key} can only be used with pipelined execution_mode")
+
+
+def _check_stream_config(config: Dict[str, Any]) -> None:
+    """Checks that several streams, or files processed in parallel, run in
+    the sequential execution mode.
+    """
+    if config["streams"] and config["execution_mode"] != "sequential":
+        raise ValueError("streams can only be used with sequential execution_mode")
+    if config["parallel_files"] and (
+        config["streams"] or config["execution_mode"] != "sequential"
+    ):
+        raise ValueError(
+            "parallel_files can only be used with sequential execution_mode "
+            "and without streams"
+        )
+
+
+def _check_latency_budget_config(config: Dict[str, Any]) -> None:
+    """Checks that frame skipping is used on a single stream in the
+    sequential execution mode.
+    """
+    if (config["latency_budget"] > 0 or config["motion_gating"]) and (
+        config["execution_mode"] != "sequential"
+        or config["streams"]
+        or config["parallel_files"]
+    ):
+        raise ValueError(
+            "latency_budget and motion_gating can only be used with "
+            "sequential execution_mode and a single stream"
+        )
+
+
+def _check_thread_config(config: Dict[str, Any]) -> None:
+    """Checks the CPU cores of the runner config."""
+    check_cores(config["cpu_affinity"])
+    for cores in config["stage_cpu_affinity"].values():
+        check_cores(cores)
+        if config["cpu_affinity"] and not set(cores) <= set(config["cpu_affinity"]):
+            raise ValueError(
+                f"stage_cpu_affinity cores {cores} are not within cpu_affinity"
+            )
@@ -18,14 +18,21 @@ Utility functions for Tensorflow Graphed models
 
 import logging
 import os
-from typing import Callable, List
+from typing import Any, Callable, Dict, List
 
+import numpy as np
 import tensorflow as tf
 
+from peekingduck.utils.model_registry import MODEL_REGISTRY, model_key
+from peekingduck.utils.onnx_backend import load_onnx_graph
+from peekingduck.utils.tflite_backend import load_tflite_graph
+
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
+BACKENDS = ["tensorflow", "onnxruntime", "tflite"]
+
 
 def wrap_frozen_graph(
     graph_def: tf.compat.v1.GraphDef, inputs: List[str], outputs: List[str]
@@ -58,10 +65,117 @@ def wrap_frozen_graph(
     )
 
 
-def load_graph(file_path: str, inputs: List[str], outputs: List[str]) -> tf.function:
+def load_graph(  # pylint: disable=too-many-arguments
+    file_path: str,
+    inputs: List[str],
+    outputs: List[str],
+    backend: str = "tensorflow",
+    intra_op_threads: int = 0,
+    inter_op_threads: int = 0,
+) -> tf.function:
+    """
+    Loads the graph, or shares the graph already loaded from the same file with
+    the same inputs and outputs through the model registry. With the
+    "onnxruntime" backend, the ONNX model converted from the graph by
+    ``peekingduck convert-onnx`` is run with ONNX Runtime instead, and with the
+    "tflite" backend, the INT8 model quantized by ``peekingduck quantize`` is
+    run with TensorFlow Lite.
+
+    ``intra_op_threads`` and ``inter_op_threads`` size the thread pools of the
+    ONNX Runtime session, and ``intra_op_threads`` those of the TFLite
+    interpreter. TensorFlow has one set of thread pools for the whole process,
+    sized by the runner config, so they are not used by the "tensorflow"
+    backend.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}, got {backend}")
+    if backend == "onnxruntime":
+        return load_onnx_graph(
+            file_path, inputs, outputs, intra_op_threads, inter_op_threads
+        )
+    if backend == "tflite":
+        return load_tflite_graph(file_path, inputs, outputs, intra_op_threads)
+    return MODEL_REGISTRY.acquire(
+        model_key("frozen_graph", file_path, inputs, outputs),
+        lambda: _load_graph(file_path, inputs, outputs),
+    )
+
+
+def compare_backends(
+    file_path: str, inputs: List[str], outputs: List[str], sample_inputs: List[Any]
+) -> List[float]:
+    """
+    Runs the graph with every backend on ``sample_inputs``, and returns the
+    largest error between the TensorFlow and ONNX Runtime results of every
+    output. Errors are relative to 1 + the magnitude of the TensorFlow result,
+    i.e., absolute for small values and relative for large ones, such as
+    pixel coordinates.
+    """
+    expected = _load_graph(file_path, inputs, outputs)(
+        *[tf.convert_to_tensor(value) for value in sample_inputs]
+    )
+    actual = load_onnx_graph(file_path, inputs, outputs)(*sample_inputs)
+    errors = []
+    for tf_output, onnx_output in zip(expected, actual):
+        tf_values = tf_output.numpy().astype(np.float64)
+        difference = np.abs(tf_values - onnx_output.numpy()) / (1 + np.abs(tf_values))
+        errors.append(float(np.max(difference, initial=0.0)))
+    return errors
+
+
+def quantization_drift(
+    file_path: str,
+    inputs: List[str],
+    outputs: List[str],
+    sample_inputs: List[List[np.ndarray]],
+) -> List[Dict[str, float]]:
+    """
+    Runs the float graph and the INT8 model quantized from it on every sample
+    of ``sample_inputs``, and measures how far the INT8 results drift from the
+    float ones for every output: the mean and largest absolute error, and the
+    mean absolute error relative to the mean magnitude of the float results.
+    """
+    float_graph = _load_graph(file_path, inputs, outputs)
+    int8_graph = load_tflite_graph(file_path, inputs, outputs)
+    abs_errors: List[List[np.ndarray]] = [[] for _ in outputs]
+    magnitudes: List[List[np.ndarray]] = [[] for _ in outputs]
+    for sample in sample_inputs:
+        expected = float_graph(*[tf.convert_to_tensor(value) for value in sample])
+        actual = int8_graph(*sample)
+        for idx, (float_output, int8_output) in enumerate(zip(expected, actual)):
+            float_values = float_output.numpy().astype(np.float64).ravel()
+            abs_errors[idx].append(np.abs(float_values - int8_output.numpy().ravel()))
+            magnitudes[idx].append(np.abs(float_values))
+    return [
+        _summarize_drift(np.concatenate(errors), np.concatenate(values))
+        for errors, values in zip(abs_errors, magnitudes)
+    ]
+
+
+def _summarize_drift(error: np.ndarray, magnitude: np.ndarray) -> Dict[str, float]:
+    """
+    Summarizes the absolute errors of one output over all samples, given the
+    magnitudes of the float results.
+    """
+    return {
+        "mean_abs_error": float(error.mean()) if error.size else 0.0,
+        "max_abs_error": float(np.max(error, initial=0.0)),
+        "relative_error": float(error.sum() / max(magnitude.sum(), 1e-12)),
+    }
+
+
+def load_saved_model(model_dir: str, tags: List[str]) -> Any:
     """
-    Loads the graph
+    Loads a SavedModel, or shares the one already loaded from the same directory
+    through the model registry.
     """
+    return MODEL_REGISTRY.acquire(
+        model_key("saved_model", model_dir, tags),
+        lambda: tf.saved_model.load(model_dir, tags=tags),
+    )
+
+
+def _load_graph(file_path: str, inputs: List[str], outputs: List[str]) -> tf.function:
     with tf.io.gfile.GFile(file_path, "rb") as graph_file:
         graph_def = tf.compat.v1.GraphDef()
         graph_def.ParseFromString(graph_file.read())
@@ -0,0 +1,183 @@
+# Copyright 2021 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Process-wide registry of loaded models, so that nodes using the same weights
+share a single copy.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+
+class SharedModel:
+    """Handle to a model held by :class:`ModelRegistry`. Calls and attribute
+    lookups are forwarded to the model, so a handle can be used in place of
+    the model, e.g., a wrapped TensorFlow graph function.
+
+    TensorFlow functions and saved models can be called from several threads
+    at once, so calls through handles are not serialised. The handle releases
+    its reference when :meth:`release` is called or when it is garbage
+    collected, whichever comes first.
+
+    Args:
+        registry (:obj:`ModelRegistry`): Registry holding the model.
+        key (:obj:`Hashable`): Key of the model in the registry.
+        model (:obj:`Any`): The loaded model.
+    """
+
+    def __init__(self, registry: "ModelRegistry", key: Hashable, model: Any) -> None:
+        self._registry = registry
+        self._key = key
+        self._model = model
+        self._released = False
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self._model(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        # only called for attributes which are not found on the handle
+        if name.startswith("__") or name in (
+            "_model",
+            "_registry",
+            "_key",
+            "_released",
+        ):
+            raise AttributeError(name)
+        return getattr(self._model, name)
+
+    def __del__(self) -> None:
+        self.release()
+
+    @property
+    def key(self) -> Hashable:
+        """Key of the model in the registry."""
+        return self._key
+
+    def release(self) -> None:
+        """Releases the reference of this handle. The registry drops the model
+        once every handle to it has been released, although the model stays
+        usable through this handle.
+        """
+        if not getattr(self, "_released", True):
+            self._released = True
+            self._registry.release(self._key)
+
+
+class ModelRegistry:
+    """Loads every model once per process, keyed by its weights path, model
+    type and input signature, and counts the handles given out for it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._models: Dict[Hashable, Any] = {}
+        self._ref_counts: Dict[Hashable, int] = {}
+        self._local = threading.local()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._models
+
+    def acquire(self, key: Hashable, loader: Callable[[], Any]) -> SharedModel:
+        """Returns a handle to the model of ``key``, calling ``loader`` to
+        load it if it is not loaded yet.
+
+        Args:
+            key (:obj:`Hashable`): Key of the model, see :func:`model_key`.
+            loader (:obj:`Callable[[], Any]`): Loads the model.
+
+        Returns:
+            (:obj:`SharedModel`): A handle to the model.
+        """
+        with self._lock:
+            if key in self._models:
+                logger.info(f"Reusing loaded model: {key}")
+            else:
+                self._models[key] = loader()
+                self._ref_counts[key] = 0
+            self._ref_counts[key] += 1
+            handle = SharedModel(self, key, self._models[key])
+        for handles in getattr(self._local, "collectors", []):
+            handles.append(handle)
+        return handle
+
+    def release(self, key: Hashable) -> None:
+        """Releases one reference to the model of ``key``, and drops the model
+        when no reference is left.
+        """
+        with self._lock:
+            if key not in self._ref_counts:
+                return
+            self._ref_counts[key] -= 1
+            if self._ref_counts[key] <= 0:
+                del self._ref_counts[key]
+                del self._models[key]
+
+    def ref_count(self, key: Hashable) -> int:
+        """Number of handles to the model of ``key`` which are not released."""
+        with self._lock:
+            return self._ref_counts.get(key, 0)
+
+    @contextmanager
+    def collect(self) -> Iterator[List[SharedModel]]:
+        """Collects the handles acquired by the current thread within the
+        context, e.g., while a pipeline is being built, so that they can be
+        released when it is torn down.
+        """
+        handles: List[SharedModel] = []
+        if not hasattr(self._local, "collectors"):
+            self._local.collectors = []
+        self._local.collectors.append(handles)
+        try:
+            yield handles
+        finally:
+            self._local.collectors.remove(handles)
+
+
+def model_key(model_type: str, weights_path: str, *signature: Any) -> Tuple:
+    """Key of a model in :data:`MODEL_REGISTRY`.
+
+    Args:
+        model_type (:obj:`str`): How the model is loaded, e.g.,
+            ``"frozen_graph"``.
+        weights_path (:obj:`str`): Path of the weights.
+        signature (:obj:`Any`): Anything else the loaded model depends on,
+            e.g., the names of its input and output nodes.
+
+    Returns:
+        (:obj:`Tuple`): A hashable key.
+    """
+    return (
+        model_type,
+        str(Path(weights_path).resolve()),
+        tuple(_freeze(part) for part in signature),
+    )
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+MODEL_REGISTRY = ModelRegistry()
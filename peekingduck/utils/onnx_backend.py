@@ -0,0 +1,242 @@
+# Copyright 2021 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+ONNX Runtime backend for the frozen graph models, and conversion of their
+frozen graphs to ONNX.
+"""
+
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import tensorflow as tf
+
+from peekingduck.utils.model_registry import MODEL_REGISTRY, model_key
+from peekingduck.utils.requirement_checker import RequirementChecker, check_requirements
+from peekingduck.utils.thread_settings import THREAD_SETTINGS
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+# identifier of onnxruntime and tf2onnx in optional_requirements.txt
+ONNX_IDENTIFIER = "utils.onnx_backend"
+DEFAULT_OPSET = 13
+ONNX_DTYPES = {
+    "tensor(float)": np.float32,
+    "tensor(double)": np.float64,
+    "tensor(int32)": np.int32,
+    "tensor(int64)": np.int64,
+    "tensor(uint8)": np.uint8,
+}
+
+
+class OnnxGraph:  # pylint: disable=too-few-public-methods
+    """Runs an ONNX model with ONNX Runtime, called in the same way as the
+    function returned by
+    :func:`load_graph <peekingduck.utils.graph_functions.load_graph>`, so that
+    the pre- and postprocessing of the models is unchanged. Outputs are
+    returned as a list of tensors in the order of ``outputs``.
+
+    ``InferenceSession.run`` can be called from several threads at once.
+
+    Args:
+        session (:obj:`onnxruntime.InferenceSession`): Session of the model.
+        inputs (:obj:`List[str]`): Names of the input nodes, e.g., ``x:0``.
+        outputs (:obj:`List[str]`): Names of the output nodes.
+    """
+
+    def __init__(self, session: Any, inputs: List[str], outputs: List[str]) -> None:
+        self.session = session
+        self.inputs = inputs
+        self.outputs = outputs
+        input_types = {node.name: node.type for node in session.get_inputs()}
+        self.input_dtypes = [ONNX_DTYPES.get(input_types[name]) for name in inputs]
+
+    def __call__(self, *args: Any, **kwargs: Any) -> List[tf.Tensor]:
+        feeds = {
+            name: np.asarray(value, dtype=dtype)
+            for name, value, dtype in zip(
+                self.inputs, bind_inputs(self.inputs, args, kwargs), self.input_dtypes
+            )
+        }
+        return [
+            tf.convert_to_tensor(output)
+            for output in self.session.run(self.outputs, feeds)
+        ]
+
+
+def bind_inputs(inputs: List[str], args: Any, kwargs: Dict[str, Any]) -> List[Any]:
+    """Orders the values passed to a graph positionally, or by the names of
+    the input nodes without the output index, e.g., ``x`` for ``x:0``, as
+    with the function returned by ``load_graph``.
+    """
+    return list(args) + [kwargs[name.split(":")[0]] for name in inputs[len(args) :]]
+
+
+def onnx_path(graph_path: str) -> Path:
+    """Path of the ONNX model converted from the frozen graph at
+    ``graph_path``, next to it.
+    """
+    return Path(graph_path).with_suffix(".onnx")
+
+
+def load_onnx_graph(
+    graph_path: str,
+    inputs: List[str],
+    outputs: List[str],
+    intra_op_threads: int = 0,
+    inter_op_threads: int = 0,
+) -> Any:
+    """Loads the ONNX model converted from the frozen graph at ``graph_path``,
+    or shares the one already loaded with the same thread counts through the
+    model registry. Thread counts of 0 fall back to those of the runner
+    config, or else to the defaults of ONNX Runtime.
+
+    Raises:
+        ValueError: The frozen graph has not been converted to ONNX.
+    """
+    model_path = onnx_path(graph_path)
+    if not model_path.is_file():
+        raise ValueError(
+            f"ONNX model does not exist. Please check that {model_path} exists, "
+            "or create it with `peekingduck convert-onnx`."
+        )
+    require_onnx()
+    threads = THREAD_SETTINGS.session_threads(intra_op_threads, inter_op_threads)
+    return MODEL_REGISTRY.acquire(
+        model_key("onnx", str(model_path), inputs, outputs, threads),
+        lambda: OnnxGraph(_create_session(model_path, *threads), inputs, outputs),
+    )
+
+
+def convert_graph(
+    graph_path: str,
+    inputs: List[str],
+    outputs: List[str],
+    opset: int = DEFAULT_OPSET,
+) -> Path:
+    """Converts the frozen graph at ``graph_path`` to an ONNX model next to it.
+
+    Args:
+        graph_path (:obj:`str`): Path of the frozen graph.
+        inputs (:obj:`List[str]`): Names of the input nodes.
+        outputs (:obj:`List[str]`): Names of the output nodes.
+        opset (:obj:`int`): ONNX opset of the converted model.
+
+    Returns:
+        (:obj:`pathlib.Path`): Path of the ONNX model.
+    """
+    require_onnx()
+    import tf2onnx  # pylint: disable=import-outside-toplevel
+
+    with tf.io.gfile.GFile(graph_path, "rb") as graph_file:
+        graph_def = tf.compat.v1.GraphDef()
+        graph_def.ParseFromString(graph_file.read())
+    model_path = onnx_path(graph_path)
+    tf2onnx.convert.from_graph_def(
+        graph_def,
+        input_names=inputs,
+        output_names=outputs,
+        opset=opset,
+        output_path=str(model_path),
+    )
+    logger.info(f"Converted {graph_path} to {model_path}")
+    return model_path
+
+
+def require_onnx() -> None:
+    """Checks that onnxruntime and tf2onnx are installed, and attempts to
+    install them if not, as for the optional requirements of nodes.
+    """
+    RequirementChecker.n_update += check_requirements(ONNX_IDENTIFIER)
+
+
+def optimized_onnx_path(model_path: Path, version: str) -> Path:
+    """Path of the ONNX model with the graph optimisations of ONNX Runtime
+    ``version`` applied, cached next to the model at ``model_path``.
+    """
+    return model_path.with_name(f"{model_path.stem}.ort-{version}.optimized.onnx")
+
+
+def _create_session(
+    model_path: Path, intra_op_threads: int = 0, inter_op_threads: int = 0
+) -> Any:
+    """Creates a session from the optimised model cached next to the model,
+    caching it first if needed, so that the graph is not fused again every
+    time a pipeline starts. The cached model has the hardware independent
+    optimisations applied, and the layout optimisations for the CPU are
+    applied when the session is created.
+    """
+    import onnxruntime  # pylint: disable=import-outside-toplevel
+
+    cache_path = optimized_onnx_path(model_path, onnxruntime.__version__)
+    if not _is_cached(cache_path, model_path) and os.access(model_path.parent, os.W_OK):
+        _cache_optimized_model(model_path, cache_path)
+    options = onnxruntime.SessionOptions()
+    options.intra_op_num_threads = intra_op_threads
+    options.inter_op_num_threads = inter_op_threads
+    if _is_cached(cache_path, model_path):
+        try:
+            return onnxruntime.InferenceSession(
+                str(cache_path), options, providers=["CPUExecutionProvider"]
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            logger.warning(
+                f"Cached ONNX model {cache_path} could not be loaded due to "
+                f"{repr(error)}, loading {model_path} instead"
+            )
+    return onnxruntime.InferenceSession(
+        str(model_path), options, providers=["CPUExecutionProvider"]
+    )
+
+
+def _cache_optimized_model(model_path: Path, cache_path: Path) -> None:
+    """Writes the optimised model to a temporary file which then replaces
+    ``cache_path``, so that pipelines starting at the same time never load a
+    partly written model.
+    """
+    import onnxruntime  # pylint: disable=import-outside-toplevel
+
+    # ONNX Runtime picks the format of the optimised model from its extension
+    file_desc, temp_path = tempfile.mkstemp(
+        suffix=".onnx", prefix=f".{cache_path.stem}.", dir=cache_path.parent
+    )
+    os.close(file_desc)
+    try:
+        cache_options = onnxruntime.SessionOptions()
+        cache_options.graph_optimization_level = (
+            onnxruntime.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+        )
+        cache_options.optimized_model_filepath = temp_path
+        onnxruntime.InferenceSession(
+            str(model_path), cache_options, providers=["CPUExecutionProvider"]
+        )
+        os.replace(temp_path, cache_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    logger.info(f"Cached the optimised ONNX model at {cache_path}")
+
+
+def _is_cached(cache_path: Path, model_path: Path) -> bool:
+    """Checks that the cached model is newer than the model, e.g., not left
+    over from before the model was converted again.
+    """
+    return (
+        cache_path.is_file()
+        and cache_path.stat().st_mtime >= model_path.stat().st_mtime
+    )
@@ -16,6 +16,7 @@
 
 import collections
 import importlib
+import importlib.abc
 import logging
 import subprocess
 import sys
@@ -0,0 +1,173 @@
+# Copyright 2021 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+TensorFlow Lite backend for the frozen graph models, and their INT8
+quantization.
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Iterable, List
+
+import numpy as np
+import tensorflow as tf
+
+from peekingduck.utils.model_registry import MODEL_REGISTRY, model_key
+from peekingduck.utils.onnx_backend import bind_inputs
+from peekingduck.utils.thread_settings import THREAD_SETTINGS
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+INT8_SUFFIX = ".int8.tflite"
+
+
+class TFLiteGraph:  # pylint: disable=too-few-public-methods
+    """Runs a TensorFlow Lite model, called in the same way as the function
+    returned by :func:`load_graph <peekingduck.utils.graph_functions.load_graph>`,
+    so that the pre- and postprocessing of the models is unchanged. Outputs
+    are returned as a list of tensors in the order of ``outputs``.
+
+    The quantized models keep float inputs and outputs, and take a batch of
+    one, as they were calibrated with, so a batch is run one frame at a time.
+    An interpreter cannot be called from several threads at once, so calls
+    are serialised.
+
+    Args:
+        interpreter (:obj:`tf.lite.Interpreter`): Interpreter of the model.
+        inputs (:obj:`List[str]`): Names of the input nodes, e.g., ``x:0``.
+        outputs (:obj:`List[str]`): Names of the output nodes.
+    """
+
+    def __init__(self, interpreter: Any, inputs: List[str], outputs: List[str]) -> None:
+        interpreter.allocate_tensors()
+        self.interpreter = interpreter
+        self.inputs = inputs
+        input_details = {
+            detail["name"]: detail for detail in interpreter.get_input_details()
+        }
+        output_details = {
+            detail["name"]: detail for detail in interpreter.get_output_details()
+        }
+        self.input_details = [input_details[_array_name(name)] for name in inputs]
+        self.output_indices = [
+            output_details[_array_name(name)]["index"] for name in outputs
+        ]
+        self.lock = threading.Lock()
+
+    def __call__(self, *args: Any, **kwargs: Any) -> List[tf.Tensor]:
+        values = [
+            np.asarray(value, dtype=detail["dtype"])
+            for value, detail in zip(
+                bind_inputs(self.inputs, args, kwargs), self.input_details
+            )
+        ]
+        batches: List[List[np.ndarray]] = [[] for _ in self.output_indices]
+        with self.lock:
+            for idx in range(len(values[0])):
+                for value, detail in zip(values, self.input_details):
+                    self.interpreter.set_tensor(detail["index"], value[idx : idx + 1])
+                self.interpreter.invoke()
+                for batch, index in zip(batches, self.output_indices):
+                    batch.append(self.interpreter.get_tensor(index))
+        return [tf.convert_to_tensor(np.concatenate(batch)) for batch in batches]
+
+
+def tflite_path(graph_path: str) -> Path:
+    """Path of the INT8 model quantized from the frozen graph at
+    ``graph_path``, next to it.
+    """
+    path = Path(graph_path)
+    return path.with_name(path.stem + INT8_SUFFIX)
+
+
+def load_tflite_graph(
+    graph_path: str, inputs: List[str], outputs: List[str], num_threads: int = 0
+) -> Any:
+    """Loads the INT8 model quantized from the frozen graph at ``graph_path``,
+    or shares the one already loaded with the same thread count through the
+    model registry. A thread count of 0 falls back to the intra-op thread
+    count of the runner config, or else to the default of TensorFlow Lite.
+
+    Raises:
+        ValueError: The frozen graph has not been quantized.
+    """
+    model_path = tflite_path(graph_path)
+    if not model_path.is_file():
+        raise ValueError(
+            f"TFLite model does not exist. Please check that {model_path} exists, "
+            "or create it with `peekingduck quantize`."
+        )
+    num_threads = THREAD_SETTINGS.session_threads(num_threads, 0)[0]
+    return MODEL_REGISTRY.acquire(
+        model_key("tflite", str(model_path), inputs, outputs, num_threads),
+        lambda: TFLiteGraph(
+            tf.lite.Interpreter(
+                model_path=str(model_path), num_threads=num_threads or None
+            ),
+            inputs,
+            outputs,
+        ),
+    )
+
+
+def quantize_graph(
+    graph_path: str,
+    inputs: List[str],
+    outputs: List[str],
+    calibration_inputs: Iterable[List[np.ndarray]],
+) -> Path:
+    """Quantizes the weights and activations of the frozen graph at
+    ``graph_path`` to INT8, writing a TFLite model next to it. Operations
+    without an INT8 kernel are kept in float.
+
+    Args:
+        graph_path (:obj:`str`): Path of the frozen graph.
+        inputs (:obj:`List[str]`): Names of the input nodes.
+        outputs (:obj:`List[str]`): Names of the output nodes.
+        calibration_inputs (:obj:`Iterable[List[np.ndarray]]`): Representative
+            inputs of the graph, a batch of one for every input node, from
+            which the ranges of the activations are calibrated.
+
+    Returns:
+        (:obj:`pathlib.Path`): Path of the TFLite model.
+    """
+    calibration_inputs = list(calibration_inputs)
+    converter = tf.compat.v1.lite.TFLiteConverter.from_frozen_graph(
+        graph_path,
+        input_arrays=[_array_name(name) for name in inputs],
+        output_arrays=[_array_name(name) for name in outputs],
+        input_shapes={
+            _array_name(name): list(np.shape(value))
+            for name, value in zip(inputs, calibration_inputs[0])
+        },
+    )
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = lambda: (
+        [np.asarray(value, dtype=np.float32) for value in sample]
+        for sample in calibration_inputs
+    )
+    model_path = tflite_path(graph_path)
+    model_path.write_bytes(converter.convert())
+    logger.info(
+        f"Quantized {graph_path} to {model_path} with "
+        f"{len(calibration_inputs)} calibration inputs"
+    )
+    return model_path
+
+
+def _array_name(name: str) -> str:
+    """Name of the tensor without the output index, e.g., ``x`` for ``x:0``."""
+    return name.split(":")[0]
@@ -0,0 +1,148 @@
+# Copyright 2021 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Sizes of the thread pools of TensorFlow, OpenCV and the model backends, and
+pinning of the process and its threads to a set of CPU cores.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import List, Tuple
+
+import cv2
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+
+class ThreadSettings:
+    """Thread counts of the process. TensorFlow has a single pair of thread
+    pools per process, which has to be sized before its runtime is
+    initialised, i.e., before the first model is loaded. ONNX Runtime
+    sessions and TFLite interpreters have their own pools, sized by the node
+    config or else by the thread counts of the process.
+    """
+
+    def __init__(self) -> None:
+        self.intra_op_threads = 0
+        self.inter_op_threads = 0
+
+    def apply(
+        self, intra_op_threads: int, inter_op_threads: int, opencv_threads: int
+    ) -> None:
+        """Sizes the thread pools of TensorFlow and OpenCV.
+
+        Args:
+            intra_op_threads (:obj:`int`): Threads used within an op, e.g., a
+                convolution, or 0 for the default of the library.
+            inter_op_threads (:obj:`int`): Threads used to run independent ops
+                at the same time, or 0 for the default of the library.
+            opencv_threads (:obj:`int`): Threads used by OpenCV functions, 0
+                to run them on the calling thread, or -1 to keep the default.
+        """
+        self.intra_op_threads = intra_op_threads
+        self.inter_op_threads = inter_op_threads
+        if intra_op_threads or inter_op_threads:
+            _set_tensorflow_threads(intra_op_threads, inter_op_threads)
+        if opencv_threads >= 0:
+            cv2.setNumThreads(opencv_threads)
+
+    def session_threads(
+        self, intra_op_threads: int, inter_op_threads: int
+    ) -> Tuple[int, int]:
+        """Thread counts of a session of a node, falling back to those of the
+        process where the node config has 0.
+        """
+        return (
+            intra_op_threads or self.intra_op_threads,
+            inter_op_threads or self.inter_op_threads,
+        )
+
+
+def available_cores() -> List[int]:
+    """CPU cores which the calling thread may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def check_cores(cores: List[int]) -> None:
+    """Checks that ``cores`` can be used for pinning.
+
+    Raises:
+        ValueError: ``cores`` has items which are not available to the
+            process.
+    """
+    unavailable = sorted(set(cores) - set(available_cores()))
+    if unavailable:
+        raise ValueError(
+            f"CPU cores {unavailable} are not available, the process may run "
+            f"on {available_cores()}"
+        )
+
+
+def pin_process(cores: List[int]) -> bool:
+    """Pins every thread of the process to ``cores``, including thread pools
+    which are already running, e.g., those of TensorFlow. Threads started
+    later inherit the cores of the thread starting them.
+
+    Returns:
+        (:obj:`bool`): False if pinning is not supported on the platform.
+    """
+    task_dir = Path("/proc/self/task")
+    if not hasattr(os, "sched_setaffinity") or not task_dir.is_dir():
+        logger.warning("Pinning to CPU cores is only supported on Linux.")
+        return False
+    for task in task_dir.iterdir():
+        try:
+            os.sched_setaffinity(int(task.name), cores)
+        except ProcessLookupError:  # the thread has ended
+            pass
+    return True
+
+
+def pin_thread(cores: List[int], pid: int = 0) -> bool:
+    """Pins the calling thread, or the process of ``pid``, to ``cores``.
+
+    Returns:
+        (:obj:`bool`): False if pinning is not supported on the platform.
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        logger.warning("Pinning to CPU cores is only supported on Linux.")
+        return False
+    os.sched_setaffinity(pid, cores)
+    return True
+
+
+def _set_tensorflow_threads(intra_op_threads: int, inter_op_threads: int) -> None:
+    import tensorflow as tf  # pylint: disable=import-outside-toplevel
+
+    try:
+        if intra_op_threads:
+            tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+        if inter_op_threads:
+            tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+    except RuntimeError:
+        logger.warning(
+            "TensorFlow has already been initialised, so its thread pools keep "
+            f"{tf.config.threading.get_intra_op_parallelism_threads()} intra-op "
+            f"and {tf.config.threading.get_inter_op_parallelism_threads()} "
+            "inter-op threads. Set intra_op_threads and inter_op_threads in the "
+            "runner config before any model is loaded."
+        )
+
+
+THREAD_SETTINGS = ThreadSettings()
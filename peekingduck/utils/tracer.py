@@ -0,0 +1,205 @@
+# Copyright 2021 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Records spans of work, e.g., reading a frame or running a model, and writes
+them in the Chrome trace event format, which can be opened in
+chrome://tracing or https://ui.perfetto.dev.
+
+Spans are recorded with::
+
+    from peekingduck.utils.tracer import span
+
+    with span("preprocess", "model"):
+        ...
+
+which costs a single function call while tracing is disabled.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from peekingduck.pipeline.nodes.node import AbstractNode
+
+
+class _NullSpan:
+    """Span returned while tracing is disabled."""
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+class _Span:
+    """A span which is added to ``tracer`` when it exits."""
+
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(
+        self, tracer: "Tracer", name: str, category: str, args: Dict[str, Any]
+    ) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.tracer.add_event(
+            self.name, self.category, self.start, time.perf_counter(), self.args
+        )
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Collects spans from every thread of the process. Each thread appears on
+    its own track, named after the thread, e.g., the ``VideoThread`` reader or
+    the threads of the pipelined and DAG executors.
+    """
+
+    def __init__(self) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.enabled = False
+        self.events: List[Dict[str, Any]] = []
+        self._thread_names: Dict[int, str] = {}
+        self._origin = 0.0
+
+    def start(self) -> None:
+        """Discards any recorded spans and starts recording."""
+        self.events = []
+        self._thread_names = {}
+        self._origin = time.perf_counter()
+        self.enabled = True
+
+    def stop(self) -> None:
+        """Stops recording spans."""
+        self.enabled = False
+
+    def span(self, name: str, category: str = "", **args: Any) -> Any:
+        """Creates a context manager which records the time spent in it.
+
+        Args:
+            name (:obj:`str`): Name of the span, e.g., ``"preprocess"``.
+            category (:obj:`str`): Category of the span, e.g., ``"model"``.
+            **args (:obj:`Any`): Values shown with the span in the viewer.
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name, category, args)
+
+    def add_event(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        end: float,
+        args: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Adds a complete event with ``start`` and ``end`` times taken from
+        ``time.perf_counter()``.
+        """
+        thread_id = threading.get_ident()
+        if thread_id not in self._thread_names:
+            self._thread_names[thread_id] = threading.current_thread().name
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start - self._origin) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": os.getpid(),
+            "tid": thread_id,
+        }
+        if args:
+            event["args"] = args
+        # list.append() is atomic so no lock is needed across threads
+        self.events.append(event)
+
+    def instrument(self, nodes: List[AbstractNode]) -> None:
+        """Wraps the ``run`` and ``run_batch`` methods of ``nodes`` so that
+        every call is recorded as a span named after the node. Nodes run in
+        worker processes through ``process_stages`` are not recorded.
+        """
+        for node in {id(node): node for node in nodes}.values():
+            category = node.node_name.split(".")[0]
+            node.run = self._wrap(node.run, node.node_name, category)  # type: ignore
+            if type(node).run_batch is not AbstractNode.run_batch:
+                node.run_batch = self._wrap(  # type: ignore
+                    node.run_batch, node.node_name, category, batched=True
+                )
+
+    @staticmethod
+    def uninstrument(nodes: List[AbstractNode]) -> None:
+        """Restores the methods wrapped by :meth:`instrument`."""
+        for node in nodes:
+            node.__dict__.pop("run", None)
+            node.__dict__.pop("run_batch", None)
+
+    def write(self, path: str) -> None:
+        """Writes the recorded spans to ``path`` as a Chrome trace JSON file."""
+        pid = os.getpid()
+        metadata = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": thread_id,
+                "args": {"name": thread_name},
+            }
+            for thread_id, thread_name in self._thread_names.items()
+        ]
+        metadata.append(
+            {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "pkd"}}
+        )
+        trace_path = Path(path)
+        trace_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(trace_path, "w", encoding="utf-8") as outfile:
+            json.dump(
+                {"traceEvents": metadata + self.events, "displayTimeUnit": "ms"},
+                outfile,
+            )
+        self.logger.info(f"{len(self.events)} trace events written to {trace_path}")
+
+    def _wrap(
+        self, method: Callable, name: str, category: str, batched: bool = False
+    ) -> Callable:
+        def traced(inputs: Any) -> Any:
+            if batched:
+                args = {"batch_size": len(inputs)}
+                with self.span(name, category, **args):
+                    return method(inputs)
+            with self.span(name, category):
+                return method(inputs)
+
+        return traced
+
+
+TRACER = Tracer()
+
+
+def span(name: str, category: str = "", **args: Any) -> Any:
+    """Records a span with the process-wide tracer, see :meth:`Tracer.span`."""
+    return TRACER.span(name, category, **args)
@@ -0,0 +1,105 @@
+# Copyright 2021 AI Singapore
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Warmup of the model nodes at construction, so that the first frame of a stream
+does not pay for graph optimisation and memory allocation.
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+# size of the dummy frames for nodes without an input resolution in their
+# config, that of a 720p stream
+WARMUP_FRAME_SIZE = (720, 1280, 3)
+
+
+def warm_up(
+    predict: Callable[[np.ndarray], Any],
+    num_passes: int,
+    node_name: str,
+    frame_size: Tuple[int, int, int] = WARMUP_FRAME_SIZE,
+) -> float:
+    """Runs ``predict`` of a model on ``num_passes`` dummy frames of random
+    noise, going through the same pre- and postprocessing and graph input
+    shapes as the frames of a stream.
+
+    Args:
+        predict (:obj:`Callable[[np.ndarray], Any]`): Runs the model on a
+            frame.
+        num_passes (:obj:`int`): Number of dummy frames, or 0 to skip warmup.
+        node_name (:obj:`str`): Name of the node, for the log message.
+        frame_size (:obj:`Tuple[int, int, int]`): Height, width and channels
+            of the dummy frames.
+
+    Returns:
+        (:obj:`float`): Time taken by the warmup, in seconds.
+    """
+    if num_passes <= 0:
+        return 0.0
+    frame = np.random.RandomState(0).randint(0, 256, frame_size, dtype=np.uint8)
+    start = time.perf_counter()
+    for _ in range(num_passes):
+        # nodes may draw on or resize the frame in place
+        predict(frame.copy())
+    duration = time.perf_counter() - start
+    logger.info(f"Warmed up {node_name} with {num_passes} pass(es) in {duration:.2f}s")
+    return duration
+
+
+class WarmupMixin:  # pylint: disable=too-few-public-methods
+    """Warms up the model of a model node with the ``warmup_passes`` of its
+    config, and keeps the time taken in ``warmup_duration``.
+
+    Model nodes call :meth:`_warm_up` once their model is loaded. The dummy
+    frames are passed to ``model.predict``, and nodes whose model takes other
+    inputs override :meth:`_predict_warmup_frame`. They are the size of the
+    input resolution of the model, the ``resolution`` or ``size`` of the
+    config, where the node has one, so that the warmup goes through the graph
+    input shapes of the stream, and that of a 720p stream otherwise.
+    """
+
+    config: Dict[str, Any]
+    model: Any
+    node_name: str
+    warmup_duration = 0.0
+
+    def _warm_up(self) -> None:
+        self.warmup_duration = warm_up(
+            self._predict_warmup_frame,
+            self.config["warmup_passes"],
+            self.node_name,
+            self._warmup_frame_size(),
+        )
+
+    def _warmup_frame_size(self) -> Tuple[int, int, int]:
+        resolution = self.config.get("resolution")
+        if isinstance(resolution, dict):
+            return resolution["height"], resolution["width"], 3
+        size = self.config.get("size")
+        if isinstance(size, list):
+            # one size per model type, e.g., EfficientDet D0-D4
+            size = size[self.config["model_type"]]
+        if isinstance(size, int):
+            return size, size, 3
+        return WARMUP_FRAME_SIZE
+
+    def _predict_warmup_frame(self, frame: np.ndarray) -> Any:
+        return self.model.predict(frame)
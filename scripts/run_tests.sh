@@ -7,7 +7,7 @@
 
 test_dir=$PWD/peekingduck
 selectedTest="$1"
-allowedExt=(all unit mlmodel module)
+allowedExt=(all unit mlmodel module benchmark)
 
 
 show_coverage(){
@@ -48,7 +48,7 @@ echo "Running $selectedTest tests in $test_dir"
 
 case $selectedTest in 
     "all")
-        run_test "" true
+        run_test "not benchmark" true
         ;;
     "module")
         run_test "module" false
@@ -57,7 +57,10 @@ case $selectedTest in
         run_test "mlmodel" false
         ;;
     "unit")
-        run_test "not mlmodel and not module" false
+        run_test "not mlmodel and not module and not benchmark" false
+        ;;
+    "benchmark")
+        run_test "benchmark" false
         ;;
     *)
         echo "'$1' is an illegal argument, choose from: " "${allowedExt[@]}"
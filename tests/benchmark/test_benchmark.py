@@ -0,0 +1,206 @@
+"""
+Copyright 2021 AI Singapore
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+     https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import cv2
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from peekingduck.benchmark import (
+    load_frames,
+    run_benchmark,
+    sweep_threads,
+    synthetic_frames,
+    thread_candidates,
+)
+from peekingduck.cli import cli
+
+NODES = {"nodes": ["input.live", "dabble.fps", "output.screen"]}
+NUM_FRAMES = 20
+
+
+@pytest.fixture
+def run_config_path():
+    path = Path("run_config.yml")
+    with open(path, "w") as outfile:
+        yaml.dump(NODES, outfile)
+    return path
+
+
+@pytest.mark.usefixtures("tmp_dir")
+class TestBenchmark:
+    def test_synthetic_frames(self):
+        frames = synthetic_frames(64, 48)
+
+        assert frames[0].shape == (48, 64, 3)
+        assert (frames[0] != frames[1]).any()
+
+    def test_load_frames_of_directory(self, create_image):
+        image_dir = Path("images")
+        image_dir.mkdir()
+        for idx in range(3):
+            cv2.imwrite(str(image_dir / f"{idx}.png"), create_image((24, 32, 3)))
+        (image_dir / "notes.txt").touch()
+
+        assert len(load_frames(image_dir, 10)) == 3
+        assert len(load_frames(image_dir, 2)) == 2
+
+    def test_load_frames_of_video(self, create_input_video):
+        create_input_video("video.avi", 10, (24, 32, 3), 5)
+
+        assert len(load_frames(Path("video.avi"), 3)) == 3
+
+    def test_load_frames_invalid(self):
+        with pytest.raises(ValueError):
+            load_frames(Path("missing.mp4"), 10)
+
+    def test_run_benchmark(self, run_config_path):
+        results = run_benchmark(
+            run_config_path,
+            "None",
+            "src",
+            synthetic_frames(64, 48),
+            NUM_FRAMES,
+            5,
+        )
+
+        assert results["num_frames"] == NUM_FRAMES
+        assert results["throughput_fps"] > 0
+        assert set(results["latency_ms"]) == {"p50", "p95", "p99", "mean"}
+        assert set(results["nodes"]) == {
+            "0:input.benchmark_source",
+            "1:dabble.fps",
+            "2:output.null_sink",
+        }
+        # the warmup frames are not measured, the source is also called at the end
+        assert results["nodes"]["1:dabble.fps"]["num_frames"] == NUM_FRAMES + 1
+        assert results["nodes"]["2:output.null_sink"]["num_frames"] == NUM_FRAMES
+        assert "peak_rss_growth_mb" in results["nodes"]["1:dabble.fps"]
+        assert results["model_warmup_s"] == {}
+
+    def test_run_benchmark_pipelined(self, run_config_path):
+        results = run_benchmark(
+            run_config_path,
+            "None",
+            "src",
+            synthetic_frames(64, 48),
+            NUM_FRAMES,
+            0,
+            runner_config={"execution_mode": "pipelined"},
+        )
+
+        assert results["num_frames"] == NUM_FRAMES
+        assert results["runner_config"]["execution_mode"] == "pipelined"
+
+    def test_run_benchmark_without_input_node(self):
+        path = Path("run_config.yml")
+        with open(path, "w") as outfile:
+            yaml.dump({"nodes": ["dabble.fps"]}, outfile)
+
+        with pytest.raises(ValueError, match="no input node"):
+            run_benchmark(path, "None", "src", synthetic_frames(8, 8), 1, 0)
+
+    def test_thread_candidates(self):
+        candidates = thread_candidates(8, 1)
+
+        assert sorted({c["intra_op_threads"] for c in candidates}) == [1, 2, 4, 8]
+        assert sorted({c["inter_op_threads"] for c in candidates}) == [1, 2]
+        assert not any(candidate["pinned"] for candidate in candidates)
+        assert max(c["intra_op_threads"] for c in thread_candidates(8, 3)) == 2
+
+    def test_sweep_threads(self, run_config_path, monkeypatch):
+        # as left by DeclarativeLoader when given a pathlib.Path
+        monkeypatch.setattr(sys, "path", sys.path + [Path("src")])
+        candidates = [
+            {
+                "intra_op_threads": 1,
+                "inter_op_threads": 1,
+                "opencv_threads": 1,
+                "pinned": True,
+            }
+        ]
+        results = sweep_threads(
+            run_config_path,
+            "None",
+            "src",
+            synthetic_frames(64, 48),
+            NUM_FRAMES,
+            2,
+            num_pipelines=2,
+            candidates=candidates,
+        )
+
+        assert len(results["results"]) == 1
+        assert results["results"][0]["throughput_fps"] > 0
+        assert len(results["results"][0]["pipeline_throughput_fps"]) == 2
+        assert results["recommended"]["settings"] == candidates[0]
+        runner_configs = results["recommended"]["runner_configs"]
+        assert len(runner_configs) == 2
+        assert all(len(config["cpu_affinity"]) >= 1 for config in runner_configs)
+
+    def test_sweep_threads_error(self, run_config_path):
+        candidates = [
+            {"intra_op_threads": -1, "inter_op_threads": 1, "opencv_threads": 1}
+        ]
+        with pytest.raises(ValueError, match="Benchmark failed"):
+            sweep_threads(
+                run_config_path,
+                "None",
+                "src",
+                synthetic_frames(8, 8),
+                1,
+                0,
+                candidates=candidates,
+            )
+
+    def test_cli(self, run_config_path):
+        result = CliRunner().invoke(
+            cli,
+            [
+                "benchmark",
+                "--num_frames",
+                str(NUM_FRAMES),
+                "--warmup_frames",
+                "2",
+                "--resolution",
+                "64x48",
+                "--output",
+                "results/benchmark.json",
+            ],
+        )
+
+        assert result.exit_code == 0
+        with open("results/benchmark.json") as infile:
+            report = json.load(infile)
+        assert report["num_frames"] == NUM_FRAMES
+        assert report["workload"]["resolutions"] == [[64, 48]]
+        assert "environment" in report
+
+    def test_cli_invalid_resolution(self, run_config_path):
+        result = CliRunner().invoke(cli, ["benchmark", "--resolution", "640"])
+
+        assert result.exit_code != 0
+        assert "WIDTHxHEIGHT" in result.output
+
+    def test_cli_tune_threads_invalid_resolution(self, run_config_path):
+        result = CliRunner().invoke(cli, ["tune-threads", "--resolution", "640"])
+
+        assert result.exit_code != 0
+        assert "WIDTHxHEIGHT" in result.output
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import io
+import json
 import math
 import os
 import random
@@ -236,6 +237,16 @@ class TestCli:
             assert captured.records[2].getMessage() == init_msg(PKD_NODE_2)
             assert result.exit_code == 0
 
+    def test_run_trace(self):
+        setup()
+        result = CliRunner().invoke(cli, ["run", "--trace", "trace.json"])
+        assert result.exit_code == 0
+        with open("trace.json") as infile:
+            trace = json.load(infile)
+        span_names = [event["name"] for event in trace["traceEvents"]]
+        assert span_names.count(PKD_NODE.split(".", 1)[1]) == 1
+        assert span_names.count(PKD_NODE_2.split(".", 1)[1]) == 1
+
     def test_run_custom_config(self):
         setup()
         node_name = ".".join(PKD_NODE.split(".")[1:])
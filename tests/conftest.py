@@ -21,7 +21,11 @@ from pathlib import Path
 import cv2
 import numpy as np
 import pytest
+import tensorflow as tf
 import tensorflow.keras.backend as K
+from tensorflow.python.framework.convert_to_constants import (
+    convert_variables_to_constants_v2,
+)
 
 TEST_HUMAN_IMAGES = ["t1.jpg", "t2.jpg", "t4.jpg"]
 TEST_NO_HUMAN_IMAGES = ["black.jpg", "t3.jpg"]
@@ -131,3 +135,20 @@ def test_no_lp_images(request):
     yield str(test_img_dir / request.param)
     K.clear_session()
     gc.collect()
+
+
+@pytest.fixture
+def frozen_graph_path(tmp_path):
+    """A frozen graph with an ``x:0`` input of a dynamic batch size, and
+    ``Identity:0`` and ``Identity_1:0`` outputs.
+    """
+
+    @tf.function(input_signature=[tf.TensorSpec([None, 4, 4, 3], tf.float32)])
+    def model(x):  # pylint: disable=invalid-name
+        return tf.nn.relu(2.0 * x - 0.5), tf.reduce_mean(x, axis=[1, 2])
+
+    frozen = convert_variables_to_constants_v2(model.get_concrete_function())
+    tf.io.write_graph(
+        frozen.graph.as_graph_def(), str(tmp_path), "model.pb", as_text=False
+    )
+    return str(tmp_path / "model.pb")
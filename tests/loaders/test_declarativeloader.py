@@ -114,15 +114,25 @@ def declarativeloader():
     return declarative_loader
 
 
-def replace_init_node(path_to_node, node_name, config_loader, config_updates):
+def replace_init_node(
+    path_to_node, node_name, config_loader, config_updates, config_updates_stream=None
+):
     return [path_to_node, node_name, config_loader, config_updates]
 
 
-def replace_instantiate_nodes_return_none():
+def replace_init_node_with_mock(
+    path_to_node, node_name, config_loader, config_updates, config_updates_stream
+):
+    return mock.Mock(node_name=node_name, stream_config=config_updates_stream)
+
+
+def replace_instantiate_nodes_return_none(
+    config_updates_stream=None, shared_nodes=None
+):
     return None
 
 
-def replace_instantiate_nodes():
+def replace_instantiate_nodes(config_updates_stream=None, shared_nodes=None):
     instantiated_nodes = []
 
     node_path = PKD_NODE
@@ -230,6 +240,24 @@ class TestDeclarativeLoader:
         assert init_node.inputs == ["img"]
         assert init_node.outputs == ["end"]
 
+    def test_init_node_stream_edit(self, declarativeloader):
+        path_to_node = ""
+        node_name = PKD_NODE
+        config_loader = declarativeloader.config_loader
+        config_updates = {"input": ["img"]}
+        config_updates_stream = {PKD_NODE: {"input": ["stream_img"]}}
+
+        init_node = declarativeloader._init_node(
+            path_to_node,
+            node_name,
+            config_loader,
+            config_updates,
+            config_updates_stream,
+        )
+
+        assert init_node.inputs == ["stream_img"]
+        assert init_node.outputs == ["end"]
+
     def test_edit_config(self, declarativeloader):
         node_name = "input.live"
         orig_config = {
@@ -260,6 +288,24 @@ class TestDeclarativeLoader:
         assert "width" in orig_config["resize"]
         assert "invalid_key" not in ground_truth
 
+    def test_get_node_configs(self, declarativeloader):
+        create_run_config_yaml(
+            {
+                "nodes": [
+                    PKD_NODE,
+                    {PKD_NODE: {"input": ["img"]}},
+                    f"{CUSTOM_NODE_NAME}.{CUSTOM_NODE}",
+                ]
+            }
+        )
+        declarativeloader.node_list = declarativeloader._load_node_list(RUN_CONFIG_PATH)
+
+        node_configs = declarativeloader.get_node_configs()
+
+        assert [node_name for node_name, _ in node_configs] == [PKD_NODE, PKD_NODE]
+        assert node_configs[0][1]["input"] == ["source"]
+        assert node_configs[1][1]["input"] == ["img"]
+
     def test_get_pipeline(self, declarativeloader):
         with mock.patch(
             "peekingduck.declarative_loader.DeclarativeLoader._instantiate_nodes",
@@ -276,3 +322,35 @@ class TestDeclarativeLoader:
             wraps=replace_instantiate_nodes_return_none,
         ), pytest.raises(TypeError):
             declarativeloader.get_pipeline()
+
+    def test_get_stream_pipelines(self, declarativeloader):
+        streams = [{CUSTOM_NODE: {"stream": 0}}, {CUSTOM_NODE: {"stream": 1}}]
+        with mock.patch(
+            "peekingduck.declarative_loader.DeclarativeLoader._init_node",
+            wraps=replace_init_node_with_mock,
+        ), mock.patch(
+            "peekingduck.declarative_loader.Pipeline",
+            side_effect=lambda nodes: mock.Mock(nodes=nodes),
+        ):
+            pipelines = declarativeloader.get_stream_pipelines(streams, [PKD_NODE_TYPE])
+
+        assert len(pipelines) == 2
+        # both input nodes are shared, the custom node is created per stream
+        assert pipelines[0].nodes[0] is pipelines[1].nodes[0]
+        assert pipelines[0].nodes[1] is pipelines[1].nodes[1]
+        assert pipelines[0].nodes[2] is not pipelines[1].nodes[2]
+        assert pipelines[1].nodes[2].stream_config == streams[1]
+
+    def test_get_pipeline_replaced_nodes(self, declarativeloader):
+        replacement = mock.Mock(node_name="input.replacement")
+        with mock.patch(
+            "peekingduck.declarative_loader.DeclarativeLoader._init_node",
+            wraps=replace_init_node_with_mock,
+        ) as init_node, mock.patch(
+            "peekingduck.declarative_loader.Pipeline",
+            side_effect=lambda nodes: mock.Mock(nodes=nodes),
+        ):
+            pipeline = declarativeloader.get_pipeline({0: replacement})
+
+        assert pipeline.nodes[0] is replacement
+        assert init_node.call_count == len(pipeline.nodes) - 1
@@ -0,0 +1,134 @@
+"""
+Copyright 2021 AI Singapore
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+     https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pytest
+import yaml
+from click.testing import CliRunner
+
+import peekingduck
+from peekingduck.cli import cli
+from peekingduck.configloader import ConfigLoader
+from peekingduck.onnx_converter import GraphSpec, convert_pipeline, graph_spec
+
+INPUTS = ["x:0"]
+OUTPUTS = ["Identity:0", "Identity_1:0"]
+MODEL_DIR = Path("weights")
+
+
+@pytest.fixture
+def node_config():
+    config_loader = ConfigLoader(Path(peekingduck.__file__).resolve().parent)
+    return config_loader.get
+
+
+def write_run_config(nodes):
+    path = Path("run_config.yml")
+    with open(path, "w") as outfile:
+        yaml.dump({"nodes": nodes}, outfile)
+    return path
+
+
+@pytest.mark.usefixtures("tmp_dir")
+class TestOnnxConverter:
+    @pytest.mark.parametrize(
+        "node_name, config_updates, graph_file, input_shape",
+        [
+            ("model.yolo", {}, "yolov4-tiny.pb", (1, 416, 416, 3)),
+            ("model.hrnet", {}, "hrnet_frozen.pb", (1, 192, 256, 3)),
+            (
+                "model.posenet",
+                {"model_type": 75},
+                "model-mobilenet_v1_075.pb",
+                (1, 225, 225, 3),
+            ),
+            (
+                "model.efficientdet",
+                {"model_type": 2},
+                "efficientdet-d2.pb",
+                (1, 768, 768, 3),
+            ),
+        ],
+    )
+    def test_graph_spec(
+        self, node_config, node_name, config_updates, graph_file, input_shape
+    ):
+        config = {**node_config(node_name), **config_updates}
+        with mock.patch(
+            "peekingduck.onnx_converter._model_dir", return_value=MODEL_DIR
+        ):
+            spec = graph_spec(node_name, config)
+
+        assert spec.graph_path.name == graph_file
+        assert spec.inputs and spec.outputs
+        model_input = spec.preprocess(np.zeros((360, 640, 3), dtype=np.uint8))
+        assert model_input.shape == input_shape
+        assert model_input.dtype == np.float32
+
+    def test_graph_spec_of_posenet_resolution(self, node_config):
+        config = node_config("model.posenet")
+        config["resolution"] = {"height": 240, "width": 320}
+        with mock.patch(
+            "peekingduck.onnx_converter._model_dir", return_value=MODEL_DIR
+        ):
+            spec = graph_spec("model.posenet", config)
+
+        assert spec.inputs == ["sub_2:0"]
+        # as in the PoseNet predictor, which reads the height as the width
+        frame = np.zeros((360, 640, 3), dtype=np.uint8)
+        assert spec.preprocess(frame).shape == (1, 321, 241, 3)
+
+    def test_graph_spec_of_other_nodes(self, node_config):
+        assert graph_spec("model.mtcnn", node_config("model.mtcnn")) is None
+
+    def test_convert_pipeline_without_model_nodes(self):
+        path = write_run_config(["input.live", "output.screen"])
+
+        with pytest.raises(ValueError, match="no model node"):
+            convert_pipeline(path, "None", "src")
+
+    def test_convert_pipeline(self, frozen_graph_path):
+        pytest.importorskip("tf2onnx")
+        pytest.importorskip("onnxruntime")
+        path = write_run_config(["input.live", "model.yolo", "output.screen"])
+        spec = GraphSpec(
+            Path(frozen_graph_path),
+            INPUTS,
+            OUTPUTS,
+            lambda frame: frame[np.newaxis, :4, :4].astype(np.float32) / 255,
+        )
+
+        with mock.patch.dict(
+            "peekingduck.onnx_converter.GRAPH_SPECS",
+            {"model.yolo": lambda model_dir, config: spec},
+        ), mock.patch("peekingduck.onnx_converter._model_dir"):
+            (result,) = convert_pipeline(path, "None", "src", check_parity=True)
+
+        assert result["node"] == "model.yolo"
+        assert Path(result["onnx_path"]).is_file()
+        assert result["parity"]
+        assert set(result["max_errors"]) == set(OUTPUTS)
+
+    def test_cli_without_model_nodes(self):
+        write_run_config(["input.live", "output.screen"])
+
+        result = CliRunner().invoke(cli, ["convert-onnx"])
+
+        assert result.exit_code != 0
+        assert "no model node" in result.output
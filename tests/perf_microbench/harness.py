@@ -0,0 +1,102 @@
+"""
+Copyright 2021 AI Singapore
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+     https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Timing helpers for the micro-benchmarks. Timings are stored relative to a
+fixed calibration workload, so that a baseline recorded on one machine can
+be checked on another of a different speed.
+"""
+
+import json
+import platform
+import time
+from pathlib import Path
+
+import numpy as np
+
+MIN_REPEAT_TIME = 0.02
+NUM_REPEATS = 7
+
+
+def time_call(func):
+    """Returns the median time of a call of ``func``, in microseconds. The
+    number of calls per repeat is chosen so that each repeat takes at least
+    MIN_REPEAT_TIME seconds, as with ``timeit.Timer.autorange``.
+    """
+    func()
+    num_calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(num_calls):
+            func()
+        if time.perf_counter() - start >= MIN_REPEAT_TIME:
+            break
+        num_calls *= 2
+
+    timings = []
+    for _ in range(NUM_REPEATS):
+        start = time.perf_counter()
+        for _ in range(num_calls):
+            func()
+        timings.append((time.perf_counter() - start) / num_calls)
+    return 1e6 * float(np.median(timings))
+
+
+def calibrate():
+    """Times a fixed mix of small numpy operations and Python loops, similar
+    to the benchmarked functions.
+    """
+    rng = np.random.RandomState(0)
+    values = rng.uniform(size=(64, 64, 17)).astype(np.float32)
+
+    def workload():
+        total = 0.0
+        for row in values[:, :, 0]:
+            total += float(np.max(row))
+        np.sort(values, axis=2)
+        return total
+
+    return time_call(workload)
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "numpy": np.__version__,
+    }
+
+
+def load_results(path):
+    path = Path(path)
+    if not path.exists():
+        return {"cases": {}}
+    with open(path) as infile:
+        return json.load(infile)
+
+
+def save_results(path, calibration_us, cases):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as outfile:
+        json.dump(
+            {
+                "calibration_us": calibration_us,
+                "environment": environment(),
+                "cases": dict(sorted(cases.items())),
+            },
+            outfile,
+            indent=2,
+        )
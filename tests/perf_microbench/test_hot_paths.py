@@ -0,0 +1,230 @@
+"""
+Copyright 2021 AI Singapore
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+     https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Micro-benchmarks of the pre- and postprocessing of the models, on synthetic
+model outputs and bboxes of several densities, without model weights.
+
+Run with ``bash scripts/run_tests.sh benchmark``. Every case fails if it is
+slower than in tests/perf_microbench/baseline.json by more than
+PKD_BENCHMARK_TOLERANCE (0.5 by default, i.e., 50%), relative to the
+calibration workload of the harness. Set PKD_BENCHMARK_SAVE to a path to save
+the timings, e.g., to tests/perf_microbench/baseline.json after an intended change
+in performance.
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from peekingduck.pipeline.nodes.model.efficientdet_d04.efficientdet_files.utils.model_process import (
+    postprocess_boxes,
+    preprocess_image,
+)
+from peekingduck.pipeline.nodes.model.hrnetv1.hrnet_files.postprocessing import (
+    affine_transform_xy,
+)
+from peekingduck.pipeline.nodes.model.hrnetv1.hrnet_files.preprocessing import (
+    crop_and_resize,
+)
+from peekingduck.pipeline.nodes.model.posenetv1.posenet_files.constants import (
+    LOCAL_MAXIMUM_RADIUS,
+)
+from peekingduck.pipeline.nodes.model.posenetv1.posenet_files.decode_multi import (
+    _build_part_with_score_fast,
+    decode_multiple_poses,
+)
+from peekingduck.pipeline.nodes.model.yolov4.yolo_files.detector import Detector
+from tests.perf_microbench.harness import (
+    calibrate,
+    load_results,
+    save_results,
+    time_call,
+)
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+TOLERANCE = float(os.environ.get("PKD_BENCHMARK_TOLERANCE", "0.5"))
+
+NUM_KEYPOINTS = 17
+NUM_EDGES = 16
+OUTPUT_STRIDE = 16
+# PoseNet output grids of the 225, 481 and 801 pixel input resolutions
+POSENET_GRIDS = [15, 31, 51]
+NUM_PEOPLE = [1, 5, 10]
+NUM_BBOXES = [1, 10, 50]
+FRAME_SIZE = (720, 1280, 3)
+HRNET_INPUT_SIZE = (192, 256)
+
+
+@pytest.fixture(scope="module")
+def timings():
+    """Records the timings of every case, and saves them at the end of the
+    module if PKD_BENCHMARK_SAVE is set.
+    """
+    calibration_us = calibrate()
+    cases = {}
+    yield calibration_us, cases
+    if os.environ.get("PKD_BENCHMARK_SAVE"):
+        save_results(os.environ["PKD_BENCHMARK_SAVE"], calibration_us, cases)
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    return load_results(BASELINE_PATH)
+
+
+@pytest.fixture
+def check(request, timings, baseline):
+    """Times ``func`` and compares it with the baseline of the same case."""
+
+    def _check(func):
+        calibration_us, cases = timings
+        median_us = time_call(func)
+        relative = median_us / calibration_us
+        case = request.node.name
+        cases[case] = {"median_us": median_us, "relative": relative}
+
+        expected = baseline["cases"].get(case)
+        if expected is not None:
+            assert relative <= expected["relative"] * (1 + TOLERANCE), (
+                f"{case} took {median_us:.1f} us, {relative:.3f} of the "
+                f"calibration workload, against {expected['relative']:.3f} in "
+                "the baseline"
+            )
+
+    return _check
+
+
+def posenet_outputs(grid, num_people, seed=0):
+    """Heatmaps with a peak for every keypoint of ``num_people`` people
+    spread around their centers, and random offsets and displacements.
+    """
+    rng = np.random.RandomState(seed)
+    scores = rng.uniform(0.0, 0.1, (grid, grid, NUM_KEYPOINTS)).astype(np.float32)
+    for _ in range(num_people):
+        center = rng.uniform(2, grid - 3, 2)
+        for keypoint_id in range(NUM_KEYPOINTS):
+            y_coord, x_coord = np.clip(
+                np.round(center + rng.normal(0, 1.5, 2)), 0, grid - 1
+            ).astype(int)
+            scores[y_coord, x_coord, keypoint_id] = rng.uniform(0.5, 1.0)
+    offsets = rng.normal(0, 4, (grid, grid, 2 * NUM_KEYPOINTS)).astype(np.float32)
+    displacements_fwd = rng.normal(0, 8, (grid, grid, 2 * NUM_EDGES))
+    displacements_bwd = rng.normal(0, 8, (grid, grid, 2 * NUM_EDGES))
+    return [
+        output[np.newaxis].astype(np.float32)
+        for output in (scores, offsets, displacements_fwd, displacements_bwd)
+    ]
+
+
+def hrnet_bboxes(num_bboxes, seed=0):
+    """Center x, center y, width and height of bboxes within a 720p frame,
+    with the aspect ratio of the HRNet input.
+    """
+    rng = np.random.RandomState(seed)
+    widths = rng.uniform(50, 300, num_bboxes)
+    return np.column_stack(
+        (
+            rng.uniform(150, 1130, num_bboxes),
+            rng.uniform(200, 520, num_bboxes),
+            widths,
+            widths * HRNET_INPUT_SIZE[1] / HRNET_INPUT_SIZE[0],
+        )
+    )
+
+
+def detection_boxes(num_bboxes, seed=0):
+    """Boxes in pixel coordinates of the resized input image."""
+    rng = np.random.RandomState(seed)
+    top_left = rng.uniform(0, 400, (num_bboxes, 2))
+    return np.hstack((top_left, top_left + rng.uniform(10, 200, (num_bboxes, 2))))
+
+
+@pytest.mark.benchmark
+class TestPoseNetDecoding:
+    @pytest.mark.parametrize("grid", POSENET_GRIDS, ids=lambda grid: f"grid{grid}")
+    @pytest.mark.parametrize("num_people", NUM_PEOPLE, ids=lambda num: f"{num}people")
+    def test_decode_multiple_poses(self, check, grid, num_people):
+        model_output = posenet_outputs(grid, num_people)
+        dst_scores = np.zeros((10, NUM_KEYPOINTS))
+        dst_keypoints = np.zeros((10, NUM_KEYPOINTS, 2))
+
+        check(
+            lambda: decode_multiple_poses(
+                model_output, dst_scores, dst_keypoints, OUTPUT_STRIDE, 0.4
+            )
+        )
+
+    @pytest.mark.parametrize("grid", POSENET_GRIDS, ids=lambda grid: f"grid{grid}")
+    @pytest.mark.parametrize("num_people", NUM_PEOPLE, ids=lambda num: f"{num}people")
+    def test_build_part_with_score_fast(self, check, grid, num_people):
+        scores = posenet_outputs(grid, num_people)[0][0]
+
+        check(lambda: _build_part_with_score_fast(0.4, LOCAL_MAXIMUM_RADIUS, scores))
+
+
+@pytest.mark.benchmark
+class TestHRNetProcessing:
+    @pytest.mark.parametrize("num_bboxes", NUM_BBOXES, ids=lambda num: f"{num}bboxes")
+    def test_crop_and_resize(self, check, num_bboxes):
+        frame = np.random.RandomState(0).randint(0, 256, FRAME_SIZE, dtype=np.uint8)
+        bboxes = hrnet_bboxes(num_bboxes)
+
+        check(lambda: crop_and_resize(frame, bboxes, HRNET_INPUT_SIZE))
+
+    @pytest.mark.parametrize("num_bboxes", NUM_BBOXES, ids=lambda num: f"{num}bboxes")
+    def test_affine_transform_xy(self, check, num_bboxes):
+        rng = np.random.RandomState(0)
+        keypoints = rng.uniform(0, 64, (num_bboxes, NUM_KEYPOINTS, 2))
+        _, affine_matrices = crop_and_resize(
+            np.zeros((8, 8, 3), dtype=np.uint8),
+            hrnet_bboxes(num_bboxes),
+            HRNET_INPUT_SIZE,
+        )
+
+        check(lambda: affine_transform_xy(keypoints, affine_matrices))
+
+
+@pytest.mark.benchmark
+class TestEfficientDetProcessing:
+    @pytest.mark.parametrize("image_size", [512, 1024], ids=lambda size: f"size{size}")
+    def test_preprocess_image(self, check, image_size):
+        image = np.random.RandomState(0).randint(0, 256, FRAME_SIZE, dtype=np.uint8)
+
+        check(lambda: preprocess_image(image, image_size))
+
+    @pytest.mark.parametrize("num_bboxes", [10, 100], ids=lambda num: f"{num}bboxes")
+    def test_postprocess_boxes(self, check, num_bboxes):
+        boxes = detection_boxes(num_bboxes)
+
+        # postprocess_boxes() modifies the boxes in place
+        check(lambda: postprocess_boxes(boxes.copy(), 0.4, *FRAME_SIZE[:2]))
+
+
+@pytest.mark.benchmark
+class TestYoloProcessing:
+    @pytest.mark.parametrize("num_bboxes", [5, 50], ids=lambda num: f"{num}bboxes")
+    def test_shrink_dimension_and_length(self, check, num_bboxes):
+        rng = np.random.RandomState(0)
+        boxes = rng.uniform(0, 1, (100, 4)).astype(np.float32)
+        scores = rng.uniform(0, 1, 100).astype(np.float32)
+        classes = rng.randint(0, 3, 100).astype(np.float32)
+
+        check(
+            lambda: Detector._shrink_dimension_and_length(
+                boxes, scores, classes, num_bboxes, [0]
+            )
+        )
@@ -0,0 +1,94 @@
+"""
+Copyright 2021 AI Singapore
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+     https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import numpy as np
+import pytest
+
+from peekingduck.pipeline.nodes.dabble.motion import Node
+
+
+@pytest.fixture
+def motion():
+    return Node(
+        {
+            "input": ["img"],
+            "output": ["motion"],
+            "downscale_width": 160,
+            "pixel_threshold": 25,
+            "sensitivity": 0.002,
+            "background_rate": 0.05,
+        }
+    )
+
+
+@pytest.fixture
+def scene():
+    return np.random.RandomState(0).randint(0, 256, (360, 640, 3), dtype=np.uint8)
+
+
+class TestMotion:
+    def test_first_frame_has_motion(self, motion, scene):
+        assert motion.run({"img": scene})["motion"]
+
+    def test_static_scene(self, motion, scene):
+        motion.run({"img": scene})
+        noise = np.random.RandomState(1).randint(-3, 4, scene.shape)
+
+        assert not motion.run({"img": scene})["motion"]
+        noisy = np.clip(scene + noise, 0, 255).astype(np.uint8)
+        assert not motion.run({"img": noisy})["motion"]
+
+    def test_moving_object(self, motion, scene):
+        motion.run({"img": scene})
+        frame = scene.copy()
+        frame[100:160, 200:260] = 255
+
+        assert motion.run({"img": frame})["motion"]
+
+    def test_sensitivity(self, scene):
+        motion = Node(
+            {
+                "input": ["img"],
+                "output": ["motion"],
+                "downscale_width": 160,
+                "pixel_threshold": 25,
+                "sensitivity": 0.5,
+                "background_rate": 0.05,
+            }
+        )
+        motion.run({"img": scene})
+        frame = scene.copy()
+        frame[100:160, 200:260] = 255
+
+        assert not motion.run({"img": frame})["motion"]
+
+    def test_resolution_change(self, motion, scene):
+        motion.run({"img": scene})
+
+        assert motion.run({"img": scene[:, :320]})["motion"]
+
+    def test_invalid_config(self):
+        with pytest.raises(ValueError):
+            Node(
+                {
+                    "input": ["img"],
+                    "output": ["motion"],
+                    "downscale_width": 160,
+                    "pixel_threshold": 25,
+                    "sensitivity": 2,
+                    "background_rate": 0.05,
+                }
+            )
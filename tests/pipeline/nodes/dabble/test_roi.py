@@ -0,0 +1,171 @@
+"""
+Copyright 2021 AI Singapore
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+     https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import numpy as np
+import pytest
+
+from peekingduck.pipeline.nodes.dabble.roi_crop import Node as RoiCrop
+from peekingduck.pipeline.nodes.dabble.roi_restore import Node as RoiRestore
+
+ROIS = [[0.0, 0.0, 0.25, 0.5], [0.5, 0.5, 1.0, 1.0]]
+
+
+@pytest.fixture
+def frame():
+    return np.random.RandomState(0).randint(0, 256, (400, 800, 3), dtype=np.uint8)
+
+
+@pytest.fixture
+def roi_crop():
+    return RoiCrop(
+        {"input": ["img"], "output": ["img", "roi_frame", "roi_tiles"], "rois": ROIS}
+    )
+
+
+@pytest.fixture
+def roi_restore():
+    return RoiRestore(
+        {
+            "input": [
+                "roi_frame",
+                "roi_tiles",
+                "bboxes",
+                "keypoints",
+                "keypoint_conns",
+            ],
+            "output": ["img", "bboxes", "keypoints", "keypoint_conns"],
+        }
+    )
+
+
+def to_mosaic(points, tile):
+    """Inverse of the mapping of roi_restore, for (x, y) points."""
+    scale = (tile[2:4] - tile[:2]) / (tile[6:8] - tile[4:6])
+    return tile[:2] + (np.asarray(points) - tile[4:6]) * scale
+
+
+class TestRoiCrop:
+    def test_packs_regions(self, roi_crop, frame):
+        outputs = roi_crop.run({"img": frame})
+        mosaic = outputs["img"]
+        tiles = outputs["roi_tiles"]
+
+        # two regions are packed side by side in cells of the larger region
+        assert mosaic.shape == (200, 800, 3)
+        assert outputs["roi_frame"] is frame
+        assert np.array_equal(mosaic[:200, :200], frame[:200, :200])
+        assert np.array_equal(mosaic[:200, 400:800], frame[200:400, 400:800])
+        np.testing.assert_allclose(tiles[0], [0, 0, 0.25, 1] + ROIS[0])
+        np.testing.assert_allclose(tiles[1], [0.5, 0, 1, 1] + ROIS[1])
+
+    def test_single_region(self, frame):
+        node = RoiCrop(
+            {
+                "input": ["img"],
+                "output": ["img", "roi_frame", "roi_tiles"],
+                "rois": [[0.5, 0.0, 1.0, 0.5]],
+            }
+        )
+
+        assert np.array_equal(node.run({"img": frame})["img"], frame[:200, 400:])
+
+    @pytest.mark.parametrize("rois", [[], [[0.5, 0.0, 0.4, 1.0]], [[0.0, 0.0, 1.0]]])
+    def test_invalid_rois(self, rois):
+        with pytest.raises(ValueError):
+            RoiCrop(
+                {
+                    "input": ["img"],
+                    "output": ["img", "roi_frame", "roi_tiles"],
+                    "rois": rois,
+                }
+            )
+
+
+class TestRoiRestore:
+    def test_maps_bboxes_back(self, roi_crop, roi_restore, frame):
+        crop_outputs = roi_crop.run({"img": frame})
+        tiles = crop_outputs["roi_tiles"]
+        expected = np.array([[0.05, 0.1, 0.2, 0.4], [0.6, 0.7, 0.9, 0.95]])
+        bboxes = np.array(
+            [
+                to_mosaic(expected[0].reshape(2, 2), tiles[0]).reshape(4),
+                to_mosaic(expected[1].reshape(2, 2), tiles[1]).reshape(4),
+            ]
+        )
+
+        outputs = roi_restore.run(
+            {
+                "roi_frame": frame,
+                "roi_tiles": tiles,
+                "bboxes": bboxes,
+                "keypoints": np.empty((0, 17, 2)),
+                "keypoint_conns": [],
+            }
+        )
+
+        assert outputs["img"] is frame
+        np.testing.assert_allclose(outputs["bboxes"], expected)
+
+    def test_bboxes_are_clipped_to_region(self, roi_crop, roi_restore, frame):
+        tiles = roi_crop.run({"img": frame})["roi_tiles"]
+        # spills over from the first region into the second one
+        bboxes = np.array([[0.1, 0.2, 0.55, 0.8]])
+
+        outputs = roi_restore.run(
+            {
+                "roi_frame": frame,
+                "roi_tiles": tiles,
+                "bboxes": bboxes,
+                "keypoints": [],
+                "keypoint_conns": [],
+            }
+        )
+
+        np.testing.assert_allclose(outputs["bboxes"], [[0.1, 0.1, 0.25, 0.4]])
+
+    def test_maps_keypoints_back(self, roi_crop, roi_restore, frame):
+        tiles = roi_crop.run({"img": frame})["roi_tiles"]
+        expected = np.array([[[0.6, 0.6], [0.8, 0.9], [-1.0, -1.0]]])
+        keypoints = expected.copy()
+        keypoints[0, :2] = to_mosaic(expected[0, :2], tiles[1])
+        keypoint_conns = [keypoints[0, :2][None]]
+
+        outputs = roi_restore.run(
+            {
+                "roi_frame": frame,
+                "roi_tiles": tiles,
+                "bboxes": np.empty((0, 4)),
+                "keypoints": keypoints,
+                "keypoint_conns": keypoint_conns,
+            }
+        )
+
+        np.testing.assert_allclose(outputs["keypoints"], expected)
+        np.testing.assert_allclose(outputs["keypoint_conns"][0], expected[0, :2][None])
+        assert outputs["bboxes"].shape == (0, 4)
+
+    def test_only_maps_configured_inputs(self, roi_crop, frame):
+        node = RoiRestore(
+            {
+                "input": ["roi_frame", "roi_tiles", "bboxes"],
+                "output": ["img", "bboxes"],
+            }
+        )
+        tiles = roi_crop.run({"img": frame})["roi_tiles"]
+
+        outputs = node.run({"roi_frame": frame, "roi_tiles": tiles, "bboxes": []})
+
+        assert set(outputs) == {"img", "bboxes"}
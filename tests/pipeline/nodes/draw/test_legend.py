@@ -104,3 +104,14 @@ class TestLegend:
         np.testing.assert_raises(
             AssertionError, np.testing.assert_equal, original_img, results["img"]
         )
+
+    def test_read_only_image_is_not_modified(self, draw_legend_fps_only, create_image):
+        original_img = create_image((640, 480, 3))
+        input_img = original_img.copy()
+        input_img.flags.writeable = False
+        results = draw_legend_fps_only.run({"img": input_img, "fps": 50.5})
+
+        np.testing.assert_equal(original_img, input_img)
+        np.testing.assert_raises(
+            AssertionError, np.testing.assert_equal, original_img, results["img"]
+        )
@@ -14,6 +14,7 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import cv2
 import numpy as np
 import pytest
 
@@ -105,3 +106,77 @@ class TestMediaReader:
 
         read_video2 = _get_video_file(reader, num_frames)
         assert np.array_equal(read_video2, video2)
+
+    def test_reader_decodes_segments_in_parallel(self, create_input_video):
+        num_frames = 20
+        size = (60, 80, 3)
+        video1 = create_input_video("video1.avi", fps=5, size=size, nframes=num_frames)
+        video2 = create_input_video("video2.avi", fps=5, size=size, nframes=num_frames)
+        reader = Node(
+            {
+                "input": "source",
+                "output": "img",
+                "resize": {"do_resizing": False, "width": 1280, "height": 720},
+                "mirror_image": False,
+                "threading": False,
+                "input_dir": ".",
+                "decode_workers": 2,
+                "segment_frames": 6,
+                "decode_buffer_frames": 2,
+            }
+        )
+
+        assert np.array_equal(_get_video_file(reader, num_frames), video1)
+        assert np.array_equal(_get_video_file(reader, num_frames), video2)
+        assert reader.run({})["pipeline_end"]
+        reader.release_resources()
+
+    def test_reader_prefetches_images(self, create_input_image, create_input_video):
+        image1 = create_input_image("image1.png", (90, 80, 3))
+        video = create_input_video("image2.avi", fps=5, size=(60, 80, 3), nframes=3)
+        image3 = create_input_image("image3.png", (90, 80, 3))
+        reader = Node(
+            {
+                "input": "source",
+                "output": "img",
+                "resize": {"do_resizing": False, "width": 1280, "height": 720},
+                "mirror_image": False,
+                "threading": False,
+                "input_dir": ".",
+                "prefetch_images": 2,
+                "image_decode_threads": 2,
+            }
+        )
+
+        assert np.array_equal(reader.run({})["img"], image1)
+        assert np.array_equal(_get_video_file(reader, 3), video)
+        output = reader.run({})
+        assert output["filename"] == "image3.png"
+        assert np.array_equal(output["img"], image3)
+        assert reader.run({})["pipeline_end"]
+        reader.release_resources()
+
+    def test_reader_preprocesses_frames(self, create_input_video):
+        video = create_input_video("video1.avi", fps=5, size=(60, 80, 3), nframes=3)
+        reader = Node(
+            {
+                "input": "source",
+                "output": "img",
+                "resize": {"do_resizing": True, "width": 20, "height": 10},
+                "mirror_image": False,
+                "threading": True,
+                "buffer_frames": True,
+                "buffer_size": 0,
+                "overflow_policy": "block",
+                "input_dir": ".",
+                "crop_roi": [0.0, 0.0, 0.5, 0.5],
+                "bgr_to_rgb": True,
+            }
+        )
+
+        img = reader.run({})["img"]
+        reader.release_resources()
+        expected = cv2.cvtColor(
+            cv2.resize(video[0][:30, :40], (20, 10)), cv2.COLOR_BGR2RGB
+        )
+        assert np.array_equal(img, expected)
@@ -0,0 +1,67 @@
+"""
+Copyright 2021 AI Singapore
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+     https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import numpy as np
+import pytest
+
+from peekingduck.pipeline.nodes.input.utils.preprocess import (
+    FramePreprocessor,
+    crop_frame,
+)
+
+
+@pytest.fixture
+def frame():
+    return np.arange(40 * 60 * 3, dtype=np.uint32).reshape(40, 60, 3).astype(np.uint8)
+
+
+class TestFramePreprocessor:
+    def test_no_preprocessing(self, frame):
+        preprocess = FramePreprocessor()
+
+        assert not preprocess
+        assert np.array_equal(preprocess(frame), frame)
+        assert preprocess.output_resolution(60, 40) == (60, 40)
+
+    def test_crop_frame(self, frame):
+        crop = crop_frame(frame, [0.5, 0.25, 1.0, 0.75])
+
+        assert crop.shape == (20, 30, 3)
+        assert crop.flags["C_CONTIGUOUS"]
+        assert np.array_equal(crop, frame[10:30, 30:60])
+
+    def test_crop_then_resize(self, frame):
+        preprocess = FramePreprocessor([0.0, 0.0, 0.5, 0.5], (15, 10))
+
+        assert preprocess(frame).shape == (10, 15, 3)
+        assert preprocess.output_resolution(60, 40) == (15, 10)
+
+    def test_crop_resolution(self):
+        preprocess = FramePreprocessor([0.0, 0.0, 0.5, 0.5])
+
+        assert preprocess.output_resolution(60, 40) == (30, 20)
+
+    def test_bgr_to_rgb(self, frame):
+        preprocess = FramePreprocessor(bgr_to_rgb=True)
+
+        assert np.array_equal(preprocess(frame), frame[:, :, ::-1])
+
+    @pytest.mark.parametrize(
+        "roi", [[0.0, 0.0, 1.0], [0.5, 0.0, 0.4, 1.0], [0.0, 0.0, 1.0, 1.5]]
+    )
+    def test_invalid_roi(self, roi):
+        with pytest.raises(ValueError):
+            FramePreprocessor(roi)
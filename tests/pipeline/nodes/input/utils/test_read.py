@@ -0,0 +1,331 @@
+"""
+Copyright 2021 AI Singapore
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+     https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import threading
+import time
+from unittest import mock
+
+import cv2
+import numpy as np
+import pytest
+
+from pathlib import Path
+
+from peekingduck.pipeline.nodes.input.utils.preprocess import FramePreprocessor
+from peekingduck.pipeline.nodes.input.utils.read import (
+    ImagePrefetcher,
+    PrefetchedImage,
+    VideoSegmentReader,
+    VideoThread,
+    _read_segment,
+)
+
+NUM_FRAMES = 20
+SIZE = (60, 80, 3)
+
+
+def _read_all(videocap):
+    frames = []
+    while True:
+        success, frame = videocap.read_frame()
+        if not success:
+            return frames
+        frames.append(frame)
+
+
+class StepCapture:
+    """Stands in for a camera which delivers a frame every time ``step()`` is
+    called. Each frame is filled with its frame number.
+    """
+
+    def __init__(self, *args):
+        self.steps = threading.Semaphore(1)
+        self.num_grabbed = 0
+        self.ended = False
+
+    def isOpened(self):
+        return True
+
+    def grab(self):
+        self.steps.acquire()
+        if self.ended:
+            return False
+        self.num_grabbed += 1
+        return True
+
+    def retrieve(self):
+        return True, np.full(SIZE, self.num_grabbed, dtype=np.uint8)
+
+    def release(self):
+        pass
+
+    def step(self):
+        self.steps.release()
+
+    def end(self):
+        self.ended = True
+        self.steps.release()
+
+
+class KeyframeCapture:
+    """Stands in for a video with a keyframe every ``KEYFRAME_INTERVAL``
+    frames, whose backend reports the requested position after seeking while
+    the decoder lands on the preceding keyframe. Each frame is filled with its
+    frame number.
+    """
+
+    KEYFRAME_INTERVAL = 5
+    FPS = 10.0
+
+    def __init__(self):
+        self.next_index = 0
+        self.requested = 0
+
+    def set(self, prop, value):
+        assert prop == cv2.CAP_PROP_POS_FRAMES
+        self.requested = int(value)
+        self.next_index = self.requested - self.requested % self.KEYFRAME_INTERVAL
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return self.requested
+        if prop == cv2.CAP_PROP_FPS:
+            return self.FPS
+        return (self.next_index - 1) * 1000 / self.FPS
+
+    def grab(self):
+        if self.next_index >= NUM_FRAMES:
+            return False
+        self.next_index += 1
+        return True
+
+    def retrieve(self):
+        return True, np.full(SIZE, self.next_index - 1, dtype=np.uint8)
+
+    def read(self):
+        return self.retrieve() if self.grab() else (False, None)
+
+
+@pytest.fixture
+def camera_thread():
+    with mock.patch(
+        "peekingduck.pipeline.nodes.input.utils.read.cv2.VideoCapture", StepCapture
+    ):
+        videocap = VideoThread(0, False, False)
+    yield videocap
+    videocap.stream.end()
+    videocap.shutdown()
+
+
+@pytest.fixture
+def video(create_input_video):
+    return create_input_video("video.avi", fps=10, size=SIZE, nframes=NUM_FRAMES)
+
+
+@pytest.mark.usefixtures("tmp_dir")
+class TestVideoThread:
+    def test_invalid_overflow_policy(self, video):
+        with pytest.raises(ValueError):
+            VideoThread("video.avi", False, True, 2, "invalid")
+
+    def test_block_keeps_all_frames(self, video):
+        videocap = VideoThread("video.avi", False, True, 2, "block")
+        videocap.thread.join(timeout=0.5)
+        assert videocap.queue.qsize() == 2
+
+        frames = _read_all(videocap)
+        videocap.shutdown()
+        assert np.array_equal(frames, video)
+        assert videocap.dropped_frames == 0
+        assert videocap.blocked_frames > 0
+
+    def test_preprocess_in_reading_thread(self, video):
+        preprocess = FramePreprocessor([0.5, 0.0, 1.0, 0.5], (20, 10))
+        videocap = VideoThread("video.avi", False, True, 0, "block", preprocess)
+        frames = _read_all(videocap)
+        videocap.shutdown()
+
+        assert len(frames) == NUM_FRAMES
+        assert np.array_equal(frames[0], preprocess(video[0]))
+
+    def test_drop_oldest_keeps_latest_frames(self, video):
+        videocap = VideoThread("video.avi", False, True, 2, "drop_oldest")
+        videocap.thread.join()
+
+        frames = _read_all(videocap)
+        assert np.array_equal(frames, video[-2:])
+        assert videocap.dropped_frames == NUM_FRAMES - 2
+        assert videocap.blocked_frames == 0
+
+    def test_drop_newest_keeps_earliest_frames(self, video):
+        videocap = VideoThread("video.avi", False, True, 2, "drop_newest")
+        videocap.thread.join()
+
+        frames = _read_all(videocap)
+        assert np.array_equal(frames, video[:2])
+        assert videocap.dropped_frames == NUM_FRAMES - 2
+
+    def test_unbuffered_waits_for_new_frame(self, camera_thread):
+        success, frame = camera_thread.read_frame()
+        assert success and frame[0, 0, 0] == 1
+
+        threading.Timer(0.05, camera_thread.stream.step).start()
+        success, frame = camera_thread.read_frame()
+        assert success and frame[0, 0, 0] == 2
+        assert not camera_thread.is_stale
+
+    def test_unbuffered_stale_frame(self, camera_thread):
+        camera_thread.read_frame()
+        success, frame = camera_thread.read_frame(wait=False)
+
+        assert success and frame[0, 0, 0] == 1
+        assert camera_thread.is_stale
+
+    def test_unbuffered_decodes_requested_frames_only(self, camera_thread):
+        camera_thread.read_frame()
+        camera_thread.stream.step()
+        camera_thread.stream.step()
+        while camera_thread.stream.num_grabbed < 3:
+            time.sleep(0.01)
+
+        threading.Timer(0.05, camera_thread.stream.step).start()
+        success, frame = camera_thread.read_frame()
+        assert success and frame[0, 0, 0] == 4
+        assert camera_thread.frame_counter == 2
+
+    def test_unbuffered_end_of_input(self, camera_thread):
+        camera_thread.read_frame()
+        camera_thread.stream.end()
+
+        assert camera_thread.read_frame() == (False, None)
+
+
+@pytest.mark.usefixtures("tmp_dir")
+class TestVideoSegmentReader:
+    @pytest.mark.parametrize("num_workers", [1, 3])
+    def test_frames_are_in_order(self, video, num_workers):
+        videocap = VideoSegmentReader("video.avi", False, num_workers, 3, 2)
+        frames = _read_all(videocap)
+        videocap.shutdown()
+
+        assert videocap.num_segments == 7
+        assert np.array_equal(frames, video)
+
+    def test_segments_of_video_with_keyframe_interval(self):
+        # mp4v only has a keyframe every few frames, segments start in between
+        writer = cv2.VideoWriter(
+            "video.mp4", cv2.VideoWriter_fourcc(*"mp4v"), 10, SIZE[1::-1]
+        )
+        noise = np.random.RandomState(0)
+        for _ in range(NUM_FRAMES):
+            writer.write(noise.randint(0, 256, SIZE, dtype=np.uint8))
+        writer.release()
+        stream = cv2.VideoCapture("video.mp4")
+        expected = [stream.read()[1] for _ in range(NUM_FRAMES)]
+        stream.release()
+
+        videocap = VideoSegmentReader("video.mp4", True, 2, 7, 2)
+        frames = _read_all(videocap)
+        videocap.shutdown()
+
+        assert np.array_equal(frames, [np.fliplr(frame) for frame in expected])
+
+    def test_invalid_config(self, video):
+        with pytest.raises(ValueError):
+            VideoSegmentReader("video.avi", False, 0, 3, 2)
+
+    @pytest.mark.parametrize("start", [0, 5, 7, 18])
+    def test_segment_starts_past_keyframe(self, start):
+        frames = list(_read_segment(KeyframeCapture(), start, 3))
+
+        assert [frame[0, 0, 0] for frame in frames] == list(
+            range(start, min(start + 3, NUM_FRAMES))
+        )
+
+    def test_segment_without_timestamps(self):
+        stream = KeyframeCapture()
+        stream.FPS = 0.0
+
+        frames = list(_read_segment(stream, 7, None))
+
+        assert [frame[0, 0, 0] for frame in frames] == list(range(7, NUM_FRAMES))
+
+    def test_preprocess_in_workers(self, video):
+        preprocess = FramePreprocessor(size=(160, 120), bgr_to_rgb=True)
+        videocap = VideoSegmentReader("video.avi", False, 2, 5, 2, preprocess)
+        frames = _read_all(videocap)
+        videocap.shutdown()
+
+        assert np.array_equal(frames, [preprocess(frame) for frame in video])
+
+
+@pytest.fixture
+def images(create_input_image):
+    return [
+        (Path(f"image{idx}.png"), create_input_image(f"image{idx}.png", SIZE))
+        for idx in range(5)
+    ]
+
+
+@pytest.mark.usefixtures("tmp_dir")
+class TestImagePrefetcher:
+    def test_images_are_in_order(self, images):
+        prefetcher = ImagePrefetcher([path for path, _ in images], False, 2, 3)
+
+        for path, image in images:
+            assert np.array_equal(prefetcher.next_image(path), image)
+        prefetcher.shutdown()
+
+    def test_prefetch_window_is_bounded(self, images):
+        prefetcher = ImagePrefetcher([path for path, _ in images], False, 2, 3)
+
+        assert len(prefetcher.pending) == 3
+        prefetcher.next_image(images[0][0])
+        assert len(prefetcher.pending) == 3
+        prefetcher.shutdown()
+
+    def test_mirror_image(self, images):
+        prefetcher = ImagePrefetcher([images[0][0]], True, 1, 1)
+
+        assert np.array_equal(
+            prefetcher.next_image(images[0][0]), images[0][1][:, ::-1]
+        )
+        prefetcher.shutdown()
+
+    def test_out_of_order_request(self, images):
+        prefetcher = ImagePrefetcher([path for path, _ in images], False, 1, 1)
+
+        with pytest.raises(ValueError):
+            prefetcher.next_image(images[1][0])
+        prefetcher.shutdown()
+
+    def test_corrupt_image(self):
+        Path("corrupt.png").write_bytes(b"not an image")
+        prefetcher = ImagePrefetcher([Path("corrupt.png")], False, 1, 1)
+
+        image = prefetcher.next_image(Path("corrupt.png"))
+        assert image is None
+        with pytest.raises(ValueError):
+            PrefetchedImage(image, Path("corrupt.png"))
+        prefetcher.shutdown()
+
+    def test_prefetched_image_has_one_frame(self, images):
+        reader = PrefetchedImage(images[0][1], images[0][0])
+
+        frames = _read_all(reader)
+        assert reader.resolution == (SIZE[1], SIZE[0])
+        assert len(frames) == 1
+        assert np.array_equal(frames[0], images[0][1])
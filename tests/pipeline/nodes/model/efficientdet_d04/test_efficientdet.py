@@ -30,6 +30,9 @@ from peekingduck.pipeline.nodes.model.efficientdet_d04.efficientdet_files.model
     efficientdet as edet,
 )
 
+TEST_DIR = Path.cwd() / "images" / "testing"
+BATCH_IMAGES = ["t1.jpg", "t2.jpg", "black.jpg"]
+
 
 @pytest.fixture
 def efficientdet_config():
@@ -102,6 +105,19 @@ class TestEfficientDet:
         assert output["bbox_labels"].size != 0
         assert output["bbox_scores"].size != 0
 
+    def test_batch_matches_single_frames(self, efficientdet):
+        frames = [{"img": cv2.imread(str(TEST_DIR / image))} for image in BATCH_IMAGES]
+        batch_outputs = efficientdet.run_batch(frames)
+
+        assert len(batch_outputs) == len(frames)
+        for inputs, batch_output in zip(frames, batch_outputs):
+            output = efficientdet.run(inputs)
+            npt.assert_allclose(batch_output["bboxes"], output["bboxes"], atol=1e-4)
+            npt.assert_allclose(
+                batch_output["bbox_scores"], output["bbox_scores"], atol=1e-4
+            )
+            npt.assert_equal(batch_output["bbox_labels"], output["bbox_labels"])
+
     def test_efficientdet_preprocess(self, create_image, efficientdet_detector):
         test_img1 = create_image((720, 1280, 3))
         test_img2 = create_image((640, 480, 3))
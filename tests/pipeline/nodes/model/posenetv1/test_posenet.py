@@ -94,3 +94,20 @@ class TestPoseNet:
             assert len(output[i]) >= 1, "unexpected number of outputs for {}".format(i)
         for label in output["bbox_labels"]:
             assert label == "Person"
+
+    @pytest.mark.parametrize("posenet_model", MODELS, indirect=True, ids=str)
+    def test_batch_matches_single_frames(self, posenet_model):
+        frames = [
+            {"img": cv2.imread(str(TEST_DIR / image))}
+            for image in PERSON_IMAGES + EMPTY_IMAGES
+        ]
+        batch_outputs = posenet_model.run_batch(frames)
+
+        assert len(batch_outputs) == len(frames)
+        for inputs, batch_output in zip(frames, batch_outputs):
+            output = posenet_model.run(inputs)
+            assert batch_output.keys() == output.keys()
+            for key in ("bboxes", "keypoints", "keypoint_scores"):
+                npt.assert_allclose(batch_output[key], output[key], atol=1e-4)
+            assert len(batch_output["keypoint_conns"]) == len(output["keypoint_conns"])
+            npt.assert_equal(batch_output["bbox_labels"], output["bbox_labels"])
@@ -86,7 +86,7 @@ class TestPredictor:
 
     def test_create_image_from_frame(self, posenet_predictor):
         frame = cv2.imread(str(TEST_DIR / "t2.jpg"))
-        _, output_scale, image_size = posenet_predictor._create_image_from_frame(
+        _, output_scale, image_size = posenet_predictor.create_image_from_frame(
             16, frame, (225, 225), "75"
         )
         assert type(image_size) is list, "Image size must be a list"
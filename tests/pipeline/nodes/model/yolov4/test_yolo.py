@@ -29,6 +29,9 @@ from peekingduck.pipeline.nodes.model.yolov4.yolo_files.models import (
     yolov3_tiny,
 )
 
+TEST_DIR = Path.cwd() / "images" / "testing"
+BATCH_IMAGES = ["t1.jpg", "t2.jpg", "black.jpg"]
+
 
 @pytest.fixture
 def yolo_config():
@@ -99,6 +102,19 @@ class TestYolo:
             assert "weights downloaded" in captured.records[1].getMessage()
             assert yolo is not None
 
+    def test_batch_matches_single_frames(self, yolo):
+        frames = [{"img": cv2.imread(str(TEST_DIR / image))} for image in BATCH_IMAGES]
+        batch_outputs = yolo.run_batch(frames)
+
+        assert len(batch_outputs) == len(frames)
+        for inputs, batch_output in zip(frames, batch_outputs):
+            output = yolo.run(inputs)
+            npt.assert_allclose(batch_output["bboxes"], output["bboxes"], atol=1e-4)
+            npt.assert_allclose(
+                batch_output["bbox_scores"], output["bbox_scores"], atol=1e-4
+            )
+            npt.assert_equal(batch_output["bbox_labels"], output["bbox_labels"])
+
     def test_get_detect_ids(self, yolo):
         assert yolo.model.get_detect_ids() == [0]
 
@@ -154,3 +154,43 @@ class TestCSVWriter:
                 pass
 
         assert header == ["Time", "bbox"]
+
+    def test_split_by_filename(self):
+        writer = Node(
+            {
+                "input": "all",
+                "output": "end",
+                "file_path": str(Path.cwd() / "stats.csv"),
+                "stats_to_track": ["bbox_labels"],
+                "logging_interval": "0",
+                "split_by_filename": True,
+            }
+        )
+        assert directory_contents() == []
+
+        for filename in ["video1.mp4", "video1.mp4", "video2.mp4"]:
+            writer.run(
+                {"bbox_labels": ["person"], "filename": filename, "pipeline_end": False}
+            )
+        writer.run({"bbox_labels": None, "filename": "", "pipeline_end": True})
+
+        file_names = sorted(path.name for path in directory_contents())
+        assert len(file_names) == 2
+        assert file_names[0].startswith("stats_video1_")
+        assert file_names[1].startswith("stats_video2_")
+
+    def test_release_resources_closes_file(self):
+        writer = Node(
+            {
+                "input": "all",
+                "output": "end",
+                "file_path": str(Path.cwd() / "stats.csv"),
+                "stats_to_track": ["bbox_labels"],
+                "logging_interval": "0",
+            }
+        )
+        writer.run({"bbox_labels": ["person"], "pipeline_end": False})
+        writer.release_resources()
+
+        with open(directory_contents()[0]) as infile:
+            assert len(infile.read().splitlines()) == 2
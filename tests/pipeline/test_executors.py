@@ -0,0 +1,367 @@
+"""
+Copyright 2021 AI Singapore
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+     https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import random
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from peekingduck.pipeline.executors import (
+    DAGExecutor,
+    LatencyBudgetExecutor,
+    MultiStreamExecutor,
+    PipelinedExecutor,
+    get_node_inputs,
+    read_only_view,
+    split_into_stages,
+    supports_batching,
+)
+from peekingduck.pipeline.nodes.node import AbstractNode
+from peekingduck.pipeline.pipeline import Pipeline
+from peekingduck.utils.thread_settings import available_cores
+
+NUM_FRAMES = 20
+
+
+class SourceNode(AbstractNode):
+    def __init__(self, num_frames=NUM_FRAMES):
+        super().__init__(
+            {"input": ["none"], "output": ["frame_id", "pipeline_end"]},
+            node_path="input.source",
+        )
+        self.num_frames = num_frames
+        self.count = 0
+
+    def run(self, inputs):
+        if self.num_frames is not None and self.count >= self.num_frames:
+            return {"frame_id": None, "pipeline_end": True}
+        self.count += 1
+        return {"frame_id": self.count - 1, "pipeline_end": False}
+
+
+class SlowNode(AbstractNode):
+    def __init__(self, node_path="model.slow", fail_at=None):
+        super().__init__(
+            {"input": ["frame_id"], "output": ["result"]}, node_path=node_path
+        )
+        self.fail_at = fail_at
+
+    def run(self, inputs):
+        if inputs["frame_id"] == self.fail_at:
+            raise RuntimeError("failed")
+        time.sleep(random.uniform(0, 0.005))
+        return {"result": inputs["frame_id"] * 2}
+
+
+class RecordNode(AbstractNode):
+    def __init__(self, stop_after=None):
+        super().__init__(
+            {"input": ["result", "pipeline_end"], "output": ["pipeline_end"]},
+            node_path="output.record",
+        )
+        self.stop_after = stop_after
+        self.results = []
+        self.ended = False
+
+    def run(self, inputs):
+        if inputs["pipeline_end"]:
+            self.ended = True
+            return {}
+        self.results.append(inputs["result"])
+        return {"pipeline_end": len(self.results) == self.stop_after}
+
+
+class BatchNode(SlowNode):
+    def __init__(self):
+        super().__init__()
+        self.batch_sizes = []
+
+    def run_batch(self, inputs):
+        self.batch_sizes.append(len(inputs))
+        return [{"result": frame["frame_id"] * 2} for frame in inputs]
+
+
+class AgedSourceNode(SourceNode):
+    def __init__(self, frame_ages):
+        super().__init__(len(frame_ages))
+        self.output = ["frame_id", "pipeline_end", "frame_age"]
+        self.frame_ages = frame_ages
+
+    def run(self, inputs):
+        outputs = super().run(inputs)
+        outputs["frame_age"] = self.frame_ages[outputs["frame_id"] or 0]
+        return outputs
+
+
+class MotionNode(AbstractNode):
+    def __init__(self, motion):
+        super().__init__(
+            {"input": ["frame_id"], "output": ["motion"]}, node_path="dabble.motion"
+        )
+        self.motion = motion
+
+    def run(self, inputs):
+        return {"motion": self.motion[inputs["frame_id"]]}
+
+
+class TestNodeInputs:
+    def test_read_only_view_shares_memory(self):
+        img = np.zeros((4, 4, 3), dtype=np.uint8)
+        data = {"img": img, "count": 1}
+        view = read_only_view(data)
+
+        assert np.shares_memory(view["img"], img)
+        assert view["count"] == 1
+        assert img.flags.writeable
+        with pytest.raises(ValueError):
+            view["img"][0, 0, 0] = 1
+        with pytest.raises(TypeError):
+            view["count"] = 2
+
+    def test_all_inputs_get_read_only_view(self):
+        node = RecordNode()
+        node.input = ["all"]
+        data = {"img": np.zeros((4, 4, 3)), "result": 1}
+
+        inputs = get_node_inputs(node, data)
+        assert set(inputs.keys()) == {"img", "result"}
+        assert not inputs["img"].flags.writeable
+
+    def test_selected_inputs(self):
+        node = SlowNode()
+        inputs = get_node_inputs(node, {"frame_id": 1, "result": 2})
+
+        assert inputs == {"frame_id": 1}
+
+
+class TestPipelinedExecutor:
+    def test_split_into_stages(self):
+        nodes = [SourceNode(), SlowNode(), SlowNode("model.slow2"), RecordNode()]
+        stages = split_into_stages(nodes)
+
+        assert [len(stage) for stage in stages] == [1, 2, 1]
+
+    def test_frames_keep_order(self):
+        record_node = RecordNode()
+        pipeline = Pipeline([SourceNode(), SlowNode(), record_node])
+        PipelinedExecutor(pipeline, 2).run()
+
+        assert record_node.results == [idx * 2 for idx in range(NUM_FRAMES)]
+        assert record_node.ended
+        assert pipeline.terminate
+        assert pipeline.data["pipeline_end"]
+
+    def test_output_node_ends_pipeline(self):
+        record_node = RecordNode(stop_after=5)
+        pipeline = Pipeline([SourceNode(num_frames=None), SlowNode(), record_node])
+        PipelinedExecutor(pipeline, 1).run()
+
+        assert record_node.results == [idx * 2 for idx in range(5)]
+        assert pipeline.terminate
+
+    def test_stage_error_is_raised(self):
+        pipeline = Pipeline([SourceNode(), SlowNode(fail_at=3), RecordNode()])
+        with pytest.raises(RuntimeError):
+            PipelinedExecutor(pipeline, 2).run()
+
+    def test_supports_batching(self):
+        assert supports_batching([SlowNode(), BatchNode()])
+        assert not supports_batching([SlowNode(), RecordNode()])
+
+    def test_batched_frames_keep_order(self):
+        batch_node = BatchNode()
+        record_node = RecordNode()
+        pipeline = Pipeline([SourceNode(), batch_node, record_node])
+        PipelinedExecutor(pipeline, 1, batch_size=4, batch_timeout=1.0).run()
+
+        assert record_node.results == [idx * 2 for idx in range(NUM_FRAMES)]
+        assert record_node.ended
+        assert max(batch_node.batch_sizes) == 4
+        assert sum(batch_node.batch_sizes) == NUM_FRAMES
+
+    @pytest.mark.skipif(
+        not hasattr(os, "sched_setaffinity"), reason="Pinning requires Linux"
+    )
+    def test_stage_cpu_affinity(self):
+        cores = available_cores()
+        affinity_node = AffinityNode("model.affinity")
+        record_node = RecordNode()
+        pipeline = Pipeline([SourceNode(), affinity_node, record_node])
+        PipelinedExecutor(
+            pipeline, 2, stage_cpu_affinity={"model": cores[:1], "output": cores[-1:]}
+        ).run()
+
+        assert affinity_node.cores == {cores[0]}
+        # the last stage runs on the calling thread, which is unpinned after
+        assert available_cores() == cores
+
+
+class AffinityNode(SlowNode):
+    def __init__(self, node_path):
+        super().__init__(node_path)
+        self.cores = set()
+
+    def run(self, inputs):
+        self.cores |= os.sched_getaffinity(0)
+        return super().run(inputs)
+
+
+class BarrierNode(AbstractNode):
+    def __init__(self, node_path, barrier, output_key):
+        super().__init__(
+            {"input": ["frame_id"], "output": [output_key]}, node_path=node_path
+        )
+        self.barrier = barrier
+        self.output_key = output_key
+
+    def run(self, inputs):
+        # only passes when both branches run at the same time
+        self.barrier.wait(timeout=5)
+        return {self.output_key: inputs["frame_id"]}
+
+
+class TestDAGExecutor:
+    def test_independent_nodes_run_concurrently(self):
+        barrier = threading.Barrier(2)
+        record_node = RecordNode()
+        pipeline = Pipeline(
+            [
+                SourceNode(num_frames=3),
+                BarrierNode("model.branch1", barrier, "result"),
+                BarrierNode("model.branch2", barrier, "other_result"),
+                record_node,
+            ]
+        )
+        DAGExecutor(pipeline, 2).run()
+
+        assert record_node.results == [0, 1, 2]
+        assert not barrier.broken
+        assert pipeline.terminate
+
+    def test_same_results_as_sequential(self):
+        record_node = RecordNode()
+        pipeline = Pipeline(
+            [SourceNode(), SlowNode(), SlowNode("model.slow2"), record_node]
+        )
+        DAGExecutor(pipeline, 4).run()
+
+        assert record_node.results == [idx * 2 for idx in range(NUM_FRAMES)]
+        assert record_node.ended
+        assert pipeline.data["pipeline_end"]
+
+    def test_output_node_ends_pipeline(self):
+        record_node = RecordNode(stop_after=5)
+        pipeline = Pipeline([SourceNode(num_frames=None), SlowNode(), record_node])
+        DAGExecutor(pipeline, 2).run()
+
+        assert record_node.results == [idx * 2 for idx in range(5)]
+        assert record_node.ended
+
+    def test_node_error_is_raised(self):
+        pipeline = Pipeline([SourceNode(), SlowNode(fail_at=3), RecordNode()])
+        with pytest.raises(RuntimeError):
+            DAGExecutor(pipeline, 2).run()
+
+
+class TestMultiStreamExecutor:
+    def test_shared_node_batches_streams(self):
+        batch_node = BatchNode()
+        num_frames = [3, 5, 4]
+        record_nodes = [RecordNode() for _ in num_frames]
+        pipelines = [
+            Pipeline([SourceNode(num_frames=count), batch_node, record_node])
+            for count, record_node in zip(num_frames, record_nodes)
+        ]
+        MultiStreamExecutor(pipelines).run()
+
+        for count, record_node in zip(num_frames, record_nodes):
+            assert record_node.results == [idx * 2 for idx in range(count)]
+            assert record_node.ended
+        assert batch_node.batch_sizes == [3, 3, 3, 2, 1]
+        assert all(pipeline.terminate for pipeline in pipelines)
+
+    def test_output_node_ends_stream(self):
+        record_nodes = [RecordNode(stop_after=2), RecordNode()]
+        pipelines = [
+            Pipeline([SourceNode(num_frames=None), SlowNode(), record_nodes[0]]),
+            Pipeline([SourceNode(num_frames=4), SlowNode(), record_nodes[1]]),
+        ]
+        MultiStreamExecutor(pipelines).run()
+
+        assert record_nodes[0].results == [0, 2]
+        assert record_nodes[0].ended
+        assert record_nodes[1].results == [0, 2, 4, 6]
+
+    def test_threads_run_nodes_of_streams(self):
+        num_frames = [3, 5, 4]
+        record_nodes = [RecordNode() for _ in num_frames]
+        pipelines = [
+            Pipeline([SourceNode(num_frames=count), SlowNode(), record_node])
+            for count, record_node in zip(num_frames, record_nodes)
+        ]
+        MultiStreamExecutor(pipelines, max_workers=3).run()
+
+        for count, record_node in zip(num_frames, record_nodes):
+            assert record_node.results == [idx * 2 for idx in range(count)]
+            assert record_node.ended
+
+    def test_threads_raise_node_error(self):
+        pipelines = [
+            Pipeline([SourceNode(num_frames=4), SlowNode(fail_at=2), RecordNode()]),
+            Pipeline([SourceNode(num_frames=4), SlowNode(), RecordNode()]),
+        ]
+        with pytest.raises(RuntimeError, match="failed"):
+            MultiStreamExecutor(pipelines, max_workers=2).run()
+
+
+class TestLatencyBudgetExecutor:
+    def test_backlog_is_paid_off_before_running(self):
+        record_node = RecordNode()
+        frame_ages = [0.0, 0.35] + [0.0] * 6
+        pipeline = Pipeline([AgedSourceNode(frame_ages), SlowNode(), record_node])
+        LatencyBudgetExecutor(pipeline, 0.1, ["model"], 10).run()
+
+        # frame 1 is 0.25s over budget, so the results of frame 1 are carried
+        # forward until three frames within the budget have paid it off
+        assert record_node.results == [0, 2, 2, 2, 2, 10, 12, 14]
+        assert record_node.ended
+
+    def test_max_skipped_frames(self):
+        record_node = RecordNode()
+        pipeline = Pipeline([AgedSourceNode([0.5] * 8), SlowNode(), record_node])
+        LatencyBudgetExecutor(pipeline, 0.1, ["model"], 2).run()
+
+        assert record_node.results == [0, 0, 0, 6, 6, 6, 12, 12]
+
+    def test_motion_gating(self):
+        record_node = RecordNode()
+        source = AgedSourceNode([0.0] * 8)
+        motion_node = MotionNode([True, False, False, True, False, False, False, False])
+        pipeline = Pipeline([source, motion_node, SlowNode(), record_node])
+        LatencyBudgetExecutor(pipeline, 0, ["model"], 3, "motion").run()
+
+        # results are refreshed on frames with motion, or after 3 skipped frames
+        assert record_node.results == [0, 0, 0, 6, 6, 6, 6, 14]
+
+    def test_within_budget_runs_every_frame(self):
+        record_node = RecordNode()
+        pipeline = Pipeline([AgedSourceNode([0.0] * 8), SlowNode(), record_node])
+        LatencyBudgetExecutor(pipeline, 1.0, ["model"], 10).run()
+
+        assert record_node.results == [idx * 2 for idx in range(8)]
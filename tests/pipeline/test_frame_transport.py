@@ -0,0 +1,194 @@
+"""
+Copyright 2021 AI Singapore
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+     https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from peekingduck.pipeline.executors import PipelinedExecutor
+from peekingduck.pipeline.frame_transport import (
+    ArrayRef,
+    ProcessStage,
+    SharedFrameRing,
+    pack_frame,
+    unpack_frame,
+)
+from peekingduck.pipeline.nodes.node import AbstractNode
+from peekingduck.pipeline.pipeline import Pipeline
+from peekingduck.pipeline.profiler import NodeProfiler
+from peekingduck.utils.tracer import Tracer
+
+IMG_SHAPE = (240, 320, 3)
+
+
+class InPlaceDrawNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["img", "bboxes"], "output": ["pid", "mask"]},
+            node_path="draw.in_place",
+        )
+
+    def run(self, inputs):
+        if inputs["bboxes"] is None:
+            raise ValueError("no bboxes")
+        inputs["img"][0, :, :] = 255
+        return {
+            "pid": os.getpid(),
+            "mask": np.full(IMG_SHAPE[:2], 7, dtype=np.uint8),
+        }
+
+
+class ImageSourceNode(AbstractNode):
+    def __init__(self, num_frames):
+        super().__init__(
+            {"input": ["none"], "output": ["img", "bboxes", "pipeline_end"]},
+            node_path="input.images",
+        )
+        self.num_frames = num_frames
+        self.count = 0
+
+    def run(self, inputs):
+        self.count += 1
+        return {
+            "img": np.full(IMG_SHAPE, self.count, dtype=np.uint8),
+            "bboxes": np.array([[0.1, 0.2, 0.3, 0.4]]),
+            "pipeline_end": self.count > self.num_frames,
+        }
+
+
+class CollectNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["img", "pid", "pipeline_end"], "output": ["none"]},
+            node_path="output.collect",
+        )
+        self.imgs = []
+        self.pids = []
+
+    def run(self, inputs):
+        if not inputs["pipeline_end"]:
+            self.imgs.append(inputs["img"])
+            self.pids.append(inputs["pid"])
+        return {}
+
+
+@pytest.fixture
+def ring():
+    ring = SharedFrameRing(2, int(np.prod(IMG_SHAPE)))
+    yield ring
+    ring.close()
+
+
+class TestSharedFrameRing:
+    def test_attached_ring_shares_memory(self, ring):
+        img = np.random.randint(255, size=IMG_SHAPE, dtype=np.uint8)
+        ref = ring.write(1, img)
+        attached = SharedFrameRing(2, ring.slot_size, name=ring.name)
+
+        view = attached.view(ref)
+        assert np.array_equal(view, img)
+        view[0, 0, 0] = 255 - img[0, 0, 0]
+        assert ring.view(ref)[0, 0, 0] == 255 - img[0, 0, 0]
+        attached.close()
+
+    def test_pack_frame_keeps_small_values(self, ring):
+        img = np.ones(IMG_SHAPE, dtype=np.uint8)
+        data = {"img": img, "bboxes": np.zeros((2, 4)), "labels": ["person"]}
+        free_slots = [0, 1]
+
+        packed = pack_frame(data, ring, free_slots)
+        assert isinstance(packed["img"], ArrayRef)
+        assert packed["bboxes"] is data["bboxes"]
+        assert packed["labels"] is data["labels"]
+        assert free_slots == [1]
+        assert np.array_equal(unpack_frame(packed, ring)["img"], img)
+
+    def test_pack_frame_pickles_arrays_without_slots(self, ring):
+        img = np.ones(IMG_SHAPE, dtype=np.uint8)
+        packed = pack_frame({"img": img}, ring, [])
+
+        assert packed["img"] is img
+
+
+class TestProcessStage:
+    def test_runs_nodes_in_worker(self):
+        stage = ProcessStage([InPlaceDrawNode()], 4)
+        frames = [
+            {"img": np.zeros(IMG_SHAPE, dtype=np.uint8), "bboxes": np.zeros((1, 4))}
+            for _ in range(2)
+        ]
+        imgs = [data["img"] for data in frames]
+        try:
+            stage.run(frames)
+        finally:
+            stage.close()
+
+        for data, img in zip(frames, imgs):
+            assert data["img"] is img
+            assert (img[0] == 255).all() and (img[1:] == 0).all()
+            assert data["pid"] != os.getpid()
+            assert (data["mask"] == 7).all()
+
+    def test_worker_error_is_raised(self):
+        stage = ProcessStage([InPlaceDrawNode()], 4)
+        try:
+            with pytest.raises(ValueError):
+                stage.run([{"img": np.zeros(IMG_SHAPE, np.uint8), "bboxes": None}])
+        finally:
+            stage.close()
+
+    def test_pipelined_executor_process_stage(self):
+        collect_node = CollectNode()
+        pipeline = Pipeline([ImageSourceNode(5), InPlaceDrawNode(), collect_node])
+        PipelinedExecutor(pipeline, 2, process_stages=["draw"]).run()
+
+        assert len(collect_node.imgs) == 5
+        for idx, img in enumerate(collect_node.imgs):
+            assert (img[0] == 255).all() and (img[1:] == idx + 1).all()
+        assert os.getpid() not in collect_node.pids
+
+    def test_process_stage_of_profiled_pipeline(self):
+        collect_node = CollectNode()
+        nodes = [ImageSourceNode(5), InPlaceDrawNode(), collect_node]
+        profiler = NodeProfiler(nodes, 100, 0, False)
+        profiler.start()
+        try:
+            PipelinedExecutor(Pipeline(nodes), 2, process_stages=["draw"]).run()
+        finally:
+            profiler.stop()
+        summary = profiler.summary()
+
+        assert len(collect_node.imgs) == 5
+        # nodes run in worker processes are not measured
+        assert summary["1:draw.in_place"]["num_frames"] == 0
+        assert summary[f"2:{collect_node.node_name}"]["num_frames"] >= 5
+
+    def test_process_stage_of_traced_pipeline(self):
+        collect_node = CollectNode()
+        nodes = [ImageSourceNode(5), InPlaceDrawNode(), collect_node]
+        tracer = Tracer()
+        tracer.start()
+        tracer.instrument(nodes)
+        try:
+            PipelinedExecutor(Pipeline(nodes), 2, process_stages=["draw"]).run()
+        finally:
+            tracer.stop()
+            tracer.uninstrument(nodes)
+
+        assert len(collect_node.imgs) == 5
+        assert collect_node.node_name in {event["name"] for event in tracer.events}
+        assert "draw.in_place" not in {event["name"] for event in tracer.events}
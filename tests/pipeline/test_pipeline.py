@@ -65,3 +65,29 @@ class TestPipeline:
 
     def test_empty_pipeline_results(self, pipeline_correct):
         assert not pipeline_correct.get_pipeline_results()
+
+    def test_dependency_graph(self):
+        nodes = [
+            MockedNode(
+                {"input": ["none"], "output": ["img", "pipeline_end"]}, "input.live"
+            ),
+            MockedNode({"input": ["img"], "output": ["bboxes"]}, "model.yolo"),
+            MockedNode({"input": ["img"], "output": ["bboxes"]}, "model.mtcnn"),
+            MockedNode({"input": ["bboxes"], "output": ["count"]}, "dabble.bbox_count"),
+            MockedNode({"input": ["pipeline_end"], "output": ["fps"]}, "dabble.fps"),
+            MockedNode({"input": ["img", "bboxes"], "output": ["none"]}, "draw.bbox"),
+            MockedNode({"input": ["all"], "output": ["img"]}, "draw.legend"),
+            MockedNode({"input": ["img"], "output": ["pipeline_end"]}, "output.screen"),
+        ]
+        pipeline = Pipeline(nodes)
+
+        assert pipeline.dependencies == [
+            [],
+            [0],
+            [0],
+            [0, 1, 2],
+            [0],
+            [0, 1, 2, 3],
+            [0, 1, 2, 3, 4, 5],
+            [0, 5, 6],
+        ]
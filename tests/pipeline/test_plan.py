@@ -0,0 +1,107 @@
+"""
+Copyright 2021 AI Singapore
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+     https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from peekingduck.pipeline.nodes.node import AbstractNode
+from peekingduck.pipeline.plan import MISSING, ExecutionPlan
+
+
+class CountNode(AbstractNode):
+    def __init__(self, config, node_path, num_frames=3):
+        super().__init__(config, node_path=node_path)
+        self.num_frames = num_frames
+        self.calls = []
+
+    def run(self, inputs):
+        self.calls.append(dict(inputs))
+        if "none" in self.inputs:
+            count = len(self.calls)
+            return {"count": count, "pipeline_end": count > self.num_frames}
+        return {key: len(self.calls) for key in self.outputs if key != "none"}
+
+
+def make_nodes():
+    return [
+        CountNode(
+            {"input": ["none"], "output": ["count", "pipeline_end"]},
+            "peekingduck.pipeline.nodes.input.live",
+        ),
+        CountNode({"input": ["count"], "output": ["bboxes"]}, "model.yolo"),
+        CountNode({"input": ["all"], "output": ["none"]}, "draw.legend"),
+        CountNode({"input": ["pipeline_end"], "output": ["fps"]}, "dabble.fps"),
+    ]
+
+
+class TestExecutionPlan:
+    def test_compile(self):
+        nodes = make_nodes()
+        plan = ExecutionPlan(nodes)
+
+        assert plan.slots == {"pipeline_end": 0, "count": 1, "bboxes": 2, "fps": 3}
+        assert [step.inputs for step in plan.steps] == [
+            (),
+            (("count", 1),),
+            (),
+            (("pipeline_end", 0),),
+        ]
+        assert [step.reads_all for step in plan.steps] == [False, False, True, False]
+        assert [step.runs_at_end for step in plan.steps] == [
+            False,
+            False,
+            False,
+            True,
+        ]
+        assert plan.resource_nodes == [nodes[0]]
+
+    def test_run_frame(self):
+        nodes = make_nodes()
+        plan = ExecutionPlan(nodes)
+        pool = plan.new_pool()
+
+        assert not plan.run_frame(pool)
+        assert plan.to_dict(pool) == {
+            "count": 1,
+            "pipeline_end": False,
+            "bboxes": 1,
+            "fps": 1,
+        }
+        assert nodes[1].calls == [{"count": 1}]
+        assert dict(nodes[2].calls[0]) == {
+            "count": 1,
+            "pipeline_end": False,
+            "bboxes": 1,
+        }
+
+    def test_only_end_nodes_run_after_pipeline_end(self):
+        nodes = make_nodes()
+        plan = ExecutionPlan(nodes)
+        pool = plan.new_pool()
+        num_frames = 0
+        while not plan.run_frame(pool):
+            num_frames += 1
+
+        assert num_frames == 3
+        assert len(nodes[1].calls) == 3
+        assert len(nodes[3].calls) == 4
+        assert nodes[3].calls[-1] == {"pipeline_end": True}
+
+    def test_undeclared_output_gets_slot(self):
+        plan = ExecutionPlan(make_nodes())
+        pool = plan.new_pool({"count": 5, "extra": "value"})
+
+        assert pool[plan.slots["count"]] == 5
+        assert pool[plan.slots["extra"]] == "value"
+        assert pool[plan.slots["bboxes"]] is MISSING
+        assert plan.to_dict(pool) == {"count": 5, "extra": "value"}
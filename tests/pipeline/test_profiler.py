@@ -0,0 +1,160 @@
+"""
+Copyright 2021 AI Singapore
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+     https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import time
+
+import numpy as np
+import pytest
+
+from peekingduck.pipeline.executors import PipelinedExecutor
+from peekingduck.pipeline.nodes.node import AbstractNode
+from peekingduck.pipeline.pipeline import Pipeline
+from peekingduck.pipeline.profiler import NodeProfiler, NodeStats
+
+NUM_FRAMES = 10
+
+
+class SourceNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["none"], "output": ["frame_id", "pipeline_end"]},
+            node_path="input.source",
+        )
+        self.count = 0
+
+    def run(self, inputs):
+        self.count += 1
+        return {"frame_id": self.count, "pipeline_end": self.count > NUM_FRAMES}
+
+
+class SleepNode(AbstractNode):
+    def __init__(self):
+        super().__init__(
+            {"input": ["frame_id"], "output": ["buffer"]}, node_path="model.sleep"
+        )
+
+    def run(self, inputs):
+        time.sleep(0.01)
+        return {"buffer": np.ones(256 * 1024, dtype=np.uint8)}
+
+
+class BatchSleepNode(SleepNode):
+    def run_batch(self, inputs):
+        time.sleep(0.01 * len(inputs))
+        return [{"buffer": None} for _ in inputs]
+
+
+def run_profiled(nodes, track_memory=False):
+    profiler = NodeProfiler(nodes, 100, 0, track_memory)
+    profiler.start()
+    for _ in range(NUM_FRAMES):
+        data = nodes[0].run({})
+        for node in nodes[1:]:
+            data.update(node.run(data))
+    profiler.stop()
+    return profiler
+
+
+class TestNodeProfiler:
+    def test_node_stats_percentiles(self):
+        stats = NodeStats(window=100)
+        for value in range(1, 201):
+            stats.add(float(value), 0.0, 0.0)
+        summary = stats.summary()
+
+        assert summary["num_frames"] == 200
+        assert summary["total_wall_ms"] == sum(range(1, 201))
+        # only the last 100 values are kept
+        assert summary["wall_ms"]["p50"] == pytest.approx(150.5)
+        assert summary["wall_ms"]["p99"] == pytest.approx(199.01)
+
+    def test_records_every_node(self):
+        nodes = [SourceNode(), SleepNode()]
+        profiler = run_profiled(nodes)
+        summary = profiler.summary()
+
+        assert profiler.num_frames == NUM_FRAMES
+        assert set(summary) == {"0:input.source", "1:model.sleep"}
+        assert summary["1:model.sleep"]["num_frames"] == NUM_FRAMES
+        assert summary["1:model.sleep"]["wall_ms"]["p50"] >= 10
+        assert summary["1:model.sleep"]["cpu_ms"]["p50"] < 10
+
+    def test_nodes_of_the_same_type(self):
+        nodes = [SourceNode(), SleepNode(), SleepNode()]
+        profiler = run_profiled(nodes)
+        summary = profiler.summary()
+
+        assert set(summary) == {"0:input.source", "1:model.sleep", "2:model.sleep"}
+        assert summary["1:model.sleep"]["num_frames"] == NUM_FRAMES
+        assert summary["2:model.sleep"]["num_frames"] == NUM_FRAMES
+        assert summary["2:model.sleep"]["node_name"] == "model.sleep"
+
+    def test_track_memory(self):
+        profiler = run_profiled([SourceNode(), SleepNode()], track_memory=True)
+
+        assert profiler.summary()["1:model.sleep"]["alloc_kb"]["p50"] >= 256
+
+    def test_reset_and_track_rss(self):
+        nodes = [SourceNode(), SleepNode()]
+        profiler = NodeProfiler(nodes, 100, 0, False, track_rss=True)
+        profiler.start()
+        for _ in range(3):
+            nodes[1].run(nodes[0].run({}))
+        profiler.reset()
+        nodes[1].run(nodes[0].run({}))
+        profiler.stop()
+        summary = profiler.summary()
+
+        assert profiler.num_frames == 1
+        assert summary["1:model.sleep"]["num_frames"] == 1
+        assert summary["1:model.sleep"]["peak_rss_growth_mb"] >= 0
+
+    def test_stop_restores_methods(self):
+        node = SleepNode()
+        profiler = NodeProfiler([node], 10, 0, False)
+        profiler.start()
+        assert "run" in node.__dict__
+        profiler.stop()
+        assert "run" not in node.__dict__
+
+    def test_batches_are_split_across_frames(self):
+        nodes = [SourceNode(), BatchSleepNode()]
+        profiler = NodeProfiler(nodes, 100, 0, False)
+        profiler.start()
+        PipelinedExecutor(Pipeline(nodes), 4, batch_size=4, batch_timeout=1.0).run()
+        profiler.stop()
+        summary = profiler.summary()["1:model.sleep"]
+
+        assert summary["num_frames"] == NUM_FRAMES
+        assert summary["wall_ms"]["p50"] == pytest.approx(10, abs=5)
+
+    def test_report(self, tmp_path):
+        profiler = run_profiled([SourceNode(), SleepNode()])
+        report_path = tmp_path / "reports" / "profile.json"
+        profiler.report(str(report_path))
+
+        with open(report_path) as infile:
+            report = json.load(infile)
+        assert report["num_frames"] == NUM_FRAMES
+        assert set(report["nodes"]["1:model.sleep"]) == {
+            "node_name",
+            "num_frames",
+            "total_wall_ms",
+            "wall_ms",
+            "cpu_ms",
+            "alloc_kb",
+        }
@@ -0,0 +1,125 @@
+"""
+Copyright 2021 AI Singapore
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+     https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+from pathlib import Path
+from unittest import mock
+
+import cv2
+import numpy as np
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from peekingduck.cli import cli
+from peekingduck.onnx_converter import GraphSpec
+from peekingduck.quantizer import quantize_pipeline
+
+INPUTS = ["x:0"]
+OUTPUTS = ["Identity:0", "Identity_1:0"]
+
+
+def write_run_config(nodes):
+    path = Path("run_config.yml")
+    with open(path, "w") as outfile:
+        yaml.dump({"nodes": nodes}, outfile)
+    return path
+
+
+@pytest.fixture
+def patched_yolo(frozen_graph_path):
+    """Replaces the frozen graph of model.yolo with a small one, to be
+    quantized without the weights.
+    """
+    spec = GraphSpec(
+        Path(frozen_graph_path),
+        INPUTS,
+        OUTPUTS,
+        lambda frame: frame[np.newaxis, :4, :4].astype(np.float32) / 255,
+    )
+    with mock.patch.dict(
+        "peekingduck.onnx_converter.GRAPH_SPECS",
+        {"model.yolo": lambda model_dir, config: spec},
+    ), mock.patch("peekingduck.onnx_converter._model_dir"):
+        yield spec
+
+
+def frames(num_frames):
+    rng = np.random.RandomState(0)
+    return [rng.randint(0, 256, (8, 8, 3), dtype=np.uint8) for _ in range(num_frames)]
+
+
+@pytest.mark.usefixtures("tmp_dir")
+class TestQuantizer:
+    def test_quantize_pipeline(self, patched_yolo):
+        path = write_run_config(["input.live", "model.yolo", "output.screen"])
+
+        (result,) = quantize_pipeline(path, "None", "src", frames(6), 4)
+
+        assert result["node"] == "model.yolo"
+        assert Path(result["tflite_path"]).is_file()
+        assert result["num_calibration_frames"] == 4
+        assert result["num_evaluation_frames"] == 2
+        assert set(result["drift"]) == set(OUTPUTS)
+        assert result["size_mb"]["int8"] > 0
+
+    def test_quantize_pipeline_evaluates_on_calibration_frames(self, patched_yolo):
+        path = write_run_config(["model.yolo"])
+
+        (result,) = quantize_pipeline(path, "None", "src", frames(3), 10)
+
+        assert result["num_calibration_frames"] == 3
+        assert result["num_evaluation_frames"] == 3
+
+    def test_quantize_pipeline_without_model_nodes(self):
+        path = write_run_config(["input.live", "output.screen"])
+
+        with pytest.raises(ValueError, match="no model node"):
+            quantize_pipeline(path, "None", "src", frames(2), 1)
+
+    def test_cli(self, patched_yolo):
+        write_run_config(["input.live", "model.yolo", "output.screen"])
+        frames_dir = Path("frames")
+        frames_dir.mkdir()
+        for idx, frame in enumerate(frames(3)):
+            cv2.imwrite(str(frames_dir / f"{idx}.png"), frame)
+
+        result = CliRunner().invoke(
+            cli,
+            [
+                "quantize",
+                "--frames",
+                str(frames_dir),
+                "--calibration_frames",
+                "2",
+                "--report",
+                "reports/drift.json",
+            ],
+        )
+
+        assert result.exit_code == 0
+        with open("reports/drift.json") as infile:
+            report = json.load(infile)
+        assert report["models"][0]["num_evaluation_frames"] == 1
+
+    def test_cli_without_frames(self):
+        write_run_config(["model.yolo"])
+        Path("frames").mkdir()
+
+        result = CliRunner().invoke(cli, ["quantize", "--frames", "frames"])
+
+        assert result.exit_code != 0
+        assert "No frames" in result.output
@@ -12,16 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import sys
 from pathlib import Path
 from unittest import mock
 
+import cv2
 import pytest
 import yaml
 
 from peekingduck.pipeline.nodes.node import AbstractNode
 from peekingduck.runner import Runner
 from peekingduck.utils.requirement_checker import RequirementChecker
+from peekingduck.utils.thread_settings import available_cores, pin_process
 
 PKD_NODE_TYPE = "pkd_node_type"
 PKD_NODE_NAME = "pkd_node_name"
@@ -213,6 +216,160 @@ class TestRunner:
 
         assert isinstance(runner_with_nodes.pipeline, object) == True
 
+    @pytest.mark.parametrize("execution_mode", ["pipelined", "dag"])
+    def test_run_nodes_execution_modes(
+        self, test_input_node, test_node_end, execution_mode
+    ):
+        setup()
+        correct_data = {
+            "test_output_1": "test_output_0",
+            "test_output_2": "test_output_0",
+            "pipeline_end": "test_output_1",
+        }
+        test_runner = Runner(
+            RUN_CONFIG_PATH,
+            CONFIG_UPDATES_CLI,
+            CUSTOM_NODES_DIR,
+            [test_input_node, test_node_end],
+            {"execution_mode": execution_mode},
+        )
+        test_runner.run()
+
+        assert test_runner.pipeline.terminate
+        assert test_runner.pipeline.get_pipeline_results() == correct_data
+
+    def test_run_with_profile(self, test_input_node, test_node_end):
+        setup()
+        report_path = MODULE_DIR / "profile.json"
+        test_runner = Runner(
+            RUN_CONFIG_PATH,
+            CONFIG_UPDATES_CLI,
+            CUSTOM_NODES_DIR,
+            [test_input_node, test_node_end],
+            {"profile": True, "profile_report": str(report_path)},
+        )
+        assert test_runner.get_node_stats() == {}
+        test_runner.run()
+
+        node_stats = test_runner.get_node_stats()
+        # both nodes are of the same type, and are reported separately
+        assert set(node_stats) == {f"0:{PKD_NODE}", f"1:{PKD_NODE}"}
+        assert node_stats[f"0:{PKD_NODE}"]["num_frames"] == 1
+        assert node_stats[f"1:{PKD_NODE}"]["node_name"] == PKD_NODE
+        assert set(node_stats[f"0:{PKD_NODE}"]["wall_ms"]) == {"p50", "p95", "p99"}
+        assert report_path.exists()
+        assert "run" not in test_input_node.__dict__
+
+    def test_run_parallel_files(self, create_input_video):
+        input_dir = Path("videos")
+        input_dir.mkdir()
+        for idx in range(3):
+            create_input_video(
+                str(input_dir / f"video{idx}.avi"), fps=5, size=(24, 32, 3), nframes=4
+            )
+        run_config_path = Path("parallel_run_config.yml")
+        with open(run_config_path, "w") as outfile:
+            yaml.dump({"nodes": ["input.recorded", "output.csv_writer"]}, outfile)
+        node_config = str(
+            {
+                "input.recorded": {"input_dir": str(input_dir)},
+                "output.csv_writer": {
+                    "file_path": str(Path.cwd() / "stats.csv"),
+                    "stats_to_track": ["filename"],
+                    "logging_interval": 0,
+                },
+            }
+        )
+        test_runner = Runner(
+            run_config_path,
+            node_config,
+            "src",
+            runner_config={"parallel_files": 2, "stream_workers": 2},
+        )
+        assert len(test_runner.pipelines) == 2
+        test_runner.run()
+
+        csv_paths = sorted(Path.cwd().glob("stats_*.csv"))
+        assert len(csv_paths) == 3
+        for idx, csv_path in enumerate(csv_paths):
+            with open(csv_path) as infile:
+                rows = infile.read().splitlines()[1:]
+            assert len(rows) == 4
+            assert all(row.endswith(f"video{idx}.avi") for row in rows)
+
+    def test_parallel_files_requires_recorded_input(self):
+        setup()
+        with pytest.raises(SystemExit):
+            Runner(
+                RUN_CONFIG_PATH,
+                CONFIG_UPDATES_CLI,
+                CUSTOM_NODES_DIR,
+                runner_config={"parallel_files": 2},
+            )
+
+    @pytest.mark.skipif(
+        not hasattr(os, "sched_setaffinity"), reason="Pinning requires Linux"
+    )
+    def test_init_applies_thread_config(self, test_input_node, test_node_end):
+        opencv_threads = cv2.getNumThreads()
+        cores = available_cores()
+        try:
+            Runner(
+                nodes=[test_input_node, test_node_end],
+                runner_config={"opencv_threads": 1, "cpu_affinity": cores[:1]},
+            )
+
+            assert cv2.getNumThreads() == 1
+            assert available_cores() == cores[:1]
+        finally:
+            cv2.setNumThreads(opencv_threads)
+            pin_process(cores)
+
+    @pytest.mark.parametrize(
+        "runner_config",
+        [
+            {"execution_mode": "invalid"},
+            {"batch_size": 0},
+            {"batch_timeout": -1},
+            {"streams": [{}, {}]},
+            {"streams": [{}, {}], "execution_mode": "dag"},
+            {"process_stages": ["draw"]},
+            {"shm_slots": 0},
+            {"latency_budget": -1},
+            {"latency_budget": 0.1, "execution_mode": "pipelined"},
+            {"max_skipped_frames": 0},
+            {"profile_window": 0},
+            {"profile_log_interval": -1},
+            {"parallel_files": -1},
+            {"parallel_files": 2},
+            {"parallel_files": 2, "execution_mode": "dag"},
+            {"stream_workers": 0},
+            {"motion_gating": True, "execution_mode": "dag"},
+            {"intra_op_threads": -1},
+            {"inter_op_threads": -1},
+            {"opencv_threads": -2},
+            {"cpu_affinity": [-1]},
+            {"stage_cpu_affinity": {"model": [0]}},
+            {
+                "execution_mode": "pipelined",
+                "cpu_affinity": [0],
+                "stage_cpu_affinity": {"model": [0, 1]},
+            },
+        ],
+    )
+    def test_init_invalid_runner_config(
+        self, test_input_node, test_node_end, runner_config
+    ):
+        setup()
+        with pytest.raises(SystemExit):
+            Runner(
+                RUN_CONFIG_PATH,
+                CONFIG_UPDATES_CLI,
+                CUSTOM_NODES_DIR,
+                [test_input_node, test_node_end],
+                runner_config,
+            )
+
     @pytest.mark.parametrize("runner", [None], indirect=True)
     def test_get_run_config(self, runner):
         node_list = runner.get_run_config()
@@ -0,0 +1,147 @@
+"""
+Copyright 2021 AI Singapore
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+     https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from peekingduck.utils.model_registry import ModelRegistry, model_key
+
+
+class CountingLoader:
+    def __init__(self):
+        self.num_loads = 0
+
+    def __call__(self):
+        self.num_loads += 1
+        return Model(self.num_loads)
+
+
+class Model:
+    def __init__(self, version):
+        self.version = version
+
+    def __call__(self, value):
+        return value * 2
+
+
+@pytest.fixture
+def registry():
+    return ModelRegistry()
+
+
+class TestModelRegistry:
+    def test_acquire_loads_once(self, registry):
+        loader = CountingLoader()
+        first = registry.acquire("yolo", loader)
+        second = registry.acquire("yolo", loader)
+
+        assert loader.num_loads == 1
+        assert first.version == second.version == 1
+        assert registry.ref_count("yolo") == 2
+
+    def test_acquire_reuse_is_logged(self, registry, caplog):
+        handle = registry.acquire(
+            "yolo", CountingLoader()
+        )  # pylint: disable=unused-variable
+        with caplog.at_level("INFO"):
+            registry.acquire("yolo", CountingLoader())
+
+        assert "Reusing loaded model" in caplog.text
+
+    def test_handle_forwards_calls(self, registry):
+        handle = registry.acquire("yolo", CountingLoader())
+
+        assert handle(3) == 6
+        assert handle.key == "yolo"
+        with pytest.raises(AttributeError):
+            handle.missing_attribute  # pylint: disable=pointless-statement
+
+    def test_model_dropped_after_last_release(self, registry):
+        loader = CountingLoader()
+        first = registry.acquire("yolo", loader)
+        second = registry.acquire("yolo", loader)
+
+        first.release()
+        first.release()
+        assert "yolo" in registry
+        assert registry.ref_count("yolo") == 1
+        second.release()
+        assert "yolo" not in registry
+        # the model stays usable through a released handle
+        assert second(2) == 4
+
+        registry.acquire("yolo", loader)
+        assert loader.num_loads == 2
+
+    def test_handle_released_on_garbage_collection(self, registry):
+        handle = registry.acquire("yolo", CountingLoader())
+        del handle
+
+        assert "yolo" not in registry
+
+    def test_collect(self, registry):
+        outside = registry.acquire("hrnet", CountingLoader())
+        with registry.collect() as handles:
+            inside = registry.acquire("yolo", CountingLoader())
+            thread = threading.Thread(
+                target=registry.acquire, args=("posenet", CountingLoader())
+            )
+            thread.start()
+            thread.join()
+
+        assert handles == [inside]
+        assert outside not in handles
+
+    def test_concurrent_acquire_loads_once(self, registry):
+        loader = CountingLoader()
+        handles = []
+        threads = [
+            threading.Thread(
+                target=lambda: handles.append(registry.acquire("yolo", loader))
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert loader.num_loads == 1
+        assert registry.ref_count("yolo") == 8
+
+
+class TestModelKey:
+    def test_equivalent_paths(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+
+        assert model_key("frozen_graph", "weights/yolo.pb", ["x:0"], ["y:0"]) == (
+            model_key(
+                "frozen_graph",
+                str(tmp_path / "weights" / "yolo.pb"),
+                ("x:0",),
+                ("y:0",),
+            )
+        )
+
+    def test_signature_and_type_distinguish(self):
+        path = str(Path("weights") / "yolo.pb")
+
+        assert model_key("frozen_graph", path, ["x:0"], ["y:0"]) != model_key(
+            "frozen_graph", path, ["x:0"], ["z:0"]
+        )
+        assert model_key("frozen_graph", path) != model_key("saved_model", path)
@@ -0,0 +1,199 @@
+"""
+Copyright 2021 AI Singapore
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+     https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import numpy.testing as npt
+import pytest
+import tensorflow as tf
+
+from peekingduck.utils.graph_functions import compare_backends, load_graph
+from peekingduck.utils.onnx_backend import (
+    OnnxGraph,
+    _create_session,
+    _is_cached,
+    convert_graph,
+    load_onnx_graph,
+    onnx_path,
+    optimized_onnx_path,
+)
+
+INPUTS = ["x:0"]
+OUTPUTS = ["Identity:0", "Identity_1:0"]
+
+
+class FakeInput:
+    def __init__(self, name, input_type):
+        self.name = name
+        self.type = input_type
+
+
+class FakeSession:
+    def __init__(self):
+        self.feeds = None
+
+    def get_inputs(self):
+        return [FakeInput("x:0", "tensor(float)")]
+
+    def run(self, outputs, feeds):
+        self.feeds = feeds
+        return [feeds["x:0"] + idx for idx, _ in enumerate(outputs)]
+
+
+class TestOnnxBackend:
+    def test_onnx_path(self):
+        assert onnx_path("weights/yolov4/yolov4-tiny.pb").name == "yolov4-tiny.onnx"
+
+    def test_load_onnx_graph_without_conversion(self, frozen_graph_path):
+        with pytest.raises(ValueError, match="convert-onnx"):
+            load_onnx_graph(frozen_graph_path, INPUTS, OUTPUTS)
+
+    def test_load_graph_tensorflow(self, frozen_graph_path):
+        heatmap, mean = load_graph(frozen_graph_path, INPUTS, OUTPUTS)(
+            tf.ones((2, 4, 4, 3))
+        )
+
+        npt.assert_allclose(heatmap.numpy(), np.full((2, 4, 4, 3), 1.5))
+        npt.assert_allclose(mean.numpy(), np.ones((2, 3)))
+
+    def test_load_graph_invalid_backend(self, frozen_graph_path):
+        with pytest.raises(ValueError, match="backend must be one of"):
+            load_graph(frozen_graph_path, INPUTS, OUTPUTS, backend="tensorrt")
+
+    def test_onnx_graph_call(self):
+        session = FakeSession()
+        graph = OnnxGraph(session, ["x:0"], ["a:0", "b:0"])
+
+        outputs = graph(tf.ones((1, 2), dtype=tf.float64))
+
+        assert session.feeds["x:0"].dtype == np.float32
+        assert all(isinstance(output, tf.Tensor) for output in outputs)
+        npt.assert_array_equal(outputs[1].numpy(), np.full((1, 2), 2.0))
+
+    def test_onnx_graph_call_by_name(self):
+        session = FakeSession()
+        graph = OnnxGraph(session, ["x:0"], ["a:0"])
+
+        (output,) = graph(x=np.ones((1, 2)))
+
+        npt.assert_array_equal(output.numpy(), np.ones((1, 2)))
+
+    def test_convert_graph_parity(self, frozen_graph_path):
+        pytest.importorskip("tf2onnx")
+        pytest.importorskip("onnxruntime")
+        sample = np.random.RandomState(0).uniform(0, 1, (2, 4, 4, 3))
+
+        assert convert_graph(frozen_graph_path, INPUTS, OUTPUTS) == onnx_path(
+            frozen_graph_path
+        )
+        errors = compare_backends(
+            frozen_graph_path, INPUTS, OUTPUTS, [sample.astype(np.float32)]
+        )
+        assert len(errors) == 2
+        assert max(errors) < 1e-5
+
+        heatmap, _ = load_graph(
+            frozen_graph_path, INPUTS, OUTPUTS, backend="onnxruntime"
+        )(tf.constant(sample, dtype=tf.float32))
+        assert heatmap.shape == (2, 4, 4, 3)
+
+    def test_load_onnx_graph_threads(self, frozen_graph_path):
+        pytest.importorskip("tf2onnx")
+        pytest.importorskip("onnxruntime")
+        convert_graph(frozen_graph_path, INPUTS, OUTPUTS)
+
+        graph = load_onnx_graph(
+            frozen_graph_path, INPUTS, OUTPUTS, intra_op_threads=2, inter_op_threads=1
+        )
+        default_graph = load_onnx_graph(frozen_graph_path, INPUTS, OUTPUTS)
+
+        options = graph.session.get_session_options()
+        assert options.intra_op_num_threads == 2
+        assert options.inter_op_num_threads == 1
+        assert graph.key != default_graph.key
+
+    def test_optimized_model_is_cached(self, frozen_graph_path):
+        onnxruntime = pytest.importorskip("onnxruntime")
+        pytest.importorskip("tf2onnx")
+        model_path = convert_graph(frozen_graph_path, INPUTS, OUTPUTS)
+        cache_path = optimized_onnx_path(model_path, onnxruntime.__version__)
+
+        load_onnx_graph(frozen_graph_path, INPUTS, OUTPUTS, intra_op_threads=1)
+        assert cache_path.is_file()
+
+        graph = load_onnx_graph(frozen_graph_path, INPUTS, OUTPUTS, intra_op_threads=2)
+        heatmap, _ = graph(np.ones((1, 4, 4, 3), dtype=np.float32))
+        npt.assert_allclose(heatmap.numpy(), np.full((1, 4, 4, 3), 1.5))
+
+    def test_optimized_model_cache_invalidated(self, frozen_graph_path):
+        onnxruntime = pytest.importorskip("onnxruntime")
+        pytest.importorskip("tf2onnx")
+        model_path = convert_graph(frozen_graph_path, INPUTS, OUTPUTS)
+        cache_path = optimized_onnx_path(model_path, onnxruntime.__version__)
+        _create_session(model_path)
+        assert _is_cached(cache_path, model_path)
+
+        # converting the model again leaves the cached model out of date
+        model_mtime = model_path.stat().st_mtime
+        os.utime(cache_path, (model_mtime - 10, model_mtime - 10))
+        assert not _is_cached(cache_path, model_path)
+
+        _create_session(model_path)
+        assert _is_cached(cache_path, model_path)
+
+    def test_optimized_model_cache_is_written_atomically(
+        self, frozen_graph_path, monkeypatch
+    ):
+        onnxruntime = pytest.importorskip("onnxruntime")
+        pytest.importorskip("tf2onnx")
+        model_path = convert_graph(frozen_graph_path, INPUTS, OUTPUTS)
+        cache_path = optimized_onnx_path(model_path, onnxruntime.__version__)
+        replaced = []
+        monkeypatch.setattr(os, "replace", lambda src, dst: replaced.append((src, dst)))
+
+        _create_session(model_path)
+
+        assert len(replaced) == 1
+        assert replaced[0][1] == cache_path
+        assert Path(replaced[0][0]).parent == model_path.parent
+        assert not cache_path.exists()
+        assert sorted(path.name for path in model_path.parent.iterdir()) == [
+            "model.onnx",
+            "model.pb",
+        ]
+
+    def test_optimized_model_cache_failure(self, frozen_graph_path, monkeypatch):
+        onnxruntime = pytest.importorskip("onnxruntime")
+        pytest.importorskip("tf2onnx")
+        model_path = convert_graph(frozen_graph_path, INPUTS, OUTPUTS)
+        cache_path = optimized_onnx_path(model_path, onnxruntime.__version__)
+
+        def interrupted_session(path, options, providers):
+            with open(options.optimized_model_filepath, "wb") as outfile:
+                outfile.write(b"partial")
+            raise RuntimeError("interrupted")
+
+        monkeypatch.setattr(onnxruntime, "InferenceSession", interrupted_session)
+
+        with pytest.raises(RuntimeError, match="interrupted"):
+            _create_session(model_path)
+        assert not cache_path.exists()
+        assert sorted(path.name for path in model_path.parent.iterdir()) == [
+            "model.onnx",
+            "model.pb",
+        ]
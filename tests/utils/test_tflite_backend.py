@@ -0,0 +1,88 @@
+"""
+Copyright 2021 AI Singapore
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+     https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import numpy as np
+import numpy.testing as npt
+import pytest
+import tensorflow as tf
+
+from peekingduck.utils.graph_functions import load_graph, quantization_drift
+from peekingduck.utils.tflite_backend import (
+    load_tflite_graph,
+    quantize_graph,
+    tflite_path,
+)
+
+INPUTS = ["x:0"]
+OUTPUTS = ["Identity:0", "Identity_1:0"]
+
+
+@pytest.fixture
+def samples():
+    rng = np.random.RandomState(0)
+    return [[rng.uniform(0, 1, (1, 4, 4, 3)).astype(np.float32)] for _ in range(8)]
+
+
+class TestTFLiteBackend:
+    def test_tflite_path(self):
+        assert tflite_path("weights/hrnet/hrnet_frozen.pb").name == (
+            "hrnet_frozen.int8.tflite"
+        )
+
+    def test_load_tflite_graph_without_quantization(self, frozen_graph_path):
+        with pytest.raises(ValueError, match="peekingduck quantize"):
+            load_tflite_graph(frozen_graph_path, INPUTS, OUTPUTS)
+
+    def test_quantize_graph(self, frozen_graph_path, samples):
+        model_path = quantize_graph(frozen_graph_path, INPUTS, OUTPUTS, samples)
+
+        assert model_path == tflite_path(frozen_graph_path)
+        interpreter = tf.lite.Interpreter(model_path=str(model_path))
+        tensor_types = {detail["dtype"] for detail in interpreter.get_tensor_details()}
+        assert np.int8 in tensor_types
+
+    def test_tflite_graph_call(self, frozen_graph_path, samples):
+        quantize_graph(frozen_graph_path, INPUTS, OUTPUTS, samples)
+        batch = np.concatenate([sample[0] for sample in samples[:3]])
+
+        graph = load_graph(frozen_graph_path, INPUTS, OUTPUTS, backend="tflite")
+        heatmap, mean = graph(tf.constant(batch))
+        _, mean_by_name = graph(x=batch)
+
+        assert heatmap.shape == (3, 4, 4, 3)
+        npt.assert_allclose(mean.numpy(), batch.mean(axis=(1, 2)), atol=0.05)
+        npt.assert_array_equal(mean_by_name.numpy(), mean.numpy())
+
+    def test_load_tflite_graph_threads(self, frozen_graph_path, samples):
+        quantize_graph(frozen_graph_path, INPUTS, OUTPUTS, samples)
+
+        graph = load_tflite_graph(frozen_graph_path, INPUTS, OUTPUTS, num_threads=2)
+        default_graph = load_tflite_graph(frozen_graph_path, INPUTS, OUTPUTS)
+        _, mean = graph(samples[0][0])
+
+        assert graph.key != default_graph.key
+        npt.assert_allclose(mean.numpy(), samples[0][0].mean(axis=(1, 2)), atol=0.05)
+
+    def test_quantization_drift(self, frozen_graph_path, samples):
+        quantize_graph(frozen_graph_path, INPUTS, OUTPUTS, samples)
+
+        drift = quantization_drift(frozen_graph_path, INPUTS, OUTPUTS, samples)
+
+        assert len(drift) == 2
+        for output in drift:
+            assert set(output) == {"mean_abs_error", "max_abs_error", "relative_error"}
+            assert output["max_abs_error"] >= output["mean_abs_error"]
+            assert output["relative_error"] < 0.05
@@ -0,0 +1,102 @@
+"""
+Copyright 2021 AI Singapore
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+     https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+import logging
+import os
+import threading
+
+import cv2
+import pytest
+import tensorflow as tf
+
+from peekingduck.utils.thread_settings import (
+    ThreadSettings,
+    available_cores,
+    check_cores,
+    pin_process,
+    pin_thread,
+)
+
+requires_affinity = pytest.mark.skipif(
+    not hasattr(os, "sched_setaffinity"), reason="Pinning requires Linux"
+)
+
+
+@pytest.fixture
+def opencv_threads():
+    num_threads = cv2.getNumThreads()
+    yield
+    cv2.setNumThreads(num_threads)
+
+
+class TestThreadSettings:
+    def test_session_threads_fall_back_to_process(self):
+        settings = ThreadSettings()
+        settings.intra_op_threads = 4
+
+        assert settings.session_threads(0, 0) == (4, 0)
+        assert settings.session_threads(2, 1) == (2, 1)
+
+    @pytest.mark.usefixtures("opencv_threads")
+    def test_apply_opencv_threads(self):
+        ThreadSettings().apply(0, 0, 1)
+
+        assert cv2.getNumThreads() == 1
+
+    def test_apply_after_tensorflow_init_is_logged(self, caplog):
+        tf.constant(1.0)  # initialises the TensorFlow runtime
+        intra_op_threads = tf.config.threading.get_intra_op_parallelism_threads()
+        settings = ThreadSettings()
+
+        with caplog.at_level(logging.WARNING):
+            settings.apply(intra_op_threads + 1, 0, -1)
+
+        assert "already been initialised" in caplog.text
+        assert settings.intra_op_threads == intra_op_threads + 1
+        assert (
+            tf.config.threading.get_intra_op_parallelism_threads() == intra_op_threads
+        )
+
+    def test_check_cores(self):
+        check_cores(available_cores())
+        with pytest.raises(ValueError, match="not available"):
+            check_cores([max(available_cores()) + 1])
+
+    @requires_affinity
+    def test_pin_thread(self):
+        cores = available_cores()
+        pinned = []
+
+        def run():
+            pin_thread(cores[-1:])
+            pinned.extend(available_cores())
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+
+        assert pinned == cores[-1:]
+        assert available_cores() == cores
+
+    @requires_affinity
+    def test_pin_process(self):
+        cores = available_cores()
+        try:
+            assert pin_process(cores[:1])
+            assert available_cores() == cores[:1]
+        finally:
+            pin_process(cores)
@@ -0,0 +1,94 @@
+"""
+Copyright 2021 AI Singapore
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+     https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import threading
+
+from peekingduck.pipeline.nodes.node import AbstractNode
+from peekingduck.utils.tracer import NULL_SPAN, Tracer
+
+
+class EchoNode(AbstractNode):
+    def __init__(self):
+        super().__init__({"input": ["img"], "output": ["img"]}, node_path="draw.echo")
+
+    def run(self, inputs):
+        return inputs
+
+    def run_batch(self, inputs):
+        return inputs
+
+
+class TestTracer:
+    def test_disabled_tracer_records_nothing(self):
+        tracer = Tracer()
+        assert tracer.span("preprocess") is NULL_SPAN
+        with tracer.span("preprocess"):
+            pass
+        assert not tracer.events
+
+    def test_spans_of_each_thread(self):
+        tracer = Tracer()
+        tracer.start()
+        with tracer.span("graph_call", "model", batch_size=2):
+            pass
+
+        def record():
+            with tracer.span("grab", "input"):
+                pass
+
+        thread = threading.Thread(target=record, name="VideoThread")
+        thread.start()
+        thread.join()
+        tracer.stop()
+
+        graph_call, grab = tracer.events
+        assert graph_call["name"] == "graph_call"
+        assert graph_call["cat"] == "model"
+        assert graph_call["ph"] == "X"
+        assert graph_call["args"] == {"batch_size": 2}
+        assert grab["tid"] != graph_call["tid"]
+        assert tracer._thread_names[grab["tid"]] == "VideoThread"
+
+    def test_instrument_nodes(self):
+        node = EchoNode()
+        tracer = Tracer()
+        tracer.start()
+        tracer.instrument([node])
+        node.run({"img": None})
+        node.run_batch([{"img": None}, {"img": None}])
+        tracer.uninstrument([node])
+        node.run({"img": None})
+        tracer.stop()
+
+        assert [event["name"] for event in tracer.events] == ["draw.echo"] * 2
+        assert tracer.events[1]["args"] == {"batch_size": 2}
+        assert "run" not in node.__dict__
+
+    def test_write(self, tmp_path):
+        tracer = Tracer()
+        tracer.start()
+        with tracer.span("postprocess", "model"):
+            pass
+        tracer.stop()
+        trace_path = tmp_path / "trace.json"
+        tracer.write(str(trace_path))
+
+        with open(trace_path) as infile:
+            trace = json.load(infile)
+        phases = [event["ph"] for event in trace["traceEvents"]]
+        assert phases == ["M", "M", "X"]
+        assert trace["traceEvents"][0]["args"] == {"name": "MainThread"}
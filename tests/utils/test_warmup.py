@@ -0,0 +1,103 @@
+"""
+Copyright 2021 AI Singapore
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+     https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+import logging
+
+import pytest
+
+from peekingduck.utils.warmup import WARMUP_FRAME_SIZE, WarmupMixin, warm_up
+
+
+class RecordingModel:
+    def __init__(self):
+        self.frames = []
+
+    def predict(self, frame):
+        self.frames.append(frame)
+        frame[:] = 0
+
+
+class WarmedUpNode(WarmupMixin):
+    def __init__(self, warmup_passes, **config):
+        self.config = {"warmup_passes": warmup_passes, **config}
+        self.node_name = "model.yolo"
+        self.model = RecordingModel()
+        self._warm_up()
+
+
+class WarmedUpPoseNode(WarmedUpNode):
+    def _predict_warmup_frame(self, frame):
+        self.model.predict(frame[:10])
+
+
+class TestWarmup:
+    def test_warm_up(self, caplog):
+        model = RecordingModel()
+
+        with caplog.at_level(logging.INFO):
+            duration = warm_up(model.predict, 2, "model.yolo")
+
+        assert duration > 0
+        assert len(model.frames) == 2
+        assert model.frames[0].shape == WARMUP_FRAME_SIZE
+        # every pass gets a fresh frame, even if the model draws on it
+        assert model.frames[0] is not model.frames[1]
+        assert "Warmed up model.yolo with 2 pass(es)" in caplog.text
+
+    def test_warm_up_disabled(self):
+        model = RecordingModel()
+
+        assert warm_up(model.predict, 0, "model.yolo") == 0.0
+        assert not model.frames
+
+    def test_warmup_mixin(self):
+        node = WarmedUpNode(2)
+
+        assert node.warmup_duration > 0
+        assert len(node.model.frames) == 2
+
+    def test_warmup_mixin_disabled(self):
+        node = WarmedUpNode(0)
+
+        assert node.warmup_duration == 0.0
+        assert not node.model.frames
+
+    def test_warmup_mixin_predict_override(self):
+        node = WarmedUpPoseNode(1)
+
+        assert node.model.frames[0].shape == (10,) + WARMUP_FRAME_SIZE[1:]
+
+    @pytest.mark.parametrize(
+        "config, frame_size",
+        [
+            ({"resolution": {"height": 192, "width": 256}}, (192, 256, 3)),
+            ({"size": 416}, (416, 416, 3)),
+            ({"model_type": 1, "size": [512, 640, 768]}, (640, 640, 3)),
+            ({"mtcnn_min_size": 40}, WARMUP_FRAME_SIZE),
+        ],
+    )
+    def test_warmup_mixin_frame_size(self, config, frame_size):
+        node = WarmedUpNode(1, **config)
+
+        assert node.model.frames[0].shape == frame_size
+
+    def test_warm_up_frame_size(self):
+        model = RecordingModel()
+
+        warm_up(model.predict, 1, "model.yolo", (416, 416, 3))
+
+        assert model.frames[0].shape == (416, 416, 3)